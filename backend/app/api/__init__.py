@@ -1,10 +1,14 @@
 from fastapi import APIRouter
-from app.api.endpoints import admin
+from app.api.endpoints import admin, notification_logs, videos
 
 api_router = APIRouter()
 
 # Include admin router
 api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
+api_router.include_router(videos.router, prefix="/admin/videos", tags=["videos"])
+api_router.include_router(
+    notification_logs.router, prefix="/admin/notification-logs", tags=["notification-logs"]
+)
 
 
 @api_router.get("/ping")
@@ -1,9 +1,53 @@
 """
 Dependencies for API endpoints.
 """
-import os
+from collections.abc import AsyncIterator
 from typing import Annotated
-from fastapi import Header, HTTPException, status
+from fastapi import Header, HTTPException, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.security import admin_token_verifier
+from app.crawler.pool import BrowserPool
+from app.db import Database, DatabaseWriter
+
+
+def get_database(request: Request) -> Database:
+    """Database created by the application lifespan."""
+    return request.app.state.db
+
+
+def get_writer(request: Request) -> DatabaseWriter:
+    """Single-writer actor started by the application lifespan."""
+    return request.app.state.writer
+
+
+def get_browser_pool(request: Request) -> BrowserPool:
+    """Browser pool started by the application lifespan; 404 when rendering is disabled."""
+    pool = getattr(request.app.state, "browser_pool", None)
+    if pool is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Browser pool is disabled"
+        )
+    return pool
+
+
+async def get_read_session(request: Request) -> AsyncIterator[AsyncSession]:
+    """
+    Session on a pooled reader connection, for queries only.
+    """
+    async with get_database(request).read() as session:
+        yield session
+
+
+async def get_write_session(request: Request) -> AsyncIterator[AsyncSession]:
+    """
+    Session on the single writer connection; committed when the request succeeds.
+
+    Prefer submitting writes through ``get_writer`` so they are batched with
+    the crawler's and notifier's writes instead of waiting for the connection.
+    """
+    async with get_database(request).write() as session:
+        yield session
 
 
 async def get_current_admin(
@@ -12,7 +56,8 @@ async def get_current_admin(
     """
     Simple admin authentication dependency.
     
-    Validates admin token against environment variable.
+    Validates admin token against the configured admin tokens
+    (X_ADMIN_TOKEN plus any ADMIN_TOKENS) in constant time.
     
     Args:
         x_admin_token: Admin token from request header
@@ -30,8 +75,7 @@ async def get_current_admin(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    expected_token = os.getenv("X_ADMIN_TOKEN", "")
-    if x_admin_token != expected_token:
+    if not admin_token_verifier.verify(x_admin_token):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid admin token.",
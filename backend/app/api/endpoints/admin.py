@@ -1,22 +1,49 @@
 """
 Admin endpoints for system configuration and management.
 """
-from fastapi import APIRouter
+from datetime import datetime, timezone
+from typing import Annotated
 
-from app.core.config import settings
+from fastapi import APIRouter, Depends, Header, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_browser_pool, get_current_admin, get_read_session, get_writer
+from app.core.config import Settings, settings_registry
+from app.core.http_cache import CachedJSON
+from app.core.ids import parse_uuid
+from app.crawler.pool import BrowserPool
+from app.db import DatabaseWriter
+from app.db.stats import fetch_table_stats
+from app.repositories.crawl_schedules import get_schedule_id
+from app.schemas.stats import (
+    BrowserPoolStatsResponse,
+    DailyStats,
+    DailyStatsResponse,
+    TableRowCount,
+    TableStatsResponse,
+    WriterStatsResponse,
+)
 from app.schemas.system_variables import SystemVariablesResponse, SystemVariableDetail
+from app.services.dashboard import daily_stats
 
 
 router = APIRouter()
 
+SYSTEM_VARIABLES_CACHE_CONTROL = "private, no-cache"
+
+# Serialized system variables keyed by the settings version they were built from
+_system_variables_cache: tuple[int, CachedJSON] | None = None
+
 
 def _get_system_variable_detail(
+    settings: Settings,
     env_var_name: str,
 ) -> SystemVariableDetail:
     """
     Get details about a system environment variable.
 
     Args:
+        settings: Settings snapshot to read from
         env_var_name: The name of the environment variable in settings
         is_secret: Whether this variable contains secret data
 
@@ -55,7 +82,9 @@ def _get_system_variable_detail(
         "only their presence is indicated."
     )
 )
-async def get_system_variables() -> SystemVariablesResponse:
+async def get_system_variables(
+    if_none_match: Annotated[str | None, Header()] = None
+) -> Response:
     """
     Get current system variables for admin dashboard.
 
@@ -63,9 +92,157 @@ async def get_system_variables() -> SystemVariablesResponse:
     - Monitored video page URL
     - Telegram channel ID
     - Telegram bot token status (value never exposed)
+
+    The serialized body and its ETag are built once per settings version, so
+    a poll carrying a matching If-None-Match is answered with 304 directly.
+    """
+    return _get_cached_system_variables().response(
+        if_none_match, cache_control=SYSTEM_VARIABLES_CACHE_CONTROL
+    )
+
+
+def _get_cached_system_variables() -> CachedJSON:
+    """Return the serialized system variables, building them on first use."""
+    global _system_variables_cache
+    snapshot = settings_registry.snapshot
+    if _system_variables_cache is None or _system_variables_cache[0] != snapshot.version:
+        settings = snapshot.settings
+        cached = CachedJSON.from_model(SystemVariablesResponse(
+            monitored_video_page_url=_get_system_variable_detail(settings, "MONITORED_URL"),
+            telegram_channel_id=_get_system_variable_detail(settings, "TELEGRAM_CHANNEL_ID"),
+            telegram_bot_token=_get_system_variable_detail(settings, "TELEGRAM_BOT_TOKEN")
+        ))
+        _system_variables_cache = (snapshot.version, cached)
+    return _system_variables_cache[1]
+
+
+@router.get(
+    "/stats/tables",
+    response_model=TableStatsResponse,
+    dependencies=[Depends(get_current_admin)],
+    summary="Get table row counts",
+    description=(
+        "Returns the number of rows in each table. Counts are maintained "
+        "incrementally, so this never scans the tables."
+    )
+)
+async def get_table_stats(
+    session: Annotated[AsyncSession, Depends(get_read_session)]
+) -> TableStatsResponse:
+    """
+    Get row counts for the admin dashboard and startup checks.
+    """
+    counts = await fetch_table_stats(session)
+    return TableStatsResponse(
+        tables=[TableRowCount(name=name, row_count=count) for name, count in counts.items()]
+    )
+
+
+@router.get(
+    "/stats/writer",
+    response_model=WriterStatsResponse,
+    dependencies=[Depends(get_current_admin)],
+    summary="Get database writer statistics",
+    description=(
+        "Returns load and backpressure counters of the single database writer: "
+        "how many writes are queued, how long they wait and how many share "
+        "each transaction."
+    )
+)
+async def get_writer_stats(
+    writer: Annotated[DatabaseWriter, Depends(get_writer)]
+) -> WriterStatsResponse:
+    """
+    Get writer metrics for the admin dashboard.
+    """
+    metrics = writer.metrics
+    return WriterStatsResponse(
+        submitted=metrics.submitted,
+        completed=metrics.completed,
+        failed=metrics.failed,
+        transactions=metrics.transactions,
+        mean_batch_size=metrics.mean_batch_size,
+        queue_depth=metrics.queue_depth,
+        max_queue_depth=metrics.max_queue_depth,
+        blocked_submits=metrics.blocked_submits,
+        mean_queue_wait_ms=metrics.mean_queue_wait_seconds * 1000,
+        max_queue_wait_ms=metrics.max_queue_wait_seconds * 1000,
+    )
+
+
+@router.get(
+    "/stats/browser-pool",
+    response_model=BrowserPoolStatsResponse,
+    dependencies=[Depends(get_current_admin)],
+    summary="Get browser pool statistics",
+    description=(
+        "Returns the state of the crawler's pool of warm browsers: how many "
+        "are in use or idle, how often they were recycled or crashed, and "
+        "how long launches take. 404 when rendering is disabled."
+    )
+)
+async def get_browser_pool_stats(
+    pool: Annotated[BrowserPool, Depends(get_browser_pool)]
+) -> BrowserPoolStatsResponse:
     """
-    return SystemVariablesResponse(
-        monitored_video_page_url=_get_system_variable_detail("MONITORED_URL"),
-        telegram_channel_id=_get_system_variable_detail("TELEGRAM_CHANNEL_ID"),
-        telegram_bot_token=_get_system_variable_detail("TELEGRAM_BOT_TOKEN")
+    Get browser pool metrics for the admin dashboard.
+    """
+    metrics = pool.metrics
+    return BrowserPoolStatsResponse(
+        size=metrics.size,
+        in_use=metrics.in_use,
+        idle=metrics.idle,
+        launched=metrics.launched,
+        recycled=metrics.recycled,
+        crashed=metrics.crashed,
+        launch_failures=metrics.launch_failures,
+        pages=metrics.pages,
+        mean_launch_ms=metrics.mean_launch_seconds * 1000,
+        max_launch_ms=metrics.max_launch_seconds * 1000,
+    )
+
+
+@router.get(
+    "/stats/daily",
+    response_model=DailyStatsResponse,
+    dependencies=[Depends(get_current_admin)],
+    summary="Get daily activity statistics",
+    description=(
+        "Returns videos detected, notifications and crawls per UTC day, with "
+        "the notification success rate and crawl failure rate. Counts come "
+        "from incrementally maintained daily rollups, so the cost depends on "
+        "the number of days, not on the size of the log tables."
+    )
+)
+async def get_daily_stats(
+    session: Annotated[AsyncSession, Depends(get_read_session)],
+    days: Annotated[int, Query(ge=1, le=366)] = 30,
+    schedule_id: Annotated[str | None, Query()] = None,
+) -> DailyStatsResponse:
+    """
+    Get per-day statistics for the dashboard charts.
+    """
+    schedule = None
+    if schedule_id is not None:
+        public_id = parse_uuid(schedule_id)
+        if public_id is not None:
+            schedule = await get_schedule_id(session, public_id)
+        if schedule is None:
+            # Unknown schedules have no activity; no row has id 0
+            schedule = 0
+
+    today = datetime.now(timezone.utc).date()
+    stats = await daily_stats(session, days, today, schedule_id=schedule)
+    return DailyStatsResponse(
+        days=[
+            DailyStats(
+                day=day.day,
+                videos_detected=day.videos_detected,
+                notifications=day.notifications,
+                crawls=day.crawls,
+                notification_success_rate=day.notification_success_rate,
+                crawl_failure_rate=day.crawl_failure_rate,
+            )
+            for day in stats
+        ]
     )
@@ -0,0 +1,79 @@
+"""
+Admin endpoints for notification logs.
+"""
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query
+
+from app.api.deps import get_current_admin, get_database
+from app.core.config import settings_registry
+from app.core.ids import parse_uuid, uuid_text
+from app.core.pagination import decode_cursor, encode_cursor
+from app.db import Database
+from app.repositories.crawl_schedules import get_schedule_id
+from app.schemas.notification_logs import NotificationLog, NotificationLogPage
+from app.services.notification_logs import list_notification_logs_page
+
+
+router = APIRouter(dependencies=[Depends(get_current_admin)])
+
+
+@router.get(
+    "",
+    response_model=NotificationLogPage,
+    summary="List notification logs",
+    description=(
+        "Returns notification attempts newest first, optionally filtered by "
+        "schedule and status. Logs moved to the monthly archives are included "
+        "transparently; archives are only opened when a page reaches them."
+    )
+)
+async def get_notification_logs(
+    db: Annotated[Database, Depends(get_database)],
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+    cursor: Annotated[str | None, Query()] = None,
+    schedule_id: Annotated[str | None, Query()] = None,
+    status: Annotated[str | None, Query()] = None,
+) -> NotificationLogPage:
+    """
+    Get one page of notification logs for the logs viewer.
+    """
+    after = tuple(decode_cursor(cursor, str, int)) if cursor else None
+    schedule = None
+    if schedule_id is not None:
+        public_id = parse_uuid(schedule_id)
+        if public_id is not None:
+            async with db.read() as session:
+                schedule = await get_schedule_id(session, public_id)
+        if schedule is None:
+            return NotificationLogPage(items=[], next_cursor=None)
+
+    # Fetch one extra row to know whether another page exists
+    rows = await list_notification_logs_page(
+        db,
+        settings_registry.settings.NOTIFICATION_ARCHIVE_DIR,
+        limit + 1,
+        after=after,
+        schedule_id=schedule,
+        status=status,
+    )
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].sent_at, rows[-1].id)
+
+    return NotificationLogPage(
+        items=[
+            NotificationLog(
+                id=uuid_text(row.uuid),
+                video_id=uuid_text(row.video_uuid) if row.video_uuid else None,
+                schedule_id=uuid_text(row.schedule_uuid) if row.schedule_uuid else None,
+                status=row.status,
+                error_details=row.error_details,
+                sent_at=row.sent_at,
+            )
+            for row in rows
+        ],
+        next_cursor=next_cursor,
+    )
@@ -0,0 +1,117 @@
+"""
+Admin endpoints for detected video records.
+"""
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_admin, get_read_session
+from app.core.ids import parse_uuid, uuid_text
+from app.core.pagination import decode_cursor, encode_cursor
+from app.repositories.crawl_schedules import get_schedule_id
+from app.repositories.video_records import list_videos, mark_matches, search_videos
+from app.schemas.videos import VideoPage, VideoRecord, VideoSearchHit, VideoSearchPage
+
+
+router = APIRouter(dependencies=[Depends(get_current_admin)])
+
+
+@router.get(
+    "",
+    response_model=VideoPage,
+    summary="List detected videos",
+    description=(
+        "Returns detected videos newest first, optionally filtered by schedule. "
+        "Pagination uses an opaque cursor, so every page costs the same "
+        "regardless of how deep it is."
+    )
+)
+async def get_videos(
+    session: Annotated[AsyncSession, Depends(get_read_session)],
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+    cursor: Annotated[str | None, Query()] = None,
+    schedule_id: Annotated[str | None, Query()] = None,
+) -> VideoPage:
+    """
+    Get one page of video records for the logs viewer.
+    """
+    after = tuple(decode_cursor(cursor, str, int)) if cursor else None
+    schedule = None
+    if schedule_id is not None:
+        public_id = parse_uuid(schedule_id)
+        if public_id is not None:
+            schedule = await get_schedule_id(session, public_id)
+        if schedule is None:
+            return VideoPage(items=[], next_cursor=None)
+
+    # Fetch one extra row to know whether another page exists
+    rows = await list_videos(session, limit + 1, after=after, schedule_id=schedule)
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].detected_at, rows[-1].id)
+
+    return VideoPage(
+        items=[
+            VideoRecord(
+                id=uuid_text(row.uuid),
+                title=row.title,
+                url=row.url,
+                thumbnail=row.thumbnail,
+                description=row.description,
+                detected_at=row.detected_at,
+                schedule_id=uuid_text(row.schedule_uuid),
+            )
+            for row in rows
+        ],
+        next_cursor=next_cursor,
+    )
+
+
+@router.get(
+    "/search",
+    response_model=VideoSearchPage,
+    summary="Search detected videos",
+    description=(
+        "Full-text search over video titles and descriptions. Every word is "
+        "matched as a prefix and results are ranked by relevance, with title "
+        "matches weighted above description matches."
+    )
+)
+async def search_video_records(
+    session: Annotated[AsyncSession, Depends(get_read_session)],
+    q: Annotated[str, Query(min_length=1, max_length=200)],
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+    cursor: Annotated[str | None, Query()] = None,
+) -> VideoSearchPage:
+    """
+    Get one page of search results with highlighted matches.
+    """
+    after = tuple(decode_cursor(cursor, (int, float), int)) if cursor else None
+    rows = await search_videos(session, q, limit + 1, after=after)
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].score, rows[-1].id)
+
+    return VideoSearchPage(
+        items=[
+            VideoSearchHit(
+                id=uuid_text(row.uuid),
+                title=row.title,
+                url=row.url,
+                thumbnail=row.thumbnail,
+                description=row.description,
+                detected_at=row.detected_at,
+                schedule_id=uuid_text(row.schedule_uuid),
+                title_highlight=mark_matches(row.title_highlight),
+                description_snippet=mark_matches(row.description_snippet),
+                score=row.score,
+            )
+            for row in rows
+        ],
+        next_cursor=next_cursor,
+    )
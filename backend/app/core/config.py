@@ -1,12 +1,32 @@
+import asyncio
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from pydantic import field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import List
+from typing import Callable, Collection, Dict, List
+
+from app.core.crawl_defaults import (
+    DEFAULT_BLOCKED_DOMAINS,
+    DEFAULT_BLOCKED_RESOURCE_TYPES,
+    DEFAULT_VOLATILE_ATTRIBUTES,
+    DEFAULT_VOLATILE_ELEMENTS,
+    DEFAULT_VOLATILE_PATTERNS,
+)
+
+logger = logging.getLogger(__name__)
+
+# Shortest admin token accepted; e.g. `openssl rand -hex 32` gives 64 characters
+MIN_ADMIN_TOKEN_LENGTH = 32
 
 
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(
         env_file=".env",
         case_sensitive=True,
-        extra="allow"
+        extra="allow",
+        frozen=True
     )
     PROJECT_NAME: str = "Video Alert API"
     VERSION: str = "1.0.0"
@@ -14,9 +34,66 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str = "sqlite:///./dev.db"
+    DB_READER_POOL_SIZE: int = 4
+    DB_BUSY_TIMEOUT_MS: int = 5000
+    DB_MMAP_SIZE: int = 256 * 1024 * 1024
+    DB_CACHE_SIZE_KB: int = 64 * 1024
+    # Apply pending schema migrations when the app starts
+    DB_MIGRATE_ON_STARTUP: bool = True
+    # Write batching: queued writes are grouped into one transaction of at
+    # most DB_WRITE_BATCH_SIZE commands, waiting up to DB_WRITE_BATCH_WINDOW_MS
+    # for more; producers wait once DB_WRITE_QUEUE_SIZE writes are queued
+    DB_WRITE_BATCH_SIZE: int = 100
+    DB_WRITE_BATCH_WINDOW_MS: float = 1
+    DB_WRITE_QUEUE_SIZE: int = 1000
+    # Notification logs older than this many days are moved out of the main
+    # database into month-partitioned archive files in this directory
+    NOTIFICATION_ARCHIVE_DIR: str = "./archive"
+    NOTIFICATION_ARCHIVE_AFTER_DAYS: int = 30
+    # Crawl log retention: days to keep crawl_execution_logs per status, and
+    # for any other status. The purge runs every CRAWL_LOG_RETENTION_INTERVAL
+    # seconds (0 pauses it) in batches of CRAWL_LOG_RETENTION_BATCH_SIZE rows
+    CRAWL_LOG_RETENTION_DAYS: Dict[str, int] = {"success": 30, "failed": 90}
+    CRAWL_LOG_RETENTION_DEFAULT_DAYS: int = 30
+    CRAWL_LOG_RETENTION_INTERVAL: float = 3600
+    CRAWL_LOG_RETENTION_BATCH_SIZE: int = 500
 
     # Monitoring
     MONITORED_URL: str = "https://example.com/videos"
+    # Crawler HTTP client: request timeout in seconds and User-Agent header
+    CRAWL_HTTP_TIMEOUT: float = 30
+    CRAWL_USER_AGENT: str = "VideoAlertBot/1.0"
+    # Pages that only yield videos when rendered in a browser go straight to
+    # the browser, retrying a static fetch every CRAWL_STATIC_PROBE_INTERVAL
+    # crawls (0 never retries); CRAWL_RENDER_TIMEOUT bounds a render in seconds
+    CRAWL_STATIC_PROBE_INTERVAL: int = 20
+    CRAWL_RENDER_TIMEOUT: float = 30
+    # Browser pool: warm Chromium instances kept by the app (0, the default,
+    # disables rendering), each replaced after CRAWL_BROWSER_MAX_PAGES crawls
+    # or once it uses more than CRAWL_BROWSER_MAX_RSS_MB of memory (0 for no
+    # limit). Needs Playwright and its Chromium, which the image does not ship
+    CRAWL_BROWSER_POOL_SIZE: int = 0
+    CRAWL_BROWSER_MAX_PAGES: int = 100
+    CRAWL_BROWSER_MAX_RSS_MB: int = 1024
+    # Render profile: resource types and domains whose requests are aborted
+    # (optionally every other site), and the CSS selector of a listing item
+    # to wait for instead of network idle (empty waits for network idle)
+    CRAWL_RENDER_BLOCKED_RESOURCE_TYPES: List[str] = list(DEFAULT_BLOCKED_RESOURCE_TYPES)
+    CRAWL_RENDER_BLOCKED_DOMAINS: List[str] = list(DEFAULT_BLOCKED_DOMAINS)
+    CRAWL_RENDER_BLOCK_THIRD_PARTY: bool = False
+    CRAWL_ITEM_SELECTOR: str = ""
+    # Listing extraction: CSS selector of the element holding the listing
+    # (empty reads the whole page). Reading stops at its end, or after
+    # CRAWL_STOP_AFTER_KNOWN consecutive already-stored videos (0 never)
+    CRAWL_LISTING_SELECTOR: str = ""
+    CRAWL_STOP_AFTER_KNOWN: int = 1
+    # Content hash: the listing is fingerprinted without volatile elements,
+    # attributes and text patterns, and a crawl whose fingerprint matches
+    # the previous one stores nothing (logged as "unchanged")
+    CRAWL_CONTENT_HASH: bool = True
+    CRAWL_VOLATILE_ELEMENTS: List[str] = list(DEFAULT_VOLATILE_ELEMENTS)
+    CRAWL_VOLATILE_ATTRIBUTES: List[str] = list(DEFAULT_VOLATILE_ATTRIBUTES)
+    CRAWL_VOLATILE_PATTERNS: List[str] = list(DEFAULT_VOLATILE_PATTERNS)
 
     # Telegram
     TELEGRAM_BOT_TOKEN: str = "your_bot_token_here"
@@ -41,6 +118,183 @@ class Settings(BaseSettings):
         "https://*.replit.dev",
         "https://*.replit.app",
     ]
+    # Number of recent origin verdicts remembered by the CORS matcher
+    CORS_ORIGIN_CACHE_SIZE: int = 1024
+    # How long browsers may cache a preflight response (Access-Control-Max-Age)
+    CORS_PREFLIGHT_MAX_AGE: int = 600
+    # Number of distinct preflight responses kept server-side
+    CORS_PREFLIGHT_CACHE_SIZE: int = 256
+
+    # Admin authentication: primary token plus extra tokens accepted during rotation
+    X_ADMIN_TOKEN: str = ""
+    ADMIN_TOKENS: List[str] = []
+
+    # Settings reload: how often (in seconds) to poll .env for changes, 0 disables
+    SETTINGS_RELOAD_INTERVAL: float = 2.0
+
+    @field_validator("X_ADMIN_TOKEN", "ADMIN_TOKENS")
+    @classmethod
+    def _check_admin_token_length(cls, value):
+        """Refuse guessable admin tokens; an empty one disables it."""
+        for token in [value] if isinstance(value, str) else value:
+            if token.strip() and len(token.strip()) < MIN_ADMIN_TOKEN_LENGTH:
+                raise ValueError(
+                    f"admin tokens must be at least {MIN_ADMIN_TOKEN_LENGTH} characters long"
+                )
+        return value
+
+
+@dataclass(frozen=True)
+class SettingsSnapshot:
+    """
+    An immutable, versioned view of the settings.
+
+    Attributes:
+        version: Incremented every time a changed configuration is loaded
+        settings: The frozen Settings instance for this version
+    """
+    version: int
+    settings: Settings
+
+
+SettingsCallback = Callable[[SettingsSnapshot, SettingsSnapshot], None]
+
+# Settings the running app follows on a reload, by reading
+# settings_registry.settings at use time or by subscribing to changes. The
+# others are read once at startup and only take effect after a restart.
+RELOADABLE_SETTINGS = frozenset({
+    # Served live by GET /admin/system-variables
+    "MONITORED_URL",
+    "TELEGRAM_BOT_TOKEN",
+    "TELEGRAM_CHANNEL_ID",
+    "NOTIFICATION_ARCHIVE_DIR",
+    "CRAWL_LOG_RETENTION_DAYS",
+    "CRAWL_LOG_RETENTION_DEFAULT_DAYS",
+    "CRAWL_LOG_RETENTION_INTERVAL",
+    "CRAWL_LOG_RETENTION_BATCH_SIZE",
+    "ALLOWED_ORIGINS",
+    "CORS_ORIGIN_CACHE_SIZE",
+    "CORS_PREFLIGHT_MAX_AGE",
+    "CORS_PREFLIGHT_CACHE_SIZE",
+    "X_ADMIN_TOKEN",
+    "ADMIN_TOKENS",
+})
+
+
+class SettingsRegistry:
+    """
+    Holds the current settings snapshot and reloads it when ``.env`` changes.
+
+    The env file is watched with a cheap mtime/size poll. When it changes and
+    the resulting settings differ, a new snapshot is swapped in with a single
+    reference assignment and subscribers are called once with the previous
+    and current snapshots so they can rebuild any precomputed state.
+
+    Changes to settings outside ``reloadable`` are still published, but are
+    logged as needing a restart.
+    """
+
+    def __init__(
+        self,
+        settings_factory: Callable[[], Settings] = Settings,
+        env_file: str | os.PathLike | None = Settings.model_config.get("env_file"),
+        reloadable: Collection[str] | None = None,
+    ):
+        self._factory = settings_factory
+        self._env_file = env_file
+        self._reloadable = reloadable
+        self._env_stamp = self._stat_env_file()
+        self._snapshot = SettingsSnapshot(version=1, settings=settings_factory())
+        self._subscribers: list[SettingsCallback] = []
+        self._lock = threading.Lock()
+
+    @property
+    def snapshot(self) -> SettingsSnapshot:
+        """The current settings snapshot."""
+        return self._snapshot
+
+    @property
+    def settings(self) -> Settings:
+        """The current settings."""
+        return self._snapshot.settings
+
+    def subscribe(self, callback: SettingsCallback) -> Callable[[], None]:
+        """
+        Register a callback for settings changes.
+
+        Args:
+            callback: Called with (previous, current) snapshots after a change
+
+        Returns:
+            A function that removes the subscription
+        """
+        self._subscribers.append(callback)
+        return lambda: self._subscribers.remove(callback)
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        Reload settings if the env file changed (or unconditionally if forced).
+
+        Args:
+            force: Re-read settings even if the env file looks unchanged
+
+        Returns:
+            True if a new snapshot was published
+        """
+        with self._lock:
+            stamp = self._stat_env_file()
+            if not force and stamp == self._env_stamp:
+                return False
+            self._env_stamp = stamp
+
+            try:
+                new_settings = self._factory()
+            except Exception:
+                logger.exception("Failed to reload settings; keeping version %d",
+                                 self._snapshot.version)
+                return False
+
+            previous = self._snapshot
+            old_values, new_values = previous.settings.model_dump(), new_settings.model_dump()
+            if new_values == old_values:
+                return False
+            current = SettingsSnapshot(version=previous.version + 1, settings=new_settings)
+            self._snapshot = current
+
+        logger.info("Loaded settings version %d", current.version)
+        if self._reloadable is not None:
+            restart = sorted(
+                key for key in old_values.keys() | new_values.keys()
+                if key not in self._reloadable and old_values.get(key) != new_values.get(key)
+            )
+            if restart:
+                logger.warning("Changed settings take effect after a restart: %s",
+                               ", ".join(restart))
+        for callback in list(self._subscribers):
+            try:
+                callback(previous, current)
+            except Exception:
+                logger.exception("Settings change callback %r failed", callback)
+        return True
+
+    async def watch(self, interval: float) -> None:
+        """Poll the env file every ``interval`` seconds until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            self.reload()
+
+    def _stat_env_file(self) -> tuple[int, int] | None:
+        """Return (mtime_ns, size) of the env file, or None if it is missing."""
+        if not self._env_file:
+            return None
+        try:
+            stat = os.stat(self._env_file)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
 
+settings_registry = SettingsRegistry(reloadable=RELOADABLE_SETTINGS)
 
-settings = Settings()
+# Settings as loaded at startup; use settings_registry.settings for live values
+settings = settings_registry.settings
@@ -0,0 +1,175 @@
+"""
+CORS origin matching and middleware.
+
+Allowed origins are compiled once into lookup structures so that checking a
+request origin does not walk the configured list or compile regexes, and
+preflight responses are cached per distinct request.
+"""
+from functools import lru_cache
+from typing import Iterable
+
+from fastapi.middleware.cors import CORSMiddleware
+from starlette.datastructures import Headers
+from starlette.responses import Response
+
+from app.core.config import SettingsRegistry, SettingsSnapshot
+
+WILDCARD_PREFIX = "https://*."
+WILDCARD_SCHEME = "https://"
+# Settings the middleware follows when built with a registry
+_RELOADED_SETTINGS = (
+    "ALLOWED_ORIGINS",
+    "CORS_ORIGIN_CACHE_SIZE",
+    "CORS_PREFLIGHT_MAX_AGE",
+    "CORS_PREFLIGHT_CACHE_SIZE",
+)
+
+
+class OriginMatcher:
+    """
+    Precompiled matcher for the ``ALLOWED_ORIGINS`` setting.
+
+    Supports the same entry formats as the original per-request loop:
+    - ``"*"`` allows every origin
+    - ``"https://*.example.com"`` allows any https subdomain of example.com
+    - anything else must match the request origin exactly
+
+    Exact origins live in a set and wildcard entries in a set of domain
+    suffixes, so a lookup costs one hash probe per label of the origin host.
+    Verdicts for recently seen origins are kept in a bounded LRU cache.
+
+    Attributes:
+        allow_all: True if ``"*"`` was configured
+        exact_origins: Origins that must match exactly
+        wildcard_domains: Domain suffixes from ``https://*.`` entries
+    """
+
+    def __init__(self, allowed_origins: Iterable[str], cache_size: int = 1024):
+        origins = tuple(allowed_origins)
+        self.allow_all = "*" in origins
+        self.exact_origins = frozenset(
+            origin for origin in origins if not origin.startswith(WILDCARD_PREFIX)
+        )
+        self.wildcard_domains = frozenset(
+            origin[len(WILDCARD_PREFIX):]
+            for origin in origins
+            if origin.startswith(WILDCARD_PREFIX)
+        )
+        self.is_allowed = lru_cache(maxsize=cache_size)(self._match)
+
+    def _match(self, origin: str) -> bool:
+        """
+        Check an origin against the compiled entries, bypassing the cache.
+
+        Args:
+            origin: Value of the request ``Origin`` header
+
+        Returns:
+            True if the origin is allowed
+        """
+        if self.allow_all or origin in self.exact_origins:
+            return True
+
+        if not self.wildcard_domains or not origin.startswith(WILDCARD_SCHEME):
+            return False
+
+        # Equivalent to ^https://.*\.<domain>$: try every suffix that follows a dot
+        host = origin[len(WILDCARD_SCHEME):]
+        dot = host.find(".")
+        while dot != -1:
+            if host[dot + 1:] in self.wildcard_domains:
+                return True
+            dot = host.find(".", dot + 1)
+        return False
+
+
+class CustomCORSMiddleware(CORSMiddleware):
+    """
+    CORS middleware with wildcard subdomain support and a preflight cache.
+
+    Preflight responses only depend on the origin and the three
+    ``Access-Control-Request-*`` headers, so they are built once per distinct
+    combination and replayed from a bounded LRU cache afterwards. The cache is
+    cleared whenever the allowed origins change. With a registry, the
+    middleware follows ALLOWED_ORIGINS and the CORS_* settings on reload.
+    """
+
+    def __init__(
+        self,
+        app,
+        allow_origins: Iterable[str] = (),
+        origin_cache_size: int = 1024,
+        preflight_cache_size: int = 256,
+        settings_registry: SettingsRegistry | None = None,
+        **kwargs,
+    ):
+        self.app = app
+        self._cors_options = kwargs
+        self._origin_cache_size = origin_cache_size
+        self._cached_preflight = lru_cache(maxsize=preflight_cache_size)(
+            self._build_preflight
+        )
+        self.update_origins(allow_origins)
+        if settings_registry is not None:
+            settings_registry.subscribe(self._on_settings_change)
+
+    def _on_settings_change(
+        self, previous: SettingsSnapshot, current: SettingsSnapshot
+    ) -> None:
+        old, new = previous.settings, current.settings
+        if new.CORS_PREFLIGHT_CACHE_SIZE != old.CORS_PREFLIGHT_CACHE_SIZE:
+            self._cached_preflight = lru_cache(maxsize=new.CORS_PREFLIGHT_CACHE_SIZE)(
+                self._build_preflight
+            )
+        if any(getattr(old, key) != getattr(new, key) for key in _RELOADED_SETTINGS):
+            self._origin_cache_size = new.CORS_ORIGIN_CACHE_SIZE
+            self._cors_options["max_age"] = new.CORS_PREFLIGHT_MAX_AGE
+            self.update_origins(new.ALLOWED_ORIGINS)
+
+    def update_origins(self, allow_origins: Iterable[str]) -> None:
+        """
+        Replace the allowed origins and drop every cached preflight response.
+
+        Args:
+            allow_origins: New list of allowed origins
+        """
+        allow_origins = tuple(allow_origins)
+        # Re-run Starlette's setup so derived headers (e.g. for "*") stay consistent
+        super().__init__(self.app, allow_origins=allow_origins, **self._cors_options)
+        self.origin_matcher = OriginMatcher(
+            allow_origins, cache_size=self._origin_cache_size
+        )
+        self._cached_preflight.cache_clear()
+
+    def is_allowed_origin(self, origin: str) -> bool:
+        return self.origin_matcher.is_allowed(origin)
+
+    def preflight_response(self, request_headers: Headers) -> Response:
+        return self._cached_preflight(
+            request_headers["origin"],
+            request_headers["access-control-request-method"],
+            request_headers.get("access-control-request-headers"),
+            request_headers.get("access-control-request-private-network"),
+        )
+
+    def _build_preflight(
+        self,
+        origin: str,
+        method: str,
+        requested_headers: str | None,
+        private_network: str | None,
+    ) -> Response:
+        """Build the preflight response for one cache key."""
+        raw = [
+            (b"origin", origin.encode("latin-1")),
+            (b"access-control-request-method", method.encode("latin-1")),
+        ]
+        if requested_headers is not None:
+            raw.append(
+                (b"access-control-request-headers", requested_headers.encode("latin-1"))
+            )
+        if private_network is not None:
+            raw.append(
+                (b"access-control-request-private-network", private_network.encode("latin-1"))
+            )
+        return super().preflight_response(request_headers=Headers(raw=raw))
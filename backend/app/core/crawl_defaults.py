@@ -0,0 +1,37 @@
+"""
+Default crawler settings.
+
+They are kept apart from ``app.crawler`` so that ``app.core.config`` can
+use them without importing the crawler, and with it the database layer.
+"""
+
+# Requests a browser render aborts (see app.crawler.browser)
+DEFAULT_BLOCKED_RESOURCE_TYPES = ("image", "media", "font")
+DEFAULT_BLOCKED_DOMAINS = (
+    "doubleclick.net",
+    "googlesyndication.com",
+    "googletagservices.com",
+    "googletagmanager.com",
+    "google-analytics.com",
+    "adservice.google.com",
+    "amazon-adsystem.com",
+    "facebook.net",
+    "scorecardresearch.com",
+    "hotjar.com",
+)
+
+# Parts of the listing left out of its content fingerprint (see app.crawler.fingerprint)
+DEFAULT_VOLATILE_ELEMENTS = (
+    "script", "style", "noscript", "template", "iframe", "input", "time", "ins",
+    ".ad", ".ads", ".advert",
+)
+DEFAULT_VOLATILE_ATTRIBUTES = ("nonce", "datetime", "data-timestamp", "data-csrf-token")
+DEFAULT_VOLATILE_PATTERNS = (
+    # Relative dates: "3 minutes ago", "just now"
+    r"\b\d+\s*(?:second|minute|hour|day|week|month|year)s?\s+ago\b",
+    r"\bjust now\b",
+    # Absolute timestamps: 2024-07-01T12:00:00Z, 2024-07-01 12:00
+    r"\b\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}:?\d{2})?",
+    # View counters: "1,234 views", "1.2K views"
+    r"\b[\d.,]+\s*[KMB]?\s+views?\b",
+)
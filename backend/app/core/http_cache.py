@@ -0,0 +1,62 @@
+"""
+Helpers for HTTP conditional requests (ETag / If-None-Match).
+"""
+import hashlib
+from dataclasses import dataclass
+
+from fastapi import Response, status
+from pydantic import BaseModel
+
+
+@dataclass(frozen=True)
+class CachedJSON:
+    """
+    A pre-serialized JSON body together with its strong ETag.
+
+    Attributes:
+        body: Serialized JSON response body
+        etag: Strong entity tag (quoted) derived from the body
+    """
+    body: bytes
+    etag: str
+
+    @classmethod
+    def from_model(cls, model: BaseModel) -> "CachedJSON":
+        """Serialize a Pydantic model once and compute its ETag."""
+        body = model.model_dump_json().encode("utf-8")
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        return cls(body=body, etag=f'"{digest}"')
+
+    def response(self, if_none_match: str | None, cache_control: str) -> Response:
+        """
+        Build the response for a request, answering 304 when the ETag matches.
+
+        Args:
+            if_none_match: Value of the request ``If-None-Match`` header
+            cache_control: Value for the ``Cache-Control`` header
+
+        Returns:
+            A 304 response without body, or a 200 JSON response
+        """
+        headers = {"ETag": self.etag, "Cache-Control": cache_control}
+        if if_none_match is not None and etag_matches(if_none_match, self.etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(content=self.body, media_type="application/json", headers=headers)
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    Compare an ``If-None-Match`` header against an ETag.
+
+    Uses the weak comparison required for If-None-Match (RFC 9110), so
+    ``W/"abc"`` matches ``"abc"``.
+    """
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
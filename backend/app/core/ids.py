@@ -0,0 +1,47 @@
+"""
+Public record identifiers.
+
+Rows are keyed internally by their INTEGER rowid; every table also stores a
+random UUID as a 16-byte BLOB, which is what the API exposes. These helpers
+convert between the stored bytes and the canonical text form.
+"""
+import uuid
+
+# Namespace for deriving UUIDs from legacy ids that were not UUIDs
+LEGACY_ID_NAMESPACE = uuid.UUID("6f1d7c4e-3b0a-4f55-9a51-2a8b3c6d9e10")
+
+
+def new_uuid() -> bytes:
+    """A new random public id, as stored in the database."""
+    return uuid.uuid4().bytes
+
+
+def uuid_text(value: bytes) -> str:
+    """Canonical text form of a stored public id."""
+    return str(uuid.UUID(bytes=value))
+
+
+def parse_uuid(value: str) -> bytes | None:
+    """
+    Stored form of a public id received from a client.
+
+    Returns:
+        The 16 bytes, or None if ``value`` is not a UUID
+    """
+    try:
+        return uuid.UUID(value).bytes
+    except ValueError:
+        return None
+
+
+def uuid_blob(value: str | None) -> bytes | None:
+    """
+    Convert a legacy TEXT id to the stored public id.
+
+    Registered as the ``uuid_blob()`` SQL function on every connection for
+    the integer key migration. UUID strings keep their value; any other id
+    is mapped to a stable name-based UUID so repeated conversions agree.
+    """
+    if value is None:
+        return None
+    return parse_uuid(value) or uuid.uuid5(LEGACY_ID_NAMESPACE, value).bytes
@@ -0,0 +1,53 @@
+"""
+Opaque cursors for keyset pagination.
+"""
+import base64
+import json
+
+from fastapi import HTTPException, status
+
+
+def encode_cursor(*values) -> str:
+    """
+    Encode the sort key of the last row on a page as an opaque cursor.
+
+    Args:
+        values: JSON-serializable sort key values
+
+    Returns:
+        URL-safe cursor string
+    """
+    raw = json.dumps(list(values), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str, *types: type | tuple[type, ...]) -> list:
+    """
+    Decode a cursor produced by ``encode_cursor``.
+
+    Args:
+        cursor: Cursor from the client
+        types: Expected type of each sort key value, e.g. ``str, int``
+
+    Returns:
+        The sort key values
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed or its values do not
+            have the expected types
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError):
+        values = None
+    if not isinstance(values, list) or len(values) != len(types) or not all(
+        # JSON true/false decode to bool, which is an int subclass
+        isinstance(value, expected) and not isinstance(value, bool)
+        for value, expected in zip(values, types)
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor.",
+        )
+    return values
@@ -0,0 +1,68 @@
+"""
+Admin token verification.
+"""
+import hmac
+import secrets
+from typing import Iterable
+
+from app.core.config import Settings, SettingsSnapshot, settings_registry
+
+
+class AdminTokenVerifier:
+    """
+    Verifies admin tokens against a precomputed digest map.
+
+    Tokens are never kept in plain text: each one is stored as an HMAC-SHA256
+    digest under a random per-process key. Verifying a candidate hashes it
+    once and looks the digest up in a set. The lookup cost does not depend on
+    the number of active tokens, and because the key is secret, its timing
+    reveals nothing about how close a guess is to a real token. Several tokens
+    can be active at once to rotate credentials without downtime.
+    """
+
+    def __init__(self, tokens: Iterable[str] = ()):
+        self._key = secrets.token_bytes(32)
+        self._digests: frozenset[bytes] = frozenset()
+        self.update(tokens)
+
+    def update(self, tokens: Iterable[str]) -> None:
+        """Replace the set of active tokens; blank tokens are ignored."""
+        self._digests = frozenset(
+            self._digest(token.strip()) for token in tokens if token.strip()
+        )
+
+    @property
+    def token_count(self) -> int:
+        """Number of active tokens."""
+        return len(self._digests)
+
+    def verify(self, token: str) -> bool:
+        """
+        Check a candidate token.
+
+        Args:
+            token: Token from the request header
+
+        Returns:
+            True if the token matches one of the active tokens
+        """
+        return self._digest(token) in self._digests
+
+    def _digest(self, token: str) -> bytes:
+        return hmac.digest(self._key, token.encode("utf-8"), "sha256")
+
+
+def admin_tokens(settings: Settings) -> list[str]:
+    """All admin tokens accepted by the given settings."""
+    return [settings.X_ADMIN_TOKEN, *settings.ADMIN_TOKENS]
+
+
+admin_token_verifier = AdminTokenVerifier(admin_tokens(settings_registry.settings))
+
+
+def _on_settings_change(previous: SettingsSnapshot, current: SettingsSnapshot) -> None:
+    if admin_tokens(previous.settings) != admin_tokens(current.settings):
+        admin_token_verifier.update(admin_tokens(current.settings))
+
+
+settings_registry.subscribe(_on_settings_change)
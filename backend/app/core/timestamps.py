@@ -0,0 +1,13 @@
+"""
+Timestamps as stored in the database.
+
+Columns default to SQLite's CURRENT_TIMESTAMP, which is UTC text like
+``2024-07-01 12:00:00``; values written or compared from Python use the
+same form so they sort and compare as text.
+"""
+from datetime import datetime
+
+
+def format_timestamp(value: datetime) -> str:
+    """Format a UTC datetime the way SQLite's CURRENT_TIMESTAMP does."""
+    return value.strftime("%Y-%m-%d %H:%M:%S")
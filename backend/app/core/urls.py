@@ -0,0 +1,51 @@
+"""
+URL canonicalization and hashing for video deduplication.
+"""
+import hashlib
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that never change which video a URL points to
+TRACKING_PARAMS = frozenset({"fbclid", "gclid", "igshid", "mc_cid", "mc_eid", "ref", "si"})
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def canonical_url(url: str) -> str:
+    """
+    Normalize a video URL so equivalent spellings compare equal.
+
+    Lowercases the scheme and host, drops default ports, fragments, tracking
+    parameters (``utm_*`` and similar) and trailing slashes, and sorts the
+    remaining query parameters.
+
+    Args:
+        url: URL as extracted from the monitored page
+
+    Returns:
+        Canonical form of the URL
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    path = parts.path.rstrip("/") or "/"
+    query = urlencode(sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    ))
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+def url_hash(url: str) -> int:
+    """
+    64-bit hash of the canonical URL, as a signed integer for SQLite.
+
+    Args:
+        url: URL as extracted from the monitored page
+
+    Returns:
+        Signed 64-bit integer identifying the canonical URL
+    """
+    digest = hashlib.blake2b(canonical_url(url).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
@@ -0,0 +1,3 @@
+"""
+Crawling of the monitored page: fetching, rendering and extraction.
+"""
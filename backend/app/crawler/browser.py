@@ -0,0 +1,110 @@
+"""
+Rendering the monitored page in a headless browser with Playwright.
+
+Used for pages whose listing is built by JavaScript, when the static fetch
+finds no videos (see ``app.crawler.routing``). Browsers come from the
+application's pool (see ``app.crawler.pool``).
+
+Extraction only reads the HTML, so a render profile aborts the requests it
+does not need (images, fonts, video streams, ad and analytics domains) and
+waits for the listing's item selector instead of for the network to go idle.
+"""
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+from app.core.crawl_defaults import DEFAULT_BLOCKED_DOMAINS, DEFAULT_BLOCKED_RESOURCE_TYPES
+
+# Renders a URL in a browser and returns the resulting HTML
+Renderer = Callable[[str], Awaitable[str]]
+
+
+def _site(host: str) -> str:
+    """
+    Approximate registrable domain: the last two labels of a host name.
+
+    Good enough to tell a page's own subdomains from other sites without a
+    public suffix list; IP addresses are compared whole.
+    """
+    if host.replace(".", "").isdigit() or ":" in host:
+        return host
+    return ".".join(host.rsplit(".", 2)[-2:])
+
+
+@dataclass(frozen=True)
+class RenderProfile:
+    """
+    Which requests a render aborts and when the page counts as loaded.
+
+    Attributes:
+        blocked_resource_types: Playwright resource types to abort, e.g.
+            ``image``, ``media``, ``font``, ``stylesheet``
+        blocked_domains: Abort requests to these domains and their subdomains
+        block_third_party: Abort every request to another site than the page's
+        item_selector: CSS selector of a listing item; the render returns as
+            soon as one is attached. Empty waits for network idle instead.
+    """
+    blocked_resource_types: frozenset[str] = frozenset(DEFAULT_BLOCKED_RESOURCE_TYPES)
+    blocked_domains: tuple[str, ...] = DEFAULT_BLOCKED_DOMAINS
+    block_third_party: bool = False
+    item_selector: str = ""
+
+    @classmethod
+    def from_settings(cls, settings) -> "RenderProfile":
+        """Profile configured by the CRAWL_RENDER_* and CRAWL_ITEM_SELECTOR settings."""
+        return cls(
+            blocked_resource_types=frozenset(settings.CRAWL_RENDER_BLOCKED_RESOURCE_TYPES),
+            blocked_domains=tuple(settings.CRAWL_RENDER_BLOCKED_DOMAINS),
+            block_third_party=settings.CRAWL_RENDER_BLOCK_THIRD_PARTY,
+            item_selector=settings.CRAWL_ITEM_SELECTOR,
+        )
+
+    def blocks(self, resource_type: str, url: str, page_url: str) -> bool:
+        """Whether to abort a request made while rendering ``page_url``."""
+        if resource_type in self.blocked_resource_types:
+            return True
+        host = (urlsplit(url).hostname or "").lower()
+        if any(host == domain or host.endswith(f".{domain}") for domain in self.blocked_domains):
+            return True
+        if self.block_third_party:
+            page_host = (urlsplit(page_url).hostname or "").lower()
+            return _site(host) != _site(page_host)
+        return False
+
+
+NO_BLOCKING = RenderProfile(blocked_resource_types=frozenset(), blocked_domains=())
+
+
+async def render_page(
+    browser_context,
+    url: str,
+    timeout: float,
+    profile: RenderProfile = RenderProfile(),
+) -> str:
+    """
+    Load ``url`` in a new page of ``browser_context`` and return the rendered HTML.
+
+    Args:
+        browser_context: Playwright browser context, closed by the caller
+        url: Page URL
+        timeout: Seconds to wait for the page to load
+        profile: Requests to abort and what to wait for
+    """
+    async def intercept(route):
+        request = route.request
+        # Never block the page itself (or its redirects); ad iframes are fair game
+        main_document = request.is_navigation_request() and request.frame.parent_frame is None
+        if not main_document and profile.blocks(request.resource_type, request.url, url):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    if profile.blocked_resource_types or profile.blocked_domains or profile.block_third_party:
+        await browser_context.route("**/*", intercept)
+    page = await browser_context.new_page()
+    if profile.item_selector:
+        await page.goto(url, wait_until="domcontentloaded", timeout=timeout * 1000)
+        await page.wait_for_selector(profile.item_selector, state="attached", timeout=timeout * 1000)
+    else:
+        await page.goto(url, wait_until="networkidle", timeout=timeout * 1000)
+    return await page.content()
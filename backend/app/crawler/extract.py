@@ -0,0 +1,264 @@
+"""
+Streaming extraction of videos from the monitored page's listing.
+
+``ListingExtractor`` is an incremental HTML parser: response chunks are fed
+to it as they arrive and it returns each video as soon as the video's
+element is closed, without ever building a DOM. Once the listing container
+is closed it reports ``done`` so the caller can stop reading the response;
+everything after the listing (footer, scripts, other blocks) is never
+downloaded or parsed.
+
+Given a ``ContentFingerprint`` (see ``app.crawler.fingerprint``) it also
+hashes the listing as it goes and records the hash after each video.
+
+Selectors are single compound CSS selectors (``tag``, ``.class``, ``#id``
+or combinations like ``li.video``), matched against one element; that is
+all a listing needs and keeps matching O(1) per tag.
+"""
+import re
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from typing import TYPE_CHECKING
+from urllib.parse import urljoin
+
+from app.repositories.video_records import ExtractedVideo
+
+if TYPE_CHECKING:
+    from app.crawler.fingerprint import ContentFingerprint
+
+# Elements that never have content or an end tag
+VOID_ELEMENTS = frozenset({
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta",
+    "source", "track", "wbr",
+})
+# Elements closed implicitly by a sibling of the same kind
+SELF_NESTING_CLOSED = frozenset({"li", "p", "tr", "td", "th", "dt", "dd", "option"})
+
+_SELECTOR = re.compile(r"^(?P<tag>[a-zA-Z][\w-]*)?(?P<rest>(?:[.#][\w-]+)*)$")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@dataclass(frozen=True)
+class SimpleSelector:
+    """
+    A compound CSS selector: optional tag, ids and classes.
+
+    Attributes:
+        tag: Lowercase tag name, or None for any
+        ids: Required ids
+        classes: Required classes
+    """
+    tag: str | None = None
+    ids: frozenset[str] = frozenset()
+    classes: frozenset[str] = frozenset()
+
+    @classmethod
+    def parse(cls, selector: str) -> "SimpleSelector":
+        """
+        Parse ``tag``, ``.class``, ``#id`` and combinations like ``ul#videos.grid``.
+
+        Raises:
+            ValueError: For anything else (descendant combinators, attributes, ...)
+        """
+        match = _SELECTOR.match(selector.strip())
+        if not match or not selector.strip():
+            raise ValueError(f"Unsupported selector: {selector!r}")
+        parts = re.findall(r"([.#])([\w-]+)", match["rest"])
+        return cls(
+            tag=match["tag"].lower() if match["tag"] else None,
+            ids=frozenset(name for kind, name in parts if kind == "#"),
+            classes=frozenset(name for kind, name in parts if kind == "."),
+        )
+
+    def matches(self, tag: str, attrs: dict[str, str | None]) -> bool:
+        if self.tag is not None and tag != self.tag:
+            return False
+        if self.ids and attrs.get("id") not in self.ids:
+            return False
+        return self.classes <= set((attrs.get("class") or "").split())
+
+
+@dataclass(frozen=True)
+class ListingRules:
+    """
+    Where the videos are on the monitored page.
+
+    Attributes:
+        container: Element holding the listing; None reads the whole page
+        item: Element of one video inside the container; None treats every
+            link in the container as a video
+    """
+    container: SimpleSelector | None = None
+    item: SimpleSelector | None = None
+
+    @classmethod
+    def from_settings(cls, settings) -> "ListingRules":
+        """Rules configured by CRAWL_LISTING_SELECTOR and CRAWL_ITEM_SELECTOR."""
+        return cls(
+            container=SimpleSelector.parse(settings.CRAWL_LISTING_SELECTOR)
+            if settings.CRAWL_LISTING_SELECTOR else None,
+            item=SimpleSelector.parse(settings.CRAWL_ITEM_SELECTOR)
+            if settings.CRAWL_ITEM_SELECTOR else None,
+        )
+
+
+@dataclass
+class _Item:
+    depth: int
+    url: str | None = None
+    title: str | None = None
+    thumbnail: str | None = None
+    alt: str | None = None
+    text: list[str] | None = None
+
+
+class ListingExtractor(HTMLParser):
+    """
+    Incremental extractor for one page.
+
+    Attributes:
+        done: The listing container has been closed; further input is ignored
+        found: Videos extracted so far
+        fingerprints: With a fingerprint, its hash through the end of each
+            extracted video: ``fingerprints[n - 1]`` covers the first n
+    """
+
+    def __init__(
+        self,
+        rules: ListingRules,
+        base_url: str,
+        fingerprint: "ContentFingerprint | None" = None,
+    ):
+        """
+        Args:
+            rules: Listing and item selectors
+            base_url: URL of the page, for resolving relative links
+            fingerprint: Hashes the inside of the listing container
+        """
+        super().__init__(convert_charrefs=True)
+        self._rules = rules
+        self._base_url = base_url
+        self._stack: list[str] = []
+        # Depth of the container element; 0 when the whole page is the listing
+        self._container_depth: int | None = None if rules.container else 0
+        self._item: _Item | None = None
+        self._ready: list[ExtractedVideo] = []
+        self._fingerprint = fingerprint
+        self.done = False
+        self.found = 0
+        self.fingerprints: list[str] = []
+
+    def feed(self, data: str) -> list[ExtractedVideo]:
+        """
+        Parse the next chunk of the page.
+
+        Returns:
+            Videos completed by this chunk, in page order
+        """
+        if not self.done:
+            super().feed(data)
+        return self._take()
+
+    def close(self) -> list[ExtractedVideo]:
+        """
+        Finish the page.
+
+        Returns:
+            Videos completed by the end of the input (e.g. unclosed items)
+        """
+        if not self.done:
+            super().close()
+            while self._stack:
+                self._pop()
+        return self._take()
+
+    def _take(self) -> list[ExtractedVideo]:
+        ready, self._ready = self._ready, []
+        return ready
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        attrs = dict(attrs)
+        if tag in SELF_NESTING_CLOSED and self._stack and self._stack[-1] == tag:
+            self._pop()
+        void = tag in VOID_ELEMENTS
+        if not void:
+            self._stack.append(tag)
+        depth = len(self._stack)
+
+        if self._container_depth is None:
+            if not void and self._rules.container.matches(tag, attrs):
+                self._container_depth = depth
+            return
+        if self._fingerprint is not None:
+            self._fingerprint.start(tag, attrs, void)
+
+        item = self._item
+        if item is None:
+            starts_item = (
+                self._rules.item.matches(tag, attrs) if self._rules.item
+                else tag == "a" and attrs.get("href")
+            )
+            if starts_item and not void:
+                item = self._item = _Item(depth=depth, text=[])
+        if item is None:
+            return
+        if tag == "a" and item.url is None and attrs.get("href"):
+            item.url = urljoin(self._base_url, attrs["href"])
+            item.title = attrs.get("title") or None
+        elif tag == "img" and item.thumbnail is None:
+            src = attrs.get("src") or attrs.get("data-src")
+            if src:
+                item.thumbnail = urljoin(self._base_url, src)
+                item.alt = attrs.get("alt") or None
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_ELEMENTS and self._stack and self._stack[-1] == tag:
+            self._pop()
+
+    def handle_endtag(self, tag):
+        if self.done or tag not in self._stack:
+            return
+        while self._stack and self._stack[-1] != tag:
+            self._pop()
+        self._pop()
+
+    def handle_data(self, data):
+        if self._item is not None:
+            self._item.text.append(data)
+        if self._fingerprint is not None and self._container_depth is not None and not self.done:
+            self._fingerprint.data(data)
+
+    def _pop(self) -> None:
+        """Close the innermost open element."""
+        depth = len(self._stack)
+        tag = self._stack.pop()
+        in_listing = self._container_depth is not None and depth > self._container_depth
+        if self._fingerprint is not None and in_listing:
+            self._fingerprint.end(tag)
+        if self._item is not None and depth == self._item.depth:
+            self._finish_item()
+        if self._container_depth and depth == self._container_depth:
+            self.done = True
+
+    def _finish_item(self) -> None:
+        item, self._item = self._item, None
+        if item.url is None:
+            return
+        text = _WHITESPACE.sub(" ", "".join(item.text)).strip()
+        self._ready.append(ExtractedVideo(
+            title=item.title or text or item.alt or item.url,
+            url=item.url,
+            thumbnail=item.thumbnail,
+        ))
+        self.found += 1
+        if self._fingerprint is not None:
+            self.fingerprints.append(self._fingerprint.hexdigest())
+
+
+def extract_listing(html: str, rules: ListingRules, base_url: str) -> list[ExtractedVideo]:
+    """All videos of a complete page."""
+    extractor = ListingExtractor(rules, base_url)
+    return extractor.feed(html) + extractor.close()
@@ -0,0 +1,165 @@
+"""
+HTTP fetching of the monitored page with conditional requests.
+
+The ``ETag`` and ``Last-Modified`` validators of each successful fetch are
+stored per URL (see ``app.repositories.crawled_pages``) and sent back as
+``If-None-Match`` / ``If-Modified-Since`` on the next crawl. An unchanged
+page then costs a 304 without a body instead of a full download and parse.
+"""
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+import httpx
+
+from app.core.config import Settings
+
+
+@dataclass(frozen=True)
+class PageValidators:
+    """
+    Cache validators of a fetched page.
+
+    Attributes:
+        etag: ``ETag`` response header, quoted as received
+        last_modified: ``Last-Modified`` response header (HTTP date)
+    """
+    etag: str | None = None
+    last_modified: str | None = None
+
+    @classmethod
+    def from_headers(cls, headers: httpx.Headers) -> "PageValidators":
+        return cls(etag=headers.get("etag"), last_modified=headers.get("last-modified"))
+
+    def request_headers(self) -> dict[str, str]:
+        """Conditional request headers for these validators."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def merge(self, other: "PageValidators") -> "PageValidators":
+        """These validators updated with the ones ``other`` carries."""
+        return PageValidators(
+            etag=other.etag or self.etag,
+            last_modified=other.last_modified or self.last_modified,
+        )
+
+
+@dataclass(frozen=True)
+class FetchedPage:
+    """
+    Result of fetching a page.
+
+    Attributes:
+        url: Final URL after redirects
+        status_code: HTTP status (200 or 304)
+        validators: Validators to store for the next fetch
+        text: Decoded body; empty when not modified or streamed
+        complete: False if a streamed read stopped before the end of the body
+    """
+    url: str
+    status_code: int
+    validators: PageValidators
+    text: str = ""
+    complete: bool = True
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status_code == httpx.codes.NOT_MODIFIED
+
+
+def create_http_client(settings: Settings) -> httpx.AsyncClient:
+    """HTTP client for crawling, shared across crawls to reuse connections."""
+    return httpx.AsyncClient(
+        timeout=settings.CRAWL_HTTP_TIMEOUT,
+        follow_redirects=True,
+        headers={"User-Agent": settings.CRAWL_USER_AGENT},
+    )
+
+
+async def fetch_page(
+    client: httpx.AsyncClient,
+    url: str,
+    validators: PageValidators | None = None,
+) -> FetchedPage:
+    """
+    GET a page, conditionally if validators from a previous fetch are known.
+
+    Args:
+        client: HTTP client
+        url: Page URL
+        validators: Validators stored after the previous fetch
+
+    Returns:
+        The page; ``not_modified`` is set when the server answered 304
+
+    Raises:
+        httpx.HTTPStatusError: For error responses
+        httpx.TimeoutException: When the server did not answer in time
+        httpx.HTTPError: For other transport errors
+    """
+    validators = validators or PageValidators()
+    response = await client.get(url, headers=validators.request_headers())
+    if response.status_code == httpx.codes.NOT_MODIFIED:
+        # A 304 may carry refreshed validators; keep the old ones otherwise
+        return FetchedPage(
+            url=str(response.url),
+            status_code=response.status_code,
+            validators=validators.merge(PageValidators.from_headers(response.headers)),
+        )
+    response.raise_for_status()
+    return FetchedPage(
+        url=str(response.url),
+        status_code=response.status_code,
+        validators=PageValidators.from_headers(response.headers),
+        text=response.text,
+    )
+
+
+async def stream_page(
+    client: httpx.AsyncClient,
+    url: str,
+    validators: PageValidators | None,
+    consume: Callable[[str], Awaitable[bool]],
+) -> FetchedPage:
+    """
+    GET a page like ``fetch_page`` but hand its body to ``consume`` chunk by chunk.
+
+    Reading stops as soon as ``consume`` returns True; the rest of the body
+    is never downloaded and the connection is closed rather than reused.
+
+    Args:
+        client: HTTP client
+        url: Page URL
+        validators: Validators stored after the previous fetch
+        consume: Called with each decoded chunk; returns True to stop
+
+    Returns:
+        The page without ``text``; ``not_modified`` is set when the server
+        answered 304
+
+    Raises:
+        Same as ``fetch_page``
+    """
+    validators = validators or PageValidators()
+    async with client.stream("GET", url, headers=validators.request_headers()) as response:
+        if response.status_code == httpx.codes.NOT_MODIFIED:
+            return FetchedPage(
+                url=str(response.url),
+                status_code=response.status_code,
+                validators=validators.merge(PageValidators.from_headers(response.headers)),
+            )
+        response.raise_for_status()
+        complete = True
+        async for chunk in response.aiter_text():
+            if await consume(chunk):
+                complete = False
+                break
+    return FetchedPage(
+        url=str(response.url),
+        status_code=response.status_code,
+        validators=PageValidators.from_headers(response.headers),
+        complete=complete,
+    )
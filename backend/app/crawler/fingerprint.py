@@ -0,0 +1,138 @@
+"""
+Content fingerprints of the monitored page's listing.
+
+Many servers send no cache validators, or fresh ones on every request
+because the page embeds timestamps, CSRF tokens or rotating ads. The
+listing is therefore also hashed while it is extracted (see
+``app.crawler.extract``), after normalization: attributes are sorted,
+whitespace is collapsed and volatile parts are left out. Volatile parts are
+whole elements (scripts, ad slots, ``<time>``), attributes (nonces) and text
+patterns (relative dates, view counts), all configurable.
+"""
+import hashlib
+import re
+from dataclasses import dataclass
+
+from app.core.crawl_defaults import (
+    DEFAULT_VOLATILE_ATTRIBUTES,
+    DEFAULT_VOLATILE_ELEMENTS,
+    DEFAULT_VOLATILE_PATTERNS,
+)
+from app.crawler.extract import SimpleSelector
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+@dataclass(frozen=True)
+class VolatileRules:
+    """
+    Parts of the listing left out of its fingerprint.
+
+    Attributes:
+        elements: Elements dropped with their content
+        attributes: Attribute names dropped from every element
+        patterns: Removed from text and attribute values
+    """
+    elements: tuple[SimpleSelector, ...] = ()
+    attributes: frozenset[str] = frozenset()
+    patterns: tuple[re.Pattern, ...] = ()
+
+    @classmethod
+    def parse(cls, elements, attributes, patterns) -> "VolatileRules":
+        """
+        Rules from selector strings, attribute names and regular expressions.
+
+        Raises:
+            ValueError: For an unsupported selector
+            re.error: For an invalid pattern
+        """
+        return cls(
+            elements=tuple(SimpleSelector.parse(selector) for selector in elements),
+            attributes=frozenset(name.lower() for name in attributes),
+            patterns=tuple(re.compile(pattern, re.IGNORECASE) for pattern in patterns),
+        )
+
+    @classmethod
+    def from_settings(cls, settings) -> "VolatileRules | None":
+        """Rules configured by the CRAWL_VOLATILE_* settings; None if CRAWL_CONTENT_HASH is off."""
+        if not settings.CRAWL_CONTENT_HASH:
+            return None
+        return cls.parse(
+            settings.CRAWL_VOLATILE_ELEMENTS,
+            settings.CRAWL_VOLATILE_ATTRIBUTES,
+            settings.CRAWL_VOLATILE_PATTERNS,
+        )
+
+
+DEFAULT_VOLATILE_RULES = VolatileRules.parse(
+    DEFAULT_VOLATILE_ELEMENTS, DEFAULT_VOLATILE_ATTRIBUTES, DEFAULT_VOLATILE_PATTERNS
+)
+
+
+class ContentFingerprint:
+    """
+    Running hash of normalized markup, fed element by element.
+
+    The hash does not depend on how the page was split into chunks: text is
+    buffered until the next tag before it is normalized.
+    """
+
+    def __init__(self, rules: VolatileRules = DEFAULT_VOLATILE_RULES):
+        self._rules = rules
+        self._hash = hashlib.blake2b(digest_size=16)
+        # Per open element: whether it is (inside) a volatile element
+        self._open: list[bool] = []
+        self._volatile = 0
+        self._text: list[str] = []
+
+    def start(self, tag: str, attrs: dict[str, str | None], void: bool) -> None:
+        """An element starts; void elements get no ``end``."""
+        self._flush_text()
+        volatile = self._volatile > 0 or any(
+            selector.matches(tag, attrs) for selector in self._rules.elements
+        )
+        if not void:
+            self._open.append(volatile)
+            self._volatile += volatile
+        if volatile:
+            return
+        kept = "".join(
+            f" {name}={self._clean(value or '')}"
+            for name, value in sorted(attrs.items())
+            if name not in self._rules.attributes
+        )
+        self._update(f"<{tag}{kept}>")
+
+    def end(self, tag: str) -> None:
+        """The innermost open element ends."""
+        self._flush_text()
+        if not self._open:
+            return
+        volatile = self._open.pop()
+        self._volatile -= volatile
+        if not volatile:
+            self._update(f"</{tag}>")
+
+    def data(self, text: str) -> None:
+        if not self._volatile:
+            self._text.append(text)
+
+    def hexdigest(self) -> str:
+        """Hash of everything fed so far."""
+        self._flush_text()
+        return self._hash.hexdigest()
+
+    def _flush_text(self) -> None:
+        if self._text:
+            text, self._text = self._clean("".join(self._text)), []
+            if text:
+                self._update(text)
+
+    def _clean(self, value: str) -> str:
+        for pattern in self._rules.patterns:
+            value = pattern.sub("", value)
+        return _WHITESPACE.sub(" ", value).strip()
+
+    def _update(self, token: str) -> None:
+        self._hash.update(token.encode())
+        self._hash.update(b"\0")
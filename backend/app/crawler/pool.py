@@ -0,0 +1,295 @@
+"""
+Pool of warm Playwright browsers shared by all crawls.
+
+Launching Chromium costs seconds and hundreds of MB, so the application
+lifespan keeps ``size`` browsers running and every crawl borrows one for the
+duration of a fresh browser context: cookies, cache and storage are isolated
+per crawl while the browser process is reused.
+
+Browsers are replaced in the background after ``max_pages`` contexts or when
+their processes use more than ``max_rss_bytes`` (Chromium leaks memory over
+long runs). A browser found disconnected when it is checked out has crashed
+and is relaunched before the crawl gets it.
+"""
+import asyncio
+import logging
+import os
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+
+from app.crawler.browser import Renderer, RenderProfile, render_page
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIZE = 1
+DEFAULT_MAX_PAGES = 100
+
+# Launches a browser (playwright.async_api.Browser)
+BrowserLauncher = Callable[[], Awaitable]
+# Memory of a browser's processes in bytes, or None if unknown
+RssProbe = Callable[[object], Awaitable[int | None]]
+
+
+@dataclass
+class BrowserPoolMetrics:
+    """
+    Counters describing the pool.
+
+    Attributes:
+        size: Browsers the pool keeps
+        in_use: Browsers lent to a crawl right now
+        idle: Running browsers waiting for a crawl
+        launched: Browsers launched since startup
+        recycled: Browsers replaced for their page count or memory
+        crashed: Browsers found disconnected and relaunched
+        launch_failures: Launches that raised
+        pages: Browser contexts handed out
+        launch_seconds: Total time spent launching
+        max_launch_seconds: Slowest launch
+    """
+    size: int = 0
+    in_use: int = 0
+    idle: int = 0
+    launched: int = 0
+    recycled: int = 0
+    crashed: int = 0
+    launch_failures: int = 0
+    pages: int = 0
+    launch_seconds: float = 0.0
+    max_launch_seconds: float = 0.0
+
+    @property
+    def mean_launch_seconds(self) -> float:
+        """Average launch time."""
+        return self.launch_seconds / self.launched if self.launched else 0.0
+
+
+@dataclass
+class _PooledBrowser:
+    browser: object
+    pages: int = 0
+
+
+async def chromium_rss_bytes(browser) -> int | None:
+    """
+    Resident memory of all processes of a Chromium browser.
+
+    Process ids come from the DevTools protocol and sizes from ``/proc``, so
+    this only works for Chromium on Linux; elsewhere it returns None.
+    """
+    try:
+        session = await browser.new_browser_cdp_session()
+        try:
+            info = await session.send("SystemInfo.getProcessInfo")
+        finally:
+            await session.detach()
+    except Exception:
+        return None
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    total = 0
+    for process in info.get("processInfo", []):
+        try:
+            with open(f"/proc/{process['id']}/statm") as statm:
+                total += int(statm.read().split()[1]) * page_size
+        except (OSError, ValueError, IndexError, KeyError):
+            continue
+    return total or None
+
+
+async def _close_quietly(closeable) -> None:
+    try:
+        await closeable.close()
+    except Exception:
+        logger.debug("Closing %r failed", closeable, exc_info=True)
+
+
+class BrowserPool:
+    """
+    Keeps warm browsers and lends them out one browser context at a time.
+
+    Attributes:
+        metrics: Pool counters
+    """
+
+    def __init__(
+        self,
+        size: int = DEFAULT_SIZE,
+        max_pages: int = DEFAULT_MAX_PAGES,
+        max_rss_bytes: int | None = None,
+        launch: BrowserLauncher | None = None,
+        rss: RssProbe = chromium_rss_bytes,
+    ):
+        """
+        Args:
+            size: Number of browsers to keep
+            max_pages: Replace a browser after this many contexts
+            max_rss_bytes: Replace a browser whose processes use more memory
+            launch: Browser launcher; defaults to headless Playwright Chromium
+            rss: Memory probe used with ``max_rss_bytes``
+        """
+        self._size = size
+        self._max_pages = max_pages
+        self._max_rss_bytes = max_rss_bytes
+        self._launch_browser = launch or self._launch_chromium
+        self._rss = rss
+        self._playwright = None
+        # A slot is a running browser, or None for one to launch on checkout
+        self._slots: asyncio.Queue[_PooledBrowser | None] = asyncio.Queue()
+        self._replacements: set[asyncio.Task] = set()
+        self._stopped = False
+        self.metrics = BrowserPoolMetrics(size=size)
+
+    @classmethod
+    def from_settings(cls, settings) -> "BrowserPool":
+        """Create a pool configured by the CRAWL_BROWSER_* settings."""
+        return cls(
+            size=settings.CRAWL_BROWSER_POOL_SIZE,
+            max_pages=settings.CRAWL_BROWSER_MAX_PAGES,
+            max_rss_bytes=settings.CRAWL_BROWSER_MAX_RSS_MB * 1024 * 1024 or None,
+        )
+
+    async def start(self) -> None:
+        """
+        Launch the browsers.
+
+        A browser that fails to launch (e.g. browsers not installed) is
+        logged and launched again on first use, so the application starts
+        either way.
+        """
+        for _ in range(self._size):
+            try:
+                self._put(await self._launch())
+            except Exception:
+                logger.exception("Could not launch a browser; retrying on first use")
+                self._put(None)
+
+    async def stop(self) -> None:
+        """Close every browser. Browsers still lent out close when returned."""
+        self._stopped = True
+        for task in list(self._replacements):
+            await asyncio.gather(task, return_exceptions=True)
+        while not self._slots.empty():
+            slot = self._slots.get_nowait()
+            if slot is not None:
+                self.metrics.idle -= 1
+                await _close_quietly(slot.browser)
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    @asynccontextmanager
+    async def context(self, **options) -> AsyncIterator:
+        """
+        Borrow a browser for one isolated browser context.
+
+        Waits for a free browser if all are in use.
+
+        Args:
+            options: Passed to ``Browser.new_context``
+
+        Yields:
+            The browser context; it is closed on exit
+        """
+        if self._stopped:
+            raise RuntimeError("Browser pool is stopped")
+        slot = await self._slots.get()
+        if slot is not None:
+            self.metrics.idle -= 1
+        self.metrics.in_use += 1
+        try:
+            slot = await self._ensure_running(slot)
+            browser_context = await slot.browser.new_context(**options)
+            slot.pages += 1
+            self.metrics.pages += 1
+            try:
+                yield browser_context
+            finally:
+                await _close_quietly(browser_context)
+        finally:
+            self.metrics.in_use -= 1
+            await self._give_back(slot)
+
+    def renderer(self, timeout: float, profile: RenderProfile = RenderProfile()) -> Renderer:
+        """A renderer for ``app.services.crawl`` backed by this pool."""
+        async def render(url: str) -> str:
+            async with self.context() as browser_context:
+                return await render_page(browser_context, url, timeout, profile)
+        return render
+
+    async def _ensure_running(self, slot: _PooledBrowser | None) -> _PooledBrowser:
+        if slot is not None and slot.browser.is_connected():
+            return slot
+        if slot is not None:
+            self.metrics.crashed += 1
+            logger.warning("Browser disconnected after %d pages; relaunching", slot.pages)
+        return await self._launch()
+
+    async def _give_back(self, slot: _PooledBrowser | None) -> None:
+        """Return a slot, replacing its browser if it is dead or worn out."""
+        if slot is None or not slot.browser.is_connected():
+            # Failed launch or crash during the crawl: launch on next checkout
+            self._put(None)
+            return
+        if self._stopped:
+            await _close_quietly(slot.browser)
+            return
+        reason = await self._recycle_reason(slot)
+        if reason is None:
+            self._put(slot)
+            return
+        logger.info("Recycling browser: %s", reason)
+        self.metrics.recycled += 1
+        task = asyncio.create_task(self._replace(slot))
+        self._replacements.add(task)
+        task.add_done_callback(self._replacements.discard)
+
+    async def _recycle_reason(self, slot: _PooledBrowser) -> str | None:
+        if slot.pages >= self._max_pages:
+            return f"served {slot.pages} pages"
+        if self._max_rss_bytes:
+            rss = await self._rss(slot.browser)
+            if rss is not None and rss > self._max_rss_bytes:
+                return f"using {rss // (1024 * 1024)} MB"
+        return None
+
+    async def _replace(self, slot: _PooledBrowser) -> None:
+        """Close a worn-out browser and launch its successor off the crawl's path."""
+        await _close_quietly(slot.browser)
+        try:
+            replacement = None if self._stopped else await self._launch()
+        except Exception:
+            logger.exception("Could not relaunch a browser; retrying on next use")
+            replacement = None
+        if self._stopped and replacement is not None:
+            await _close_quietly(replacement.browser)
+            return
+        self._put(replacement)
+
+    def _put(self, slot: _PooledBrowser | None) -> None:
+        if slot is not None:
+            self.metrics.idle += 1
+        self._slots.put_nowait(slot)
+
+    async def _launch(self) -> _PooledBrowser:
+        start = time.perf_counter()
+        try:
+            browser = await self._launch_browser()
+        except Exception:
+            self.metrics.launch_failures += 1
+            raise
+        elapsed = time.perf_counter() - start
+        self.metrics.launched += 1
+        self.metrics.launch_seconds += elapsed
+        self.metrics.max_launch_seconds = max(self.metrics.max_launch_seconds, elapsed)
+        logger.info("Launched browser in %.2fs", elapsed)
+        return _PooledBrowser(browser)
+
+    async def _launch_chromium(self):
+        if self._playwright is None:
+            # Imported here so the API and static crawls work without browsers installed
+            from playwright.async_api import async_playwright
+
+            self._playwright = await async_playwright().start()
+        return await self._playwright.chromium.launch(headless=True)
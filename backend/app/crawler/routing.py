@@ -0,0 +1,54 @@
+"""
+Learned choice between static fetching and browser rendering per URL.
+
+A static HTTP fetch is cheap; rendering in a browser is slow but handles
+pages that build their listing with JavaScript. Trying static first on every
+crawl wastes a fetch on JS-only pages, so each URL remembers the mode that
+last produced videos and goes straight to it. A page that needed the
+browser gets a static probe every ``probe_every`` crawls in case it stopped
+needing one.
+"""
+from dataclasses import dataclass
+
+STATIC = "static"
+BROWSER = "browser"
+
+
+@dataclass(frozen=True)
+class RenderStrategy:
+    """
+    What a URL's past crawls taught about rendering it.
+
+    Attributes:
+        mode: Mode that last produced videos (``STATIC`` or ``BROWSER``)
+        crawls_since_probe: Browser crawls since static was last tried
+    """
+    mode: str = STATIC
+    crawls_since_probe: int = 0
+
+    def try_static(self, probe_every: int) -> bool:
+        """
+        Whether the next crawl should start with a static fetch.
+
+        Args:
+            probe_every: Re-probe static on every n-th crawl of a page learned
+                as ``BROWSER``; 0 never re-probes
+        """
+        if self.mode == STATIC:
+            return True
+        return probe_every > 0 and self.crawls_since_probe + 1 >= probe_every
+
+    def learn(self, tried_static: bool, produced_by: str | None) -> "RenderStrategy":
+        """
+        The strategy after a crawl.
+
+        Args:
+            tried_static: Whether the crawl started with a static fetch
+            produced_by: Mode whose output contained videos; None if neither
+                did, which keeps the learned mode (an empty listing says
+                nothing about how to render the page)
+        """
+        mode = produced_by or self.mode
+        if mode == STATIC:
+            return RenderStrategy(STATIC)
+        return RenderStrategy(BROWSER, 0 if tried_static else self.crawls_since_probe + 1)
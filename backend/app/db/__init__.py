@@ -0,0 +1,8 @@
+"""
+Database access: async engines, the single-writer actor, schema migrations
+and table statistics.
+"""
+from app.db.engine import Database
+from app.db.writer import DatabaseWriter, WriteError
+
+__all__ = ["Database", "DatabaseWriter", "WriteError"]
@@ -0,0 +1,346 @@
+"""
+Cold storage for old notification logs.
+
+Logs older than a configurable age are moved out of the main database into
+one SQLite file per calendar month (``notification_logs_YYYY_MM.db``, by
+``sent_at``). The main database then only holds recent logs and stays small
+enough to live in the page cache, while archived logs remain queryable:
+readers attach an archive file read-only for the duration of a query that
+reaches past the main database (see ``Database.read``).
+
+Like the migrations, the archiver uses the standard library ``sqlite3``
+module so it can run from ``scripts/archive_logs.py``. Archive files written
+before the integer key migration are upgraded in place (see
+``upgrade_archive``) when the app migrates its database and before every
+archiving run.
+"""
+import logging
+import sqlite3
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable
+
+from app.core.timestamps import format_timestamp
+from app.db.migrations import connect
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_PREFIX = "notification_logs_"
+ARCHIVE_SUFFIX = ".db"
+ARCHIVE_ALIAS = "archive"
+ARCHIVE_COLUMNS = ("id", "uuid", "video_id", "schedule_id", "status", "error_details", "sent_at")
+
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_BATCH_PAUSE = 0.01
+
+# Same columns as the main table, without the foreign keys: the referenced
+# videos and schedules live in (and may be deleted from) the main database.
+# Rows keep their main database id, which AUTOINCREMENT never reuses.
+ARCHIVE_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS {schema}.notification_logs (
+        id INTEGER PRIMARY KEY,
+        uuid BLOB NOT NULL,
+        video_id INTEGER NOT NULL,
+        schedule_id INTEGER NOT NULL,
+        status TEXT NOT NULL,
+        error_details TEXT,
+        sent_at TIMESTAMP NOT NULL
+    )
+    """,
+    "CREATE UNIQUE INDEX IF NOT EXISTS {schema}.idx_notification_logs_uuid "
+    "ON notification_logs(uuid)",
+    "CREATE INDEX IF NOT EXISTS {schema}.idx_notification_logs_sent_at "
+    "ON notification_logs(sent_at DESC, id)",
+)
+
+
+@dataclass(frozen=True)
+class ArchiveFile:
+    """
+    One monthly archive file.
+
+    Attributes:
+        month: Month covered, as ``YYYY-MM``
+        path: Location of the SQLite file
+    """
+    month: str
+    path: Path
+
+    @property
+    def starts_at(self) -> str:
+        """First ``sent_at`` value that can be stored in this file."""
+        return f"{self.month}-01 00:00:00"
+
+    @property
+    def ends_at(self) -> str:
+        """First ``sent_at`` value after this file's month."""
+        year, month = map(int, self.month.split("-"))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        return f"{year:04d}-{month:02d}-01 00:00:00"
+
+    @property
+    def uri(self) -> str:
+        """URI attaching the file read-only, with the path percent-encoded."""
+        return f"{self.path.resolve().as_uri()}?mode=ro"
+
+
+def archive_file(archive_dir: str | Path, month: str) -> ArchiveFile:
+    """The archive file for a ``YYYY-MM`` month (which may not exist yet)."""
+    name = f"{ARCHIVE_PREFIX}{month.replace('-', '_')}{ARCHIVE_SUFFIX}"
+    return ArchiveFile(month=month, path=Path(archive_dir) / name)
+
+
+def list_archives(archive_dir: str | Path) -> list[ArchiveFile]:
+    """Existing archive files, newest month first."""
+    archive_dir = Path(archive_dir)
+    if not archive_dir.is_dir():
+        return []
+    archives = []
+    for path in archive_dir.glob(f"{ARCHIVE_PREFIX}*{ARCHIVE_SUFFIX}"):
+        month = path.name[len(ARCHIVE_PREFIX):-len(ARCHIVE_SUFFIX)].replace("_", "-")
+        archives.append(ArchiveFile(month=month, path=path))
+    return sorted(archives, key=lambda archive: archive.month, reverse=True)
+
+
+def upgrade_archive(conn: sqlite3.Connection, archive: ArchiveFile) -> int:
+    """
+    Re-key an archive file written before integer keys (migration 6).
+
+    Such files have TEXT ids and foreign keys and no ``uuid`` column. Each
+    row gets a new id reserved from the main database's AUTOINCREMENT
+    sequence, so ids stay unique across tiers, and keeps its old id as its
+    public uuid (see ``uuid_blob``). Videos and schedules are looked up by
+    public id in the main database; a deleted one maps to 0 and is listed
+    with a null public id, like any archived log whose parent is gone.
+
+    The ids are reserved in a transaction on the main database before the
+    file is rebuilt in one on the archive: a crash in between only leaves a
+    gap in the sequence, and the next run starts over.
+
+    Args:
+        conn: Connection to the main database (see ``archive_notification_logs``)
+        archive: Archive file to upgrade
+
+    Returns:
+        Rows re-keyed; 0 if the file is already current
+    """
+    conn.execute(f"ATTACH DATABASE ? AS {ARCHIVE_ALIAS}", (str(archive.path),))
+    try:
+        columns = {
+            row[1]
+            for row in conn.execute(f"PRAGMA {ARCHIVE_ALIAS}.table_info(notification_logs)")
+        }
+        if not columns or "uuid" in columns:
+            return 0
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = conn.execute(
+                f"SELECT COUNT(*) FROM {ARCHIVE_ALIAS}.notification_logs"
+            ).fetchone()[0]
+            last_id = _reserve_ids(conn, rows)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+        conn.execute("BEGIN")
+        try:
+            conn.execute(
+                f"ALTER TABLE {ARCHIVE_ALIAS}.notification_logs RENAME TO legacy_notification_logs"
+            )
+            conn.execute(f"DROP INDEX IF EXISTS {ARCHIVE_ALIAS}.idx_notification_logs_sent_at")
+            for statement in ARCHIVE_SCHEMA:
+                conn.execute(statement.format(schema=ARCHIVE_ALIAS))
+            conn.execute(
+                f"""
+                INSERT INTO {ARCHIVE_ALIAS}.notification_logs ({", ".join(ARCHIVE_COLUMNS)})
+                SELECT ? + ROW_NUMBER() OVER (ORDER BY legacy.sent_at, legacy.rowid),
+                       uuid_blob(legacy.id),
+                       COALESCE((SELECT v.id FROM main.video_records AS v
+                                 WHERE v.uuid = uuid_blob(legacy.video_id)), 0),
+                       COALESCE((SELECT s.id FROM main.crawl_schedules AS s
+                                 WHERE s.uuid = uuid_blob(legacy.schedule_id)), 0),
+                       legacy.status, legacy.error_details, legacy.sent_at
+                FROM {ARCHIVE_ALIAS}.legacy_notification_logs AS legacy
+                """,
+                (last_id,),
+            )
+            conn.execute(f"DROP TABLE {ARCHIVE_ALIAS}.legacy_notification_logs")
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+    finally:
+        conn.execute(f"DETACH DATABASE {ARCHIVE_ALIAS}")
+    logger.info("Upgraded %d archived notification logs in %s", rows, archive.path)
+    return rows
+
+
+def _reserve_ids(conn: sqlite3.Connection, count: int) -> int:
+    """Advance notification_logs' AUTOINCREMENT sequence by ``count``; returns the id before."""
+    last_id = conn.execute(
+        "SELECT MAX("
+        "COALESCE((SELECT seq FROM main.sqlite_sequence WHERE name = 'notification_logs'), 0), "
+        "COALESCE((SELECT MAX(id) FROM main.notification_logs), 0))"
+    ).fetchone()[0]
+    conn.execute("DELETE FROM main.sqlite_sequence WHERE name = 'notification_logs'")
+    conn.execute(
+        "INSERT INTO main.sqlite_sequence (name, seq) VALUES ('notification_logs', ?)",
+        (last_id + count,),
+    )
+    return last_id
+
+
+def upgrade_archives(conn: sqlite3.Connection, archive_dir: str | Path) -> dict[str, int]:
+    """
+    Upgrade every archive file in ``archive_dir`` (see ``upgrade_archive``).
+
+    Returns:
+        Rows re-keyed per ``YYYY-MM`` month, for the files that needed it
+    """
+    upgraded = {}
+    for archive in list_archives(archive_dir):
+        rows = upgrade_archive(conn, archive)
+        if rows:
+            upgraded[archive.month] = rows
+    return upgraded
+
+
+def migrate_archives(db_path, archive_dir: str | Path) -> dict[str, int]:
+    """Open the database at ``db_path`` and upgrade the archives in ``archive_dir``."""
+    conn = connect(db_path)
+    try:
+        return upgrade_archives(conn, archive_dir)
+    finally:
+        conn.close()
+
+
+def archive_notification_logs(
+    conn: sqlite3.Connection,
+    archive_dir: str | Path,
+    older_than: datetime,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    batch_pause: float = DEFAULT_BATCH_PAUSE,
+    on_progress: Callable[[str, int], None] | None = None,
+) -> dict[str, int]:
+    """
+    Move notification logs sent before ``older_than`` into monthly archives.
+
+    Rows are moved in small batches so the crawler is only ever blocked for
+    one short delete at a time. See ``_move_batch`` for why an interrupted
+    run never loses or duplicates rows. Outdated archive files are upgraded
+    first (see ``upgrade_archives``).
+
+    Args:
+        conn: Connection to the main database opened with
+            ``isolation_level=None`` (see ``app.db.migrations.connect``)
+        archive_dir: Directory holding the archive files (created if needed)
+        older_than: UTC cutoff; logs sent before it are archived
+        batch_size: Rows moved per transaction
+        batch_pause: Seconds to sleep between batches, letting other writers in
+        on_progress: Called as (month, rows_moved_so_far) after each batch
+
+    Returns:
+        Rows moved per ``YYYY-MM`` month
+    """
+    upgrade_archives(conn, archive_dir)
+    cutoff = format_timestamp(older_than)
+    months = [
+        row[0]
+        for row in conn.execute(
+            "SELECT DISTINCT substr(sent_at, 1, 7) FROM notification_logs "
+            "WHERE sent_at < ? ORDER BY 1",
+            (cutoff,),
+        )
+    ]
+    if not months:
+        return {}
+
+    Path(archive_dir).mkdir(parents=True, exist_ok=True)
+    columns = ", ".join(ARCHIVE_COLUMNS)
+    moved: dict[str, int] = {}
+
+    for month in months:
+        archive = archive_file(archive_dir, month)
+        end = min(archive.ends_at, cutoff)
+        conn.execute(f"ATTACH DATABASE ? AS {ARCHIVE_ALIAS}", (str(archive.path),))
+        try:
+            for statement in ARCHIVE_SCHEMA:
+                conn.execute(statement.format(schema=ARCHIVE_ALIAS))
+            moved[month] = 0
+            while True:
+                rowids = [
+                    row[0]
+                    for row in conn.execute(
+                        "SELECT rowid FROM main.notification_logs "
+                        "WHERE sent_at >= ? AND sent_at < ? LIMIT ?",
+                        (archive.starts_at, end, batch_size),
+                    )
+                ]
+                if not rowids:
+                    break
+                deleted = _move_batch(conn, rowids, columns)
+                if not deleted:
+                    # The archive kept none of them (e.g. another row there
+                    # has the same uuid): the same batch would come back
+                    logger.error("Archiving notification logs for %s stopped: rowids "
+                                 "%s could not be copied to %s", month, rowids, archive.path)
+                    break
+                moved[month] += deleted
+                if on_progress is not None:
+                    on_progress(month, moved[month])
+                if batch_pause:
+                    time.sleep(batch_pause)
+        finally:
+            conn.execute(f"DETACH DATABASE {ARCHIVE_ALIAS}")
+        logger.info("Archived %d notification logs for %s to %s",
+                    moved[month], month, archive.path)
+
+    return moved
+
+
+def _move_batch(conn: sqlite3.Connection, rowids: list[int], columns: str) -> int:
+    """
+    Copy one batch of rows to the attached archive, then delete them.
+
+    SQLite only commits across attached databases atomically in rollback
+    journal mode, and the main database uses WAL. The copy is therefore
+    committed first and the delete only removes rows present in the archive:
+    a crash in between leaves rows in both places, and the next run's
+    ``INSERT OR IGNORE`` and delete finish the move.
+
+    Returns:
+        Rows deleted from the main database, i.e. actually moved
+    """
+    placeholders = ", ".join("?" * len(rowids))
+
+    # Plain BEGIN: only the archive is written, the main database is just read
+    conn.execute("BEGIN")
+    try:
+        conn.execute(
+            f"INSERT OR IGNORE INTO {ARCHIVE_ALIAS}.notification_logs ({columns}) "
+            f"SELECT {columns} FROM main.notification_logs WHERE rowid IN ({placeholders})",
+            rowids,
+        )
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        cursor = conn.execute(
+            f"DELETE FROM main.notification_logs WHERE rowid IN ({placeholders}) "
+            f"AND EXISTS (SELECT 1 FROM {ARCHIVE_ALIAS}.notification_logs AS archived "
+            f"WHERE archived.id = notification_logs.id)",
+            rowids,
+        )
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    return cursor.rowcount
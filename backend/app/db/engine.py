@@ -0,0 +1,174 @@
+"""
+Async SQLite engines for the application.
+
+SQLite allows a single writer at a time, so the database is accessed through
+two engines: a writer engine holding exactly one connection, and a reader
+engine with a pool of read-only connections. In WAL mode readers never block
+on the writer, so dashboard queries keep flowing while the crawler writes.
+"""
+from collections.abc import AsyncIterator, Mapping
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from app.core.config import Settings
+from app.db.migrations import register_functions
+
+
+def async_database_url(database_url: str) -> str:
+    """
+    Convert a ``sqlite:///`` URL from settings to its aiosqlite form.
+
+    Args:
+        database_url: URL such as ``sqlite:///./dev.db``
+
+    Returns:
+        URL such as ``sqlite+aiosqlite:///./dev.db``
+    """
+    if database_url.startswith("sqlite+aiosqlite://"):
+        return database_url
+    if not database_url.startswith("sqlite://"):
+        raise ValueError(f"Only SQLite databases are supported, got: {database_url}")
+    return "sqlite+aiosqlite://" + database_url[len("sqlite://"):]
+
+
+def database_path(database_url: str) -> Path:
+    """
+    File path of a SQLite database URL (relative paths stay relative to the cwd).
+
+    Args:
+        database_url: URL such as ``sqlite:///./dev.db``
+    """
+    url = async_database_url(database_url)
+    return Path(url[len("sqlite+aiosqlite:///"):])
+
+
+def connection_pragmas(settings: Settings) -> list[tuple[str, str]]:
+    """PRAGMAs applied to every new connection, in order."""
+    return [
+        ("journal_mode", "WAL"),
+        ("synchronous", "NORMAL"),
+        ("busy_timeout", str(settings.DB_BUSY_TIMEOUT_MS)),
+        ("mmap_size", str(settings.DB_MMAP_SIZE)),
+        # Negative cache_size is in KiB rather than pages
+        ("cache_size", str(-settings.DB_CACHE_SIZE_KB)),
+        ("temp_store", "MEMORY"),
+    ]
+
+
+def _configure_engine(
+    engine: AsyncEngine,
+    pragmas: list[tuple[str, str]],
+    begin_statement: str,
+) -> None:
+    """
+    Install connect/begin hooks on an engine.
+
+    pysqlite's implicit transaction handling is disabled so SQLAlchemy's
+    ``begin()`` emits ``begin_statement`` itself; this lets the writer take
+    the write lock up front with ``BEGIN IMMEDIATE``.
+    """
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        register_functions(dbapi_connection)
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas:
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def on_begin(connection):
+        connection.exec_driver_sql(begin_statement)
+
+
+class Database:
+    """
+    Writer and reader engines plus their session factories.
+
+    Attributes:
+        writer: Engine with a single connection used for all writes
+        reader: Engine with a pool of read-only connections
+        write_session: Session factory bound to the writer engine
+        read_session: Session factory bound to the reader engine
+    """
+
+    def __init__(self, database_url: str, settings: Settings):
+        url = async_database_url(database_url)
+        pragmas = connection_pragmas(settings)
+
+        self.writer = create_async_engine(
+            url,
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=settings.DB_BUSY_TIMEOUT_MS / 1000,
+        )
+        _configure_engine(self.writer, pragmas, "BEGIN IMMEDIATE")
+
+        self.reader = create_async_engine(
+            url,
+            pool_size=settings.DB_READER_POOL_SIZE,
+            max_overflow=0,
+            pool_timeout=settings.DB_BUSY_TIMEOUT_MS / 1000,
+            # Lets read() attach archives with file:...?mode=ro URIs
+            connect_args={"uri": True},
+        )
+        _configure_engine(self.reader, [*pragmas, ("query_only", "ON")], "BEGIN")
+
+        self.write_session = async_sessionmaker(self.writer, expire_on_commit=False)
+        self.read_session = async_sessionmaker(self.reader, expire_on_commit=False)
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "Database":
+        """Create a Database for ``settings.DATABASE_URL``."""
+        return cls(settings.DATABASE_URL, settings)
+
+    @asynccontextmanager
+    async def read(
+        self, attach: Mapping[str, str] | None = None
+    ) -> AsyncIterator[AsyncSession]:
+        """
+        Session on a reader connection, inside a read transaction.
+
+        Args:
+            attach: Optional {schema name: database URI} to attach for the
+                duration of the session, e.g. a read-only archive file.
+                SQLite cannot attach inside a transaction, so this happens
+                on the raw connection before the session begins.
+        """
+        if not attach:
+            async with self.read_session() as session, session.begin():
+                yield session
+            return
+
+        async with self.reader.connect() as connection:
+            driver = (await connection.get_raw_connection()).driver_connection
+            for name, uri in attach.items():
+                await driver.execute(f"ATTACH DATABASE ? AS {name}", (uri,))
+            try:
+                async with AsyncSession(connection, expire_on_commit=False) as session:
+                    async with session.begin():
+                        yield session
+            finally:
+                # The connection goes back to the pool, so leave it as found
+                for name in attach:
+                    await driver.execute(f"DETACH DATABASE {name}")
+
+    @asynccontextmanager
+    async def write(self) -> AsyncIterator[AsyncSession]:
+        """Session on the writer connection; commits on success, rolls back on error."""
+        async with self.write_session() as session, session.begin():
+            yield session
+
+    async def dispose(self) -> None:
+        """Close all pooled connections."""
+        await self.writer.dispose()
+        await self.reader.dispose()
@@ -0,0 +1,855 @@
+"""
+Versioned schema migrations.
+
+The applied schema version is stored in ``PRAGMA user_version``. Running the
+migrations applies only the steps newer than that version: consecutive
+ordinary steps run together in one transaction that also bumps the version,
+so a failure leaves the database exactly as it was.
+
+Steps that rebuild a table run online instead. The new table is filled from
+the old one in small rowid-ranged batches, each in its own short write
+transaction, while triggers mirror concurrent inserts, updates and deletes.
+Only the final swap takes the write lock again, briefly. Steps that add a
+computed column are filled the same way, batch by batch, before the final
+transaction builds whatever needs the values (e.g. a unique index). Other writers (the
+crawler) therefore wait milliseconds per batch instead of minutes for a
+``CREATE INDEX`` or table copy on a large table.
+
+Migrations use the standard library ``sqlite3`` module so they can run from
+``scripts/init_db.py`` as well as at application startup.
+"""
+import logging
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Sequence
+
+from app.core.ids import uuid_blob
+from app.core.urls import url_hash
+from app.db.rollups import ROLLUPS, rollup_backfill_sql, rollup_table_sql, rollup_triggers
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 5000
+DEFAULT_BATCH_PAUSE = 0.01
+
+
+@dataclass(frozen=True)
+class TableRebuild:
+    """
+    Online rebuild of one table into a new definition.
+
+    Attributes:
+        table: Name of the table to rebuild
+        create_sql: CREATE TABLE statement with ``{table}`` as the table name
+        columns: Target columns filled from the old table
+        select: SQL expressions over the old table producing ``columns``
+            (defaults to the same column names)
+        indexes: (name, CREATE INDEX statement with ``{table}``) pairs. They
+            are created on the empty new table up front, under a staging name,
+            and maintained during the copy, so no index build ever runs on a
+            full table. The old table keeps its indexes, including any of
+            the same name, until the swap renames the staged ones.
+        key_column: Column of the new table that receives the old rowid
+        after_swap: Statements run in the swap transaction, e.g. triggers
+    """
+    table: str
+    create_sql: str
+    columns: tuple[str, ...]
+    select: tuple[str, ...] = ()
+    indexes: tuple[tuple[str, str], ...] = ()
+    key_column: str = "rowid"
+    after_swap: tuple[str, ...] = ()
+
+    @property
+    def shadow(self) -> str:
+        return f"{self.table}__rebuild"
+
+    @staticmethod
+    def staged(index: str) -> str:
+        """Name of an index on the shadow table until the swap."""
+        return f"{index}__rebuild"
+
+
+@dataclass(frozen=True)
+class Backfill:
+    """
+    Online addition of a column computed from each row.
+
+    Attributes:
+        table: Table to extend
+        column: Name of the new column
+        definition: Column type and constraints for ``ALTER TABLE ADD COLUMN``
+        value: SQL expression over the row computing the column
+        finish: Statements run in the final transaction, once every row
+            (including rows written during the backfill) has its value
+    """
+    table: str
+    column: str
+    definition: str
+    value: str
+    finish: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class Migration:
+    """
+    One schema version.
+
+    Attributes:
+        version: Schema version after this step (1, 2, 3, ...)
+        description: Short human-readable summary
+        statements: SQL statements run in order
+        rebuild: Optional online table rebuild; such a step runs on its own
+        backfill: Optional online column backfill; such a step runs on its own
+    """
+    version: int
+    description: str
+    statements: tuple[str, ...] = ()
+    rebuild: TableRebuild | None = field(default=None)
+    backfill: Backfill | None = field(default=None)
+
+    @property
+    def online(self) -> bool:
+        return self.rebuild is not None or self.backfill is not None
+
+
+# Tables whose row counts are maintained in table_stats
+COUNTED_TABLES = ("crawl_schedules", "video_records", "notification_logs", "crawl_execution_logs")
+
+
+def table_stats_triggers(table: str) -> tuple[str, ...]:
+    """Triggers keeping ``table_stats.row_count`` in step with ``table``."""
+    return (
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_stats_insert AFTER INSERT ON {table} BEGIN
+            UPDATE table_stats SET row_count = row_count + 1 WHERE table_name = '{table}';
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_stats_delete AFTER DELETE ON {table} BEGIN
+            UPDATE table_stats SET row_count = row_count - 1 WHERE table_name = '{table}';
+        END
+        """,
+    )
+
+
+def video_search_triggers() -> tuple[str, ...]:
+    """Triggers keeping the video_records_fts index in sync with video_records."""
+    return (
+        """
+        CREATE TRIGGER IF NOT EXISTS video_records_fts_insert AFTER INSERT ON video_records BEGIN
+            INSERT INTO video_records_fts (rowid, title, description)
+            VALUES (NEW.rowid, NEW.title, NEW.description);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS video_records_fts_delete AFTER DELETE ON video_records BEGIN
+            INSERT INTO video_records_fts (video_records_fts, rowid, title, description)
+            VALUES ('delete', OLD.rowid, OLD.title, OLD.description);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS video_records_fts_update
+        AFTER UPDATE OF title, description ON video_records BEGIN
+            INSERT INTO video_records_fts (video_records_fts, rowid, title, description)
+            VALUES ('delete', OLD.rowid, OLD.title, OLD.description);
+            INSERT INTO video_records_fts (rowid, title, description)
+            VALUES (NEW.rowid, NEW.title, NEW.description);
+        END
+        """,
+    )
+
+
+def table_stats_recount(table: str) -> str:
+    """Statement resetting ``table``'s row count, for rebuilds that may drop rows."""
+    return (
+        f"UPDATE table_stats SET row_count = (SELECT COUNT(*) FROM {table}) "
+        f"WHERE table_name = '{table}'"
+    )
+
+
+def _parent_rowid(parent: str, child: str, column: str) -> str:
+    """SQL mapping a TEXT foreign key of ``child`` to the parent's rowid, 0 if it is gone."""
+    return f"COALESCE((SELECT p.rowid FROM {parent} AS p WHERE p.id = {child}.{column}), 0)"
+
+
+# Later rows sharing a canonical URL with an earlier one keep a NULL hash, so
+# the unique index can be built over existing duplicates
+NULL_DUPLICATE_URL_HASHES_SQL = """
+    UPDATE video_records SET url_hash = NULL
+    WHERE rowid IN (
+        SELECT rowid FROM (
+            SELECT rowid, ROW_NUMBER() OVER (
+                PARTITION BY url_hash ORDER BY detected_at, rowid
+            ) AS position
+            FROM video_records
+            WHERE url_hash IS NOT NULL
+        )
+        WHERE position > 1
+    )
+"""
+
+
+MIGRATIONS: tuple[Migration, ...] = (
+    Migration(
+        version=1,
+        description="Initial schema",
+        statements=(
+            # Stores crawl schedule configuration
+            """
+            CREATE TABLE IF NOT EXISTS crawl_schedules (
+                id TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                interval INTEGER NOT NULL,
+                is_active BOOLEAN NOT NULL DEFAULT 0,
+                created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+            )
+            """,
+            # Stores detected video metadata
+            """
+            CREATE TABLE IF NOT EXISTS video_records (
+                id TEXT PRIMARY KEY,
+                title TEXT NOT NULL,
+                url TEXT NOT NULL,
+                thumbnail TEXT,
+                description TEXT,
+                detected_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                schedule_id TEXT NOT NULL,
+                FOREIGN KEY (schedule_id) REFERENCES crawl_schedules (id)
+            )
+            """,
+            # Tracks notification attempts for each video
+            """
+            CREATE TABLE IF NOT EXISTS notification_logs (
+                id TEXT PRIMARY KEY,
+                video_id TEXT NOT NULL,
+                schedule_id TEXT NOT NULL,
+                status TEXT NOT NULL,
+                error_details TEXT,
+                sent_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (video_id) REFERENCES video_records (id),
+                FOREIGN KEY (schedule_id) REFERENCES crawl_schedules (id)
+            )
+            """,
+            # Records each crawl attempt and its outcome
+            """
+            CREATE TABLE IF NOT EXISTS crawl_execution_logs (
+                id TEXT PRIMARY KEY,
+                schedule_id TEXT NOT NULL,
+                started_at TIMESTAMP NOT NULL,
+                finished_at TIMESTAMP,
+                status TEXT NOT NULL,
+                error_details TEXT,
+                FOREIGN KEY (schedule_id) REFERENCES crawl_schedules (id)
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_crawl_schedules_is_active "
+            "ON crawl_schedules(is_active)",
+            "CREATE INDEX IF NOT EXISTS idx_video_records_schedule_id "
+            "ON video_records(schedule_id)",
+            "CREATE INDEX IF NOT EXISTS idx_video_records_detected_at "
+            "ON video_records(detected_at DESC)",
+            "CREATE INDEX IF NOT EXISTS idx_notification_logs_video_id "
+            "ON notification_logs(video_id)",
+            "CREATE INDEX IF NOT EXISTS idx_notification_logs_schedule_id "
+            "ON notification_logs(schedule_id)",
+            "CREATE INDEX IF NOT EXISTS idx_crawl_execution_logs_schedule_id "
+            "ON crawl_execution_logs(schedule_id, started_at DESC)",
+        ),
+    ),
+    Migration(
+        version=2,
+        description="Maintain table row counts in table_stats",
+        statements=(
+            """
+            CREATE TABLE table_stats (
+                table_name TEXT PRIMARY KEY,
+                row_count INTEGER NOT NULL DEFAULT 0
+            ) WITHOUT ROWID
+            """,
+            # One-time count; afterwards the triggers keep it current
+            *(
+                f"INSERT INTO table_stats (table_name, row_count) "
+                f"SELECT '{table}', COUNT(*) FROM {table}"
+                for table in COUNTED_TABLES
+            ),
+            *(sql for table in COUNTED_TABLES for sql in table_stats_triggers(table)),
+        ),
+    ),
+    Migration(
+        version=3,
+        description="Deduplicate video_records by canonical URL hash",
+        backfill=Backfill(
+            table="video_records",
+            column="url_hash",
+            definition="INTEGER",
+            value="canonical_url_hash(url)",
+            finish=(
+                NULL_DUPLICATE_URL_HASHES_SQL,
+                "CREATE UNIQUE INDEX idx_video_records_url_hash ON video_records(url_hash)",
+            ),
+        ),
+    ),
+    Migration(
+        version=4,
+        description="Full-text search over video titles and descriptions",
+        statements=(
+            # External-content FTS5 index: stores only the inverted index and
+            # reads column values from video_records by rowid
+            """
+            CREATE VIRTUAL TABLE video_records_fts USING fts5(
+                title,
+                description,
+                content='video_records',
+                content_rowid='rowid',
+                tokenize='unicode61 remove_diacritics 2',
+                prefix='2 3'
+            )
+            """,
+            *video_search_triggers(),
+            "INSERT INTO video_records_fts (video_records_fts) VALUES ('rebuild')",
+        ),
+    ),
+    Migration(
+        version=5,
+        description="Index notification logs by time for listing and archival",
+        statements=(
+            "CREATE INDEX IF NOT EXISTS idx_notification_logs_sent_at "
+            "ON notification_logs(sent_at DESC, id)",
+        ),
+    ),
+    # Versions 6-9 re-key every table on an INTEGER rowid, keeping the public
+    # UUID in a 16-byte BLOB column and turning foreign keys into integers.
+    # Each new id is the row's old rowid, so children are rebuilt before
+    # their parents and look up the parent's (still unchanged) rowid. Rows
+    # whose parent no longer exists are kept with a parent id of 0, which
+    # no row has, like archived logs of deleted videos.
+    Migration(
+        version=6,
+        description="Integer keys for notification_logs",
+        rebuild=TableRebuild(
+            table="notification_logs",
+            # AUTOINCREMENT: ids are never reused, even once every row has
+            # been moved to the archives, so they stay unique across tiers
+            create_sql="""
+                CREATE TABLE {table} (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    uuid BLOB NOT NULL,
+                    video_id INTEGER NOT NULL,
+                    schedule_id INTEGER NOT NULL,
+                    status TEXT NOT NULL,
+                    error_details TEXT,
+                    sent_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (video_id) REFERENCES video_records (id),
+                    FOREIGN KEY (schedule_id) REFERENCES crawl_schedules (id)
+                )
+            """,
+            columns=("uuid", "video_id", "schedule_id", "status", "error_details", "sent_at"),
+            select=(
+                "uuid_blob(id)",
+                _parent_rowid("video_records", "notification_logs", "video_id"),
+                _parent_rowid("crawl_schedules", "notification_logs", "schedule_id"),
+                "status",
+                "error_details",
+                "sent_at",
+            ),
+            indexes=(
+                ("idx_notification_logs_uuid",
+                 "CREATE UNIQUE INDEX idx_notification_logs_uuid ON {table}(uuid)"),
+                ("idx_notification_logs_video_id",
+                 "CREATE INDEX idx_notification_logs_video_id ON {table}(video_id)"),
+                ("idx_notification_logs_schedule_id",
+                 "CREATE INDEX idx_notification_logs_schedule_id ON {table}(schedule_id)"),
+                ("idx_notification_logs_sent_at",
+                 "CREATE INDEX idx_notification_logs_sent_at ON {table}(sent_at DESC, id)"),
+            ),
+            key_column="id",
+            after_swap=(
+                *table_stats_triggers("notification_logs"),
+                table_stats_recount("notification_logs"),
+            ),
+        ),
+    ),
+    Migration(
+        version=7,
+        description="Integer keys for crawl_execution_logs",
+        rebuild=TableRebuild(
+            table="crawl_execution_logs",
+            create_sql="""
+                CREATE TABLE {table} (
+                    id INTEGER PRIMARY KEY,
+                    uuid BLOB NOT NULL,
+                    schedule_id INTEGER NOT NULL,
+                    started_at TIMESTAMP NOT NULL,
+                    finished_at TIMESTAMP,
+                    status TEXT NOT NULL,
+                    error_details TEXT,
+                    FOREIGN KEY (schedule_id) REFERENCES crawl_schedules (id)
+                )
+            """,
+            columns=("uuid", "schedule_id", "started_at", "finished_at", "status", "error_details"),
+            select=(
+                "uuid_blob(id)",
+                _parent_rowid("crawl_schedules", "crawl_execution_logs", "schedule_id"),
+                "started_at",
+                "finished_at",
+                "status",
+                "error_details",
+            ),
+            indexes=(
+                ("idx_crawl_execution_logs_uuid",
+                 "CREATE UNIQUE INDEX idx_crawl_execution_logs_uuid ON {table}(uuid)"),
+                ("idx_crawl_execution_logs_schedule_id",
+                 "CREATE INDEX idx_crawl_execution_logs_schedule_id "
+                 "ON {table}(schedule_id, started_at DESC)"),
+            ),
+            key_column="id",
+            after_swap=(
+                *table_stats_triggers("crawl_execution_logs"),
+                table_stats_recount("crawl_execution_logs"),
+            ),
+        ),
+    ),
+    Migration(
+        version=8,
+        description="Integer keys for video_records",
+        rebuild=TableRebuild(
+            table="video_records",
+            create_sql="""
+                CREATE TABLE {table} (
+                    id INTEGER PRIMARY KEY,
+                    uuid BLOB NOT NULL,
+                    title TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    url_hash INTEGER,
+                    thumbnail TEXT,
+                    description TEXT,
+                    detected_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                    schedule_id INTEGER NOT NULL,
+                    FOREIGN KEY (schedule_id) REFERENCES crawl_schedules (id)
+                )
+            """,
+            columns=("uuid", "title", "url", "url_hash", "thumbnail", "description",
+                     "detected_at", "schedule_id"),
+            select=(
+                "uuid_blob(id)",
+                "title",
+                "url",
+                "url_hash",
+                "thumbnail",
+                "description",
+                "detected_at",
+                _parent_rowid("crawl_schedules", "video_records", "schedule_id"),
+            ),
+            indexes=(
+                ("idx_video_records_uuid",
+                 "CREATE UNIQUE INDEX idx_video_records_uuid ON {table}(uuid)"),
+                ("idx_video_records_schedule_id",
+                 "CREATE INDEX idx_video_records_schedule_id ON {table}(schedule_id)"),
+                ("idx_video_records_detected_at",
+                 "CREATE INDEX idx_video_records_detected_at ON {table}(detected_at DESC)"),
+                ("idx_video_records_url_hash",
+                 "CREATE UNIQUE INDEX idx_video_records_url_hash ON {table}(url_hash)"),
+            ),
+            key_column="id",
+            # Rowids are unchanged, so the FTS index stays valid; only the
+            # triggers dropped along with the old table need recreating
+            after_swap=(
+                *table_stats_triggers("video_records"),
+                table_stats_recount("video_records"),
+                *video_search_triggers(),
+            ),
+        ),
+    ),
+    Migration(
+        version=9,
+        description="Integer keys for crawl_schedules",
+        rebuild=TableRebuild(
+            table="crawl_schedules",
+            create_sql="""
+                CREATE TABLE {table} (
+                    id INTEGER PRIMARY KEY,
+                    uuid BLOB NOT NULL,
+                    url TEXT NOT NULL,
+                    interval INTEGER NOT NULL,
+                    is_active BOOLEAN NOT NULL DEFAULT 0,
+                    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+                )
+            """,
+            columns=("uuid", "url", "interval", "is_active", "created_at"),
+            select=("uuid_blob(id)", "url", "interval", "is_active", "created_at"),
+            indexes=(
+                ("idx_crawl_schedules_uuid",
+                 "CREATE UNIQUE INDEX idx_crawl_schedules_uuid ON {table}(uuid)"),
+                ("idx_crawl_schedules_is_active",
+                 "CREATE INDEX idx_crawl_schedules_is_active ON {table}(is_active)"),
+            ),
+            key_column="id",
+            after_swap=(
+                *table_stats_triggers("crawl_schedules"),
+                table_stats_recount("crawl_schedules"),
+            ),
+        ),
+    ),
+    Migration(
+        version=10,
+        description="Daily rollups for dashboard statistics",
+        statements=(
+            *(rollup_table_sql(rollup) for rollup in ROLLUPS),
+            # One-time backfill; afterwards the triggers keep them current
+            *(rollup_backfill_sql(rollup) for rollup in ROLLUPS),
+            *(sql for rollup in ROLLUPS for sql in rollup_triggers(rollup)),
+        ),
+    ),
+    Migration(
+        version=11,
+        description="Per-URL HTTP cache validators for conditional crawls",
+        statements=(
+            """
+            CREATE TABLE IF NOT EXISTS crawled_pages (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """,
+        ),
+    ),
+    Migration(
+        version=12,
+        description="Learned render mode per crawled URL",
+        statements=(
+            "ALTER TABLE crawled_pages ADD COLUMN render_mode TEXT NOT NULL DEFAULT 'static'",
+            "ALTER TABLE crawled_pages ADD COLUMN crawls_since_probe INTEGER NOT NULL DEFAULT 0",
+        ),
+    ),
+    Migration(
+        version=13,
+        description="Content fingerprint of the listing per crawled URL",
+        statements=(
+            "ALTER TABLE crawled_pages ADD COLUMN content_hash TEXT",
+            "ALTER TABLE crawled_pages ADD COLUMN content_items INTEGER NOT NULL DEFAULT 0",
+        ),
+    ),
+    Migration(
+        version=14,
+        description="Index video_records by schedule in listing order",
+        statements=(
+            # Also serves every lookup the schedule_id index did
+            "CREATE INDEX IF NOT EXISTS idx_video_records_schedule_detected_at "
+            "ON video_records(schedule_id, detected_at DESC)",
+            "DROP INDEX IF EXISTS idx_video_records_schedule_id",
+        ),
+    ),
+)
+
+
+def register_functions(conn) -> None:
+    """
+    Register the SQL functions used by migrations on a DB-API connection.
+
+    The application's connections need them too: rebuild triggers call
+    them while a migration runs alongside the app.
+    """
+    conn.create_function("uuid_blob", 1, uuid_blob, deterministic=True)
+    conn.create_function("canonical_url_hash", 1, url_hash, deterministic=True)
+
+
+def connect(db_path) -> sqlite3.Connection:
+    """
+    Open a connection suitable for running migrations.
+
+    Transactions are managed explicitly (``isolation_level=None``) and the
+    database is switched to WAL so batched rebuilds do not block readers.
+    """
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    register_functions(conn)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA busy_timeout=5000")
+    return conn
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """Return the schema version recorded in ``PRAGMA user_version``."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def pending_migrations(
+    conn: sqlite3.Connection,
+    migrations: Sequence[Migration] = MIGRATIONS,
+) -> list[Migration]:
+    """Migrations newer than the database's schema version, in order."""
+    current = get_schema_version(conn)
+    return sorted(
+        (m for m in migrations if m.version > current), key=lambda m: m.version
+    )
+
+
+def run_migrations(
+    conn: sqlite3.Connection,
+    migrations: Sequence[Migration] = MIGRATIONS,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    batch_pause: float = DEFAULT_BATCH_PAUSE,
+    on_progress: Callable[[str, int, int], None] | None = None,
+) -> list[int]:
+    """
+    Apply all pending migrations.
+
+    Args:
+        conn: Connection opened with ``isolation_level=None`` (see ``connect``)
+        migrations: Migration steps, defaults to the application schema
+        batch_size: Rows copied per transaction in online rebuilds
+        batch_pause: Seconds to sleep between batches, letting other writers in
+        on_progress: Called as (table, rows_copied, rows_total) during rebuilds
+
+    Returns:
+        The versions that were applied
+    """
+    pending = pending_migrations(conn, migrations)
+    applied: list[int] = []
+
+    group: list[Migration] = []
+    for migration in pending:
+        if not migration.online:
+            group.append(migration)
+            continue
+        if group:
+            _apply_in_transaction(conn, group)
+            applied.extend(m.version for m in group)
+            group = []
+        if migration.rebuild is not None:
+            _apply_online_rebuild(conn, migration, batch_size, batch_pause, on_progress)
+        else:
+            _apply_online_backfill(conn, migration, batch_size, batch_pause, on_progress)
+        applied.append(migration.version)
+
+    if group:
+        _apply_in_transaction(conn, group)
+        applied.extend(m.version for m in group)
+
+    return applied
+
+
+def _apply_in_transaction(conn: sqlite3.Connection, migrations: list[Migration]) -> None:
+    """Run a group of ordinary migrations and the version bump atomically."""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        for migration in migrations:
+            logger.info("Applying migration %d: %s", migration.version, migration.description)
+            for statement in migration.statements:
+                conn.execute(statement)
+        conn.execute(f"PRAGMA user_version = {migrations[-1].version}")
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def _apply_online_rebuild(
+    conn: sqlite3.Connection,
+    migration: Migration,
+    batch_size: int,
+    batch_pause: float,
+    on_progress: Callable[[str, int, int], None] | None,
+) -> None:
+    """Rebuild a table in batches, then swap it in and bump the version."""
+    rebuild = migration.rebuild
+    table, shadow = rebuild.table, rebuild.shadow
+    target = ", ".join((rebuild.key_column, *rebuild.columns))
+    source = ", ".join(("rowid", *(rebuild.select or rebuild.columns)))
+    logger.info("Applying migration %d: %s (online rebuild of %s)",
+                migration.version, migration.description, table)
+
+    # 1. Create the empty shadow table with its indexes and mirror triggers
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute(f"DROP TABLE IF EXISTS {shadow}")
+        conn.execute(rebuild.create_sql.format(table=shadow))
+        for name, index_sql in rebuild.indexes:
+            conn.execute(_staged_index_sql(index_sql, name, shadow))
+        # The mirror only ever replaces the row's own copy: OR IGNORE rather
+        # than OR REPLACE, which would delete other rows on a unique conflict
+        conn.execute(f"""
+            CREATE TRIGGER {shadow}_ai AFTER INSERT ON {table} BEGIN
+                DELETE FROM {shadow} WHERE {rebuild.key_column} = NEW.rowid;
+                INSERT OR IGNORE INTO {shadow} ({target})
+                SELECT {source} FROM {table} WHERE rowid = NEW.rowid;
+            END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER {shadow}_au AFTER UPDATE ON {table} BEGIN
+                DELETE FROM {shadow} WHERE {rebuild.key_column} IN (OLD.rowid, NEW.rowid);
+                INSERT OR IGNORE INTO {shadow} ({target})
+                SELECT {source} FROM {table} WHERE rowid = NEW.rowid;
+            END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER {shadow}_ad AFTER DELETE ON {table} BEGIN
+                DELETE FROM {shadow} WHERE {rebuild.key_column} = OLD.rowid;
+            END
+        """)
+        high = conn.execute(f"SELECT COALESCE(MAX(rowid), 0) FROM {table}").fetchone()[0]
+        total = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+    # 2. Copy existing rows in short transactions. Rows written meanwhile are
+    #    mirrored by the triggers, so OR IGNORE keeps their newer version.
+    copied = 0
+    low = 0
+    while low < high:
+        upper = low + batch_size
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            cursor = conn.execute(
+                f"INSERT OR IGNORE INTO {shadow} ({target}) "
+                f"SELECT {source} FROM {table} WHERE rowid > ? AND rowid <= ?",
+                (low, upper),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        copied += max(cursor.rowcount, 0)
+        low = upper
+        if on_progress is not None:
+            on_progress(table, min(copied, total), total)
+        if batch_pause:
+            time.sleep(batch_pause)
+
+    # 3. Swap the tables and record the new version
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        for suffix in ("ai", "au", "ad"):
+            conn.execute(f"DROP TRIGGER IF EXISTS {shadow}_{suffix}")
+        # Only a row conflicting with a unique index of the new table is
+        # left out; say so rather than lose it silently
+        dropped = (
+            conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            - conn.execute(f"SELECT COUNT(*) FROM {shadow}").fetchone()[0]
+        )
+        if dropped:
+            logger.warning("Rebuild of %s left out %d rows that violate its new "
+                           "unique indexes", table, dropped)
+        conn.execute(f"DROP TABLE {table}")
+        conn.execute(f"ALTER TABLE {shadow} RENAME TO {table}")
+        _rename_staged_indexes(conn, table, rebuild.indexes)
+        for statement in rebuild.after_swap:
+            conn.execute(statement)
+        conn.execute(f"PRAGMA user_version = {migration.version}")
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def _staged_index_sql(index_sql: str, name: str, table: str) -> str:
+    """``index_sql`` creating the index on ``table`` under its staging name."""
+    staged = index_sql.format(table=table).replace(
+        f"INDEX {name} ", f"INDEX {TableRebuild.staged(name)} ", 1
+    )
+    if staged == index_sql.format(table=table):
+        raise ValueError(f"Cannot stage index {name}: {index_sql}")
+    return staged
+
+
+def _rename_staged_indexes(
+    conn: sqlite3.Connection, table: str, indexes: tuple[tuple[str, str], ...]
+) -> None:
+    """
+    Give the swapped-in table's indexes their final names.
+
+    SQLite cannot rename an index, and building it again would scan the
+    full table under the write lock. The staged index is already complete,
+    so only its schema entry is renamed, as ALTER TABLE RENAME does for
+    tables. This runs inside the swap transaction, and RESET reloads the
+    schema so the change is visible to this connection straight away.
+    """
+    if not indexes:
+        return
+    conn.execute("PRAGMA writable_schema = ON")
+    try:
+        for name, index_sql in indexes:
+            conn.execute(
+                "UPDATE sqlite_master SET name = ?, sql = ? WHERE type = 'index' AND name = ?",
+                (name, " ".join(index_sql.format(table=table).split()),
+                 TableRebuild.staged(name)),
+            )
+    finally:
+        conn.execute("PRAGMA writable_schema = RESET")
+
+
+def _apply_online_backfill(
+    conn: sqlite3.Connection,
+    migration: Migration,
+    batch_size: int,
+    batch_pause: float,
+    on_progress: Callable[[str, int, int], None] | None,
+) -> None:
+    """Add a column, fill it in batches, then finish and bump the version."""
+    backfill = migration.backfill
+    table, column = backfill.table, backfill.column
+    update = f"UPDATE {table} SET {column} = {backfill.value} WHERE rowid > ? AND rowid <= ?"
+    logger.info("Applying migration %d: %s (online backfill of %s.%s)",
+                migration.version, migration.description, table, column)
+
+    # 1. Add the column, unless an interrupted run already did
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        if column not in existing:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {backfill.definition}")
+        high = conn.execute(f"SELECT COALESCE(MAX(rowid), 0) FROM {table}").fetchone()[0]
+        total = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+    # 2. Fill existing rows in short transactions
+    filled = 0
+    low = 0
+    while low < high:
+        upper = low + batch_size
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            cursor = conn.execute(update, (low, upper))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        filled += max(cursor.rowcount, 0)
+        low = upper
+        if on_progress is not None:
+            on_progress(table, min(filled, total), total)
+        if batch_pause:
+            time.sleep(batch_pause)
+
+    # 3. Fill rows inserted meanwhile, finish and record the new version
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute(update, (high, 2**63 - 1))
+        for statement in backfill.finish:
+            conn.execute(statement)
+        conn.execute(f"PRAGMA user_version = {migration.version}")
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def migrate_database(db_path, **kwargs) -> list[int]:
+    """
+    Open the database at ``db_path`` and apply pending migrations.
+
+    Returns:
+        The versions that were applied
+    """
+    conn = connect(db_path)
+    try:
+        return run_migrations(conn, **kwargs)
+    finally:
+        conn.close()
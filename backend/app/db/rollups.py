@@ -0,0 +1,209 @@
+"""
+Daily rollups for dashboard statistics.
+
+Dashboard widgets (videos detected per day, notification success rate, crawl
+failure rate) read per-day counters instead of aggregating the raw tables.
+Each rollup table holds one row per (day, schedule_id, status) with the
+number of source rows, and triggers on the source table keep it current in
+the same transaction as every insert and status change (see migration 10).
+
+Rollups count events rather than rows still present: deleting source rows
+(crawl log retention, notification log archival) leaves them untouched, so
+the history outlives the raw data. ``rebuild_rollups`` recomputes them from
+the source tables for backfills; like the archiver, it uses the standard
+library ``sqlite3`` module so it can run from ``scripts/rebuild_rollups.py``.
+"""
+import logging
+import sqlite3
+from dataclasses import dataclass
+from datetime import date
+from typing import Callable
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+# Status recorded for every detected video
+VIDEO_DETECTED = "detected"
+
+
+@dataclass(frozen=True)
+class Rollup:
+    """
+    One daily rollup table and the source table it summarizes.
+
+    Attributes:
+        table: Rollup table name
+        source: Table whose rows are counted
+        timestamp: Source column that decides a row's day (UTC)
+        status: Source column holding the status, or None to count every
+            row as ``VIDEO_DETECTED``
+    """
+    table: str
+    source: str
+    timestamp: str
+    status: str | None = "status"
+
+    def status_of(self, row: str) -> str:
+        """SQL expression for the status of a source row (``NEW``, ``OLD`` or a table)."""
+        return f"{row}.{self.status}" if self.status else f"'{VIDEO_DETECTED}'"
+
+
+VIDEO_ROLLUP = Rollup("video_daily_stats", "video_records", "detected_at", status=None)
+NOTIFICATION_ROLLUP = Rollup("notification_daily_stats", "notification_logs", "sent_at")
+CRAWL_ROLLUP = Rollup("crawl_daily_stats", "crawl_execution_logs", "started_at")
+ROLLUPS = (VIDEO_ROLLUP, NOTIFICATION_ROLLUP, CRAWL_ROLLUP)
+
+
+def rollup_table_sql(rollup: Rollup) -> str:
+    """CREATE TABLE statement for a rollup table."""
+    return f"""
+        CREATE TABLE IF NOT EXISTS {rollup.table} (
+            day TEXT NOT NULL,
+            schedule_id INTEGER NOT NULL,
+            status TEXT NOT NULL,
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, schedule_id, status)
+        ) WITHOUT ROWID
+    """
+
+
+def _increment_sql(rollup: Rollup, row: str, delta: str) -> str:
+    return (
+        f"INSERT INTO {rollup.table} (day, schedule_id, status, count) "
+        f"VALUES (date({row}.{rollup.timestamp}), {row}.schedule_id, {rollup.status_of(row)}, {delta}) "
+        f"ON CONFLICT (day, schedule_id, status) DO UPDATE SET count = count + excluded.count;"
+    )
+
+
+def rollup_triggers(rollup: Rollup) -> tuple[str, ...]:
+    """
+    Triggers keeping ``rollup`` in step with its source table.
+
+    A status change (e.g. a notification going from pending to sent) moves
+    the row from its old counter to its new one; deletes are not counted.
+    """
+    triggers = (
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {rollup.table}_insert AFTER INSERT ON {rollup.source} BEGIN
+            {_increment_sql(rollup, "NEW", "1")}
+        END
+        """,
+    )
+    if rollup.status is None:
+        return triggers
+    return triggers + (
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {rollup.table}_update
+        AFTER UPDATE OF {rollup.status}, {rollup.timestamp} ON {rollup.source}
+        WHEN OLD.{rollup.status} IS NOT NEW.{rollup.status}
+          OR date(OLD.{rollup.timestamp}) IS NOT date(NEW.{rollup.timestamp})
+        BEGIN
+            {_increment_sql(rollup, "OLD", "-1")}
+            {_increment_sql(rollup, "NEW", "1")}
+        END
+        """,
+    )
+
+
+def rollup_backfill_sql(rollup: Rollup, where: str = "") -> str:
+    """INSERT recomputing ``rollup`` from its source rows matching ``where``."""
+    return (
+        f"INSERT INTO {rollup.table} (day, schedule_id, status, count) "
+        f"SELECT date({rollup.timestamp}), schedule_id, {rollup.status_of(rollup.source)}, COUNT(*) "
+        f"FROM {rollup.source} {where} GROUP BY 1, 2, 3"
+    )
+
+
+def rebuild_rollups(
+    conn: sqlite3.Connection,
+    since: date | None = None,
+    on_progress: Callable[[str, int], None] | None = None,
+) -> int:
+    """
+    Recompute the rollups from the source tables.
+
+    Work is split per schedule, each in its own short write transaction
+    using the source tables' schedule_id indexes, so concurrent inserts are
+    counted exactly once: either by the recount or by the triggers.
+
+    Days whose source rows were purged or archived would be recounted from
+    what is left; pass ``since`` to rebuild only the days still complete.
+
+    Args:
+        conn: Connection opened with ``isolation_level=None`` (see
+            ``app.db.migrations.connect``)
+        since: First day to rebuild; None rebuilds everything
+        on_progress: Called as (rollup table, schedules done) after each schedule
+
+    Returns:
+        Number of schedules rebuilt
+    """
+    day = since.isoformat() if since else ""
+    schedules = [row[0] for row in conn.execute("SELECT id FROM crawl_schedules ORDER BY id")]
+    for rollup in ROLLUPS:
+        # Rows of schedules that no longer exist cannot be recounted per
+        # schedule, so they are kept as they are
+        where = f"WHERE schedule_id = :schedule_id AND {rollup.timestamp} >= :day"
+        for done, schedule_id in enumerate(schedules, start=1):
+            params = {"schedule_id": schedule_id, "day": day}
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    f"DELETE FROM {rollup.table} WHERE schedule_id = :schedule_id AND day >= :day",
+                    params,
+                )
+                conn.execute(rollup_backfill_sql(rollup, where), params)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            if on_progress is not None:
+                on_progress(rollup.table, done)
+        logger.info("Rebuilt %s for %d schedules since %s", rollup.table, len(schedules), day or "the start")
+    return len(schedules)
+
+
+def daily_stats_sql(rollup: Rollup, schedule: bool) -> str:
+    """
+    Counters of one rollup from :day on.
+
+    Summing over schedules happens in Python: grouping or ordering in SQL
+    would need a temporary B-tree, while a primary key range read returns
+    at most days x schedules x statuses rows.
+    """
+    return (
+        f"SELECT day, status, count FROM {rollup.table} "
+        f"WHERE day >= :day{' AND schedule_id = :schedule_id' if schedule else ''}"
+    )
+
+
+async def fetch_daily_stats(
+    session: AsyncSession,
+    rollup: Rollup,
+    since: date,
+    schedule_id: int | None = None,
+) -> dict[str, dict[str, int]]:
+    """
+    Per-day counts by status from one rollup.
+
+    Args:
+        session: Read session
+        rollup: Rollup to read
+        since: First day to include
+        schedule_id: Only count this schedule
+
+    Returns:
+        Mapping of ``YYYY-MM-DD`` day to {status: count}; days without
+        activity are missing
+    """
+    params = {"day": since.isoformat(), "schedule_id": schedule_id}
+    result = await session.execute(text(daily_stats_sql(rollup, schedule_id is not None)), params)
+    days: dict[str, dict[str, int]] = {}
+    for day, status, count in result:
+        if not count:
+            continue
+        statuses = days.setdefault(day, {})
+        statuses[status] = statuses.get(status, 0) + count
+    return days
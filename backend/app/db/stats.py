@@ -0,0 +1,39 @@
+"""
+Fast table statistics.
+
+Row counts are read from ``table_stats``, which triggers update on every
+insert and delete (see migration 2), so reading them never scans a table.
+"""
+import sqlite3
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+TABLE_STATS_SQL = "SELECT table_name, row_count FROM table_stats ORDER BY table_name"
+
+
+def read_table_stats(conn: sqlite3.Connection) -> dict[str, int]:
+    """
+    Row counts per table, for synchronous callers such as scripts.
+
+    Args:
+        conn: Open sqlite3 connection
+
+    Returns:
+        Mapping of table name to row count
+    """
+    return dict(conn.execute(TABLE_STATS_SQL).fetchall())
+
+
+async def fetch_table_stats(session: AsyncSession) -> dict[str, int]:
+    """
+    Row counts per table, for the API.
+
+    Args:
+        session: Read session
+
+    Returns:
+        Mapping of table name to row count
+    """
+    result = await session.execute(text(TABLE_STATS_SQL))
+    return dict(result.all())
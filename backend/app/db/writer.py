@@ -0,0 +1,313 @@
+"""
+Single-writer actor for the SQLite database.
+
+SQLite serializes writers, so instead of the crawler, the notifier and admin
+requests each opening their own write transaction, all writes go through one
+asyncio task that owns the writer connection. Callers submit write commands
+(async functions taking a session) and await their results; the actor takes
+commands from a bounded queue and runs as many as it can in one transaction,
+closing the batch when it reaches ``max_batch`` commands or when
+``max_delay`` has passed since the first one. One commit is then
+shared by the whole batch.
+
+A batch first runs as a plain transaction. If one of its commands fails,
+the transaction is rolled back and the batch replayed with a SAVEPOINT
+around each command, so the failing command is reported to its caller
+without affecting the rest of the batch; keeping savepoints off the common
+path saves two statements per command. Commands may therefore run more than
+once and should only touch the database. Results are only handed out after
+the batch has committed.
+
+Commands that raise, even ``CancelledError``, fail on their own; the actor
+keeps running. Should it stop anyway, every command it still holds fails
+with ``WriteError`` instead of leaving its caller waiting.
+"""
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.engine import Database
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+WriteCommand = Callable[[AsyncSession], Awaitable[T]]
+
+DEFAULT_MAX_BATCH = 100
+DEFAULT_MAX_DELAY = 0.001
+DEFAULT_MAX_QUEUE = 1000
+
+
+@dataclass
+class WriterMetrics:
+    """
+    Counters describing the writer's load and backpressure.
+
+    Attributes:
+        submitted: Commands accepted into the queue
+        completed: Commands whose transaction committed
+        failed: Commands that raised or whose transaction failed to commit
+        transactions: Transactions committed or attempted
+        blocked_submits: Submits that had to wait because the queue was full
+        queue_depth: Commands currently waiting
+        max_queue_depth: Highest queue depth seen
+        queue_wait_seconds: Total time commands spent queued
+        max_queue_wait_seconds: Longest time a command spent queued
+        transaction_seconds: Total time spent running batches
+    """
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    transactions: int = 0
+    blocked_submits: int = 0
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    queue_wait_seconds: float = 0.0
+    max_queue_wait_seconds: float = 0.0
+    transaction_seconds: float = 0.0
+
+    @property
+    def mean_batch_size(self) -> float:
+        """Commands per transaction."""
+        done = self.completed + self.failed
+        return done / self.transactions if self.transactions else 0.0
+
+    @property
+    def mean_queue_wait_seconds(self) -> float:
+        """Average time a command spent queued before its batch started."""
+        done = self.completed + self.failed
+        return self.queue_wait_seconds / done if done else 0.0
+
+
+class WriteError(Exception):
+    """A write command could not be applied; ``__cause__`` holds why, if known."""
+
+
+class _CommandFailed(Exception):
+    """A command failed while its batch ran without savepoints."""
+
+
+def _write_error(message: str, cause: BaseException | None = None) -> WriteError:
+    """A fresh WriteError for one caller, chained to ``cause``."""
+    error = WriteError(message)
+    error.__cause__ = cause
+    return error
+
+
+def _stopping() -> bool:
+    """Whether the current task (the actor) is being cancelled."""
+    task = asyncio.current_task()
+    return task is not None and task.cancelling() > 0
+
+
+@dataclass
+class _Pending:
+    command: WriteCommand
+    future: asyncio.Future
+    enqueued_at: float
+
+
+class DatabaseWriter:
+    """
+    Owns the writer connection and applies queued write commands in batches.
+
+    Attributes:
+        metrics: Load and backpressure counters
+    """
+
+    def __init__(
+        self,
+        db: Database,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        max_queue: int = DEFAULT_MAX_QUEUE,
+    ):
+        self._db = db
+        self._max_batch = max_batch
+        self._max_delay = max_delay
+        self._queue: asyncio.Queue[_Pending] = asyncio.Queue(maxsize=max_queue)
+        self._task: asyncio.Task | None = None
+        self.metrics = WriterMetrics()
+
+    @classmethod
+    def from_settings(cls, db: Database, settings) -> "DatabaseWriter":
+        """Create a writer configured by the DB_WRITE_* settings."""
+        return cls(
+            db,
+            max_batch=settings.DB_WRITE_BATCH_SIZE,
+            max_delay=settings.DB_WRITE_BATCH_WINDOW_MS / 1000,
+            max_queue=settings.DB_WRITE_QUEUE_SIZE,
+        )
+
+    def start(self) -> None:
+        """Start the actor task."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="database-writer")
+
+    async def stop(self) -> None:
+        """Apply every queued command, then stop the actor task."""
+        if self._task is None:
+            return
+        if not self._task.done():
+            await self._queue.join()
+            self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        except BaseException:
+            # The actor had died on its own; _run logged it and failed its callers
+            pass
+        self._task = None
+
+    async def submit(self, command: WriteCommand[T]) -> T:
+        """
+        Queue a write command and wait for its result.
+
+        Waits for queue space if the writer is saturated, which slows
+        producers down to the rate the database can absorb.
+
+        Args:
+            command: Async function run with the batch's write session; it
+                must not commit or roll back itself
+
+        Returns:
+            The command's return value, once its transaction has committed
+        """
+        if self._task is None or self._task.done():
+            raise RuntimeError("DatabaseWriter is not running")
+        loop = asyncio.get_running_loop()
+        pending = _Pending(command, loop.create_future(), time.perf_counter())
+        if self._queue.full():
+            self.metrics.blocked_submits += 1
+        await self._queue.put(pending)
+        self.metrics.submitted += 1
+        self._record_depth()
+        return await pending.future
+
+    def _record_depth(self) -> None:
+        depth = self._queue.qsize()
+        self.metrics.queue_depth = depth
+        if depth > self.metrics.max_queue_depth:
+            self.metrics.max_queue_depth = depth
+
+    async def _next_batch(self, batch: list[_Pending]) -> None:
+        """Wait for a command, then gather more until the batch is full or the window closes."""
+        batch.append(await self._queue.get())
+        deadline = time.perf_counter() + self._max_delay
+        while len(batch) < self._max_batch:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except TimeoutError:
+                break
+        self._record_depth()
+
+    async def _run(self) -> None:
+        batch: list[_Pending] = []
+        try:
+            while True:
+                await self._next_batch(batch)
+                await self._apply(batch)
+                for _ in batch:
+                    self._queue.task_done()
+                batch.clear()
+        except asyncio.CancelledError:
+            raise
+        except BaseException:
+            logger.exception("Database writer stopped unexpectedly")
+            raise
+        finally:
+            self._abandon(batch)
+
+    def _abandon(self, batch: list[_Pending]) -> None:
+        """Fail the commands of an unfinished batch and every queued one."""
+        while not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        for pending in batch:
+            if not pending.future.done():
+                self.metrics.failed += 1
+                pending.future.set_exception(_write_error("DatabaseWriter stopped"))
+            self._queue.task_done()
+        batch.clear()
+        self._record_depth()
+
+    async def _run_batch(
+        self, batch: list[_Pending], isolate: bool
+    ) -> list[tuple[bool, Any]]:
+        """
+        Run every command of a batch in one transaction.
+
+        Without ``isolate`` the first failing command aborts the whole
+        transaction with ``_CommandFailed``; with it, each command runs in a
+        SAVEPOINT and failures are returned as outcomes.
+        """
+        outcomes: list[tuple[bool, Any]] = []
+        async with self._db.write() as session:
+            for pending in batch:
+                if not isolate:
+                    try:
+                        outcomes.append((True, await pending.command(session)))
+                    except (Exception, asyncio.CancelledError) as exc:
+                        if _stopping():
+                            raise
+                        raise _CommandFailed from exc
+                    continue
+                try:
+                    async with session.begin_nested():
+                        outcomes.append((True, await pending.command(session)))
+                except (Exception, asyncio.CancelledError) as exc:
+                    if _stopping():
+                        raise
+                    if isinstance(exc, asyncio.CancelledError):
+                        # Raised in the caller, it would look like the caller was cancelled
+                        exc = _write_error("Write command was cancelled", exc)
+                    outcomes.append((False, exc))
+        return outcomes
+
+    async def _apply(self, batch: list[_Pending]) -> None:
+        """Run one batch in a single transaction and resolve its futures."""
+        started = time.perf_counter()
+        for pending in batch:
+            wait = started - pending.enqueued_at
+            self.metrics.queue_wait_seconds += wait
+            self.metrics.max_queue_wait_seconds = max(self.metrics.max_queue_wait_seconds, wait)
+
+        try:
+            try:
+                outcomes = await self._run_batch(batch, isolate=False)
+            except _CommandFailed:
+                # Replay the batch with a savepoint per command so only the
+                # failing ones are rolled back
+                outcomes = await self._run_batch(batch, isolate=True)
+        except Exception as exc:
+            logger.exception("Write batch of %d commands failed to commit", len(batch))
+            outcomes = [
+                (False, _write_error("Write batch failed to commit", exc)) for _ in batch
+            ]
+        finally:
+            self.metrics.transactions += 1
+            self.metrics.transaction_seconds += time.perf_counter() - started
+
+        for pending, (ok, value) in zip(batch, outcomes):
+            if ok:
+                self.metrics.completed += 1
+            else:
+                self.metrics.failed += 1
+            if pending.future.done():
+                # The caller stopped waiting (e.g. its request was cancelled)
+                continue
+            if ok:
+                pending.future.set_result(value)
+            else:
+                pending.future.set_exception(value)
@@ -1,35 +1,77 @@
-import re
+import asyncio
+import contextlib
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from app.core.config import settings
+from app.core.config import settings, settings_registry
+from app.core.cors import CustomCORSMiddleware
+from app.crawler.pool import BrowserPool
+from app.db import Database, DatabaseWriter
+from app.db.archive import migrate_archives
+from app.db.engine import database_path
+from app.db.migrations import migrate_database
 from app.api import api_router
+from app.services.crawl import Crawler
+from app.services.retention import run_retention
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Startup-only settings come from the current snapshot; reloadable ones
+    # (see RELOADABLE_SETTINGS) are read live by the components using them
+    settings = settings_registry.settings
+    if settings.DB_MIGRATE_ON_STARTUP:
+        db_path = database_path(settings.DATABASE_URL)
+        await asyncio.to_thread(migrate_database, db_path)
+        await asyncio.to_thread(migrate_archives, db_path, settings.NOTIFICATION_ARCHIVE_DIR)
+    app.state.db = Database.from_settings(settings)
+    app.state.writer = DatabaseWriter.from_settings(app.state.db, settings)
+    app.state.writer.start()
+    app.state.browser_pool = None
+    if settings.CRAWL_BROWSER_POOL_SIZE > 0:
+        app.state.browser_pool = BrowserPool.from_settings(settings)
+        await app.state.browser_pool.start()
+    app.state.crawler = Crawler.from_settings(
+        settings, app.state.db, app.state.writer, app.state.browser_pool
+    )
+    background = []
+    if settings.SETTINGS_RELOAD_INTERVAL > 0:
+        background.append(asyncio.create_task(
+            settings_registry.watch(settings.SETTINGS_RELOAD_INTERVAL)
+        ))
+    # Always started: it idles while CRAWL_LOG_RETENTION_INTERVAL is 0
+    background.append(asyncio.create_task(
+        run_retention(app.state.db, app.state.writer, settings_registry)
+    ))
+    yield
+    for task in background:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+    await app.state.crawler.close()
+    if app.state.browser_pool is not None:
+        await app.state.browser_pool.stop()
+    await app.state.writer.stop()
+    await app.state.db.dispose()
+
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
-    description="Video Alert API"
+    description="Video Alert API",
+    lifespan=lifespan
 )
 
 # Configure CORS with support for Replit wildcard domains
-class CustomCORSMiddleware(CORSMiddleware):
-    def is_allowed_origin(self, origin: str) -> bool:
-        for allowed_origin in self.allow_origins:
-            if allowed_origin == "*":
-                return True
-            if allowed_origin.startswith("https://*."):
-                domain = allowed_origin.replace("https://*.", "")
-                if re.match(rf"^https://.*\.{re.escape(domain)}$", origin):
-                    return True
-            elif origin == allowed_origin:
-                return True
-        return False
-
 app.add_middleware(
     CustomCORSMiddleware,
     allow_origins=settings.ALLOWED_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    max_age=settings.CORS_PREFLIGHT_MAX_AGE,
+    origin_cache_size=settings.CORS_ORIGIN_CACHE_SIZE,
+    preflight_cache_size=settings.CORS_PREFLIGHT_CACHE_SIZE,
+    settings_registry=settings_registry,
 )
 
 # Include API router
@@ -40,7 +82,7 @@ app.include_router(api_router, prefix=settings.API_V1_PREFIX)
 async def root():
     return {
         "message": "Welcome to Video Alert API",
-        "version": settings.VERSION,
+        "version": settings_registry.settings.VERSION,
         "docs": "/docs"
     }
 
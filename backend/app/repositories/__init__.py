@@ -0,0 +1,6 @@
+"""
+SQL repositories, one module per table.
+
+Queries are plain SQL constants executed through SQLAlchemy ``text()`` so the
+same statements can be inspected with ``EXPLAIN QUERY PLAN``.
+"""
@@ -0,0 +1,145 @@
+"""
+Queries for the crawl_execution_logs table.
+"""
+from datetime import datetime
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.ids import new_uuid
+from app.core.timestamps import format_timestamp
+
+STATUS_SUCCESS = "success"
+STATUS_FAILED = "failed"
+STATUS_TIMEOUT = "timeout"
+# The server answered 304: the page is unchanged since the previous crawl
+STATUS_NOT_MODIFIED = "not_modified"
+# The listing's content fingerprint matched the previous crawl's: nothing
+# was extracted or stored; error_details says why the crawl was skipped
+STATUS_UNCHANGED = "unchanged"
+
+INSERT_CRAWL_LOG_SQL = (
+    "INSERT INTO crawl_execution_logs "
+    "(uuid, schedule_id, started_at, finished_at, status, error_details) "
+    "VALUES (:uuid, :schedule_id, :started_at, :finished_at, :status, :error_details)"
+)
+
+# Loose index scan: each call seeks to the next distinct schedule_id in
+# idx_crawl_execution_logs_schedule_id instead of reading every row
+NEXT_LOGGED_SCHEDULE_SQL = """
+    SELECT schedule_id FROM crawl_execution_logs
+    WHERE schedule_id > :after
+    ORDER BY schedule_id
+    LIMIT 1
+"""
+
+# One schedule's logs started before :started_at (or at it, after :rowid),
+# newest first. The range and the order both come straight from
+# idx_crawl_execution_logs_schedule_id (schedule_id, started_at DESC).
+OLD_LOGS_SQL = """
+    SELECT id, started_at, status
+    FROM crawl_execution_logs INDEXED BY idx_crawl_execution_logs_schedule_id
+    WHERE schedule_id = :schedule_id
+      AND started_at <= :started_at AND (started_at < :started_at OR rowid > :rowid)
+    ORDER BY started_at DESC, rowid
+    LIMIT :limit
+"""
+
+
+def delete_logs_sql(count: int) -> str:
+    """DELETE statement for ``count`` rowids bound as :r0, :r1, ..."""
+    placeholders = ", ".join(f":r{i}" for i in range(count))
+    return f"DELETE FROM crawl_execution_logs WHERE rowid IN ({placeholders})"
+
+
+async def insert_crawl_log(
+    session: AsyncSession,
+    schedule_id: int,
+    started_at: datetime,
+    finished_at: datetime,
+    status: str,
+    error_details: str | None = None,
+) -> None:
+    """
+    Record one crawl attempt.
+
+    Args:
+        session: Write session; the caller controls the transaction
+        schedule_id: Schedule that was crawled
+        started_at: When the crawl started (UTC)
+        finished_at: When it ended (UTC)
+        status: Outcome, e.g. ``STATUS_SUCCESS`` or ``STATUS_NOT_MODIFIED``
+        error_details: Error message for failed attempts
+    """
+    await session.execute(text(INSERT_CRAWL_LOG_SQL), {
+        "uuid": new_uuid(),
+        "schedule_id": schedule_id,
+        "started_at": format_timestamp(started_at),
+        "finished_at": format_timestamp(finished_at),
+        "status": status,
+        "error_details": error_details,
+    })
+
+
+async def next_logged_schedule(session: AsyncSession, after: int = 0) -> int | None:
+    """
+    The smallest schedule_id with logs that sorts after ``after``.
+
+    Args:
+        session: Read session
+        after: Previous schedule_id; 0 for the first one
+
+    Returns:
+        The schedule_id, or None when there are no more
+    """
+    result = await session.execute(text(NEXT_LOGGED_SCHEDULE_SQL), {"after": after})
+    return result.scalar()
+
+
+async def list_old_logs(
+    session: AsyncSession,
+    schedule_id: int,
+    before: tuple[str, int],
+    limit: int,
+):
+    """
+    Logs of one schedule from ``before`` backwards in time.
+
+    Args:
+        session: Read session
+        schedule_id: Schedule whose logs to read
+        before: (started_at, rowid) to continue from; rows started exactly at
+            ``started_at`` are only returned if their rowid is larger
+        limit: Maximum number of rows
+
+    Returns:
+        Rows with id (the rowid), started_at and status
+    """
+    started_at, rowid = before
+    result = await session.execute(text(OLD_LOGS_SQL), {
+        "schedule_id": schedule_id,
+        "started_at": started_at,
+        "rowid": rowid,
+        "limit": limit,
+    })
+    return result.all()
+
+
+async def delete_logs(session: AsyncSession, rowids: list[int]) -> int:
+    """
+    Delete logs by rowid.
+
+    Args:
+        session: Write session; the caller controls the transaction
+        rowids: Rowids to delete
+
+    Returns:
+        Number of rows deleted
+    """
+    if not rowids:
+        return 0
+    result = await session.execute(
+        text(delete_logs_sql(len(rowids))),
+        {f"r{i}": rowid for i, rowid in enumerate(rowids)},
+    )
+    return result.rowcount
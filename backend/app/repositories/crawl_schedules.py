@@ -0,0 +1,22 @@
+"""
+Queries for the crawl_schedules table.
+"""
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+SCHEDULE_ID_BY_UUID_SQL = "SELECT id FROM crawl_schedules WHERE uuid = :uuid"
+
+
+async def get_schedule_id(session: AsyncSession, public_id: bytes) -> int | None:
+    """
+    Internal id of the schedule with a public id.
+
+    Args:
+        session: Read or write session
+        public_id: Stored form of the schedule's public UUID
+
+    Returns:
+        The schedule's id, or None if there is no such schedule
+    """
+    result = await session.execute(text(SCHEDULE_ID_BY_UUID_SQL), {"uuid": public_id})
+    return result.scalar()
@@ -0,0 +1,95 @@
+"""
+Queries for the crawled_pages table: per-URL state kept between crawls.
+"""
+from dataclasses import dataclass, field
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crawler.fetch import PageValidators
+from app.crawler.routing import RenderStrategy
+
+
+@dataclass(frozen=True)
+class CrawledPage:
+    """
+    What the previous crawls of a URL left behind.
+
+    Attributes:
+        validators: Cache validators of the last static fetch with videos
+        strategy: Learned rendering strategy
+        content_hash: Fingerprint of the listing through the last video read
+            (see ``app.crawler.fingerprint``), if hashed
+        content_items: Videos covered by ``content_hash``
+    """
+    validators: PageValidators = field(default_factory=PageValidators)
+    strategy: RenderStrategy = field(default_factory=RenderStrategy)
+    content_hash: str | None = None
+    content_items: int = 0
+
+
+GET_CRAWLED_PAGE_SQL = """
+    SELECT etag, last_modified, render_mode, crawls_since_probe, content_hash, content_items
+    FROM crawled_pages WHERE url = :url
+"""
+
+SAVE_CRAWLED_PAGE_SQL = """
+    INSERT INTO crawled_pages (
+        url, etag, last_modified, render_mode, crawls_since_probe, content_hash, content_items,
+        updated_at
+    )
+    VALUES (
+        :url, :etag, :last_modified, :render_mode, :crawls_since_probe, :content_hash,
+        :content_items, CURRENT_TIMESTAMP
+    )
+    ON CONFLICT (url) DO UPDATE SET
+        etag = excluded.etag,
+        last_modified = excluded.last_modified,
+        render_mode = excluded.render_mode,
+        crawls_since_probe = excluded.crawls_since_probe,
+        content_hash = excluded.content_hash,
+        content_items = excluded.content_items,
+        updated_at = excluded.updated_at
+"""
+
+
+async def get_crawled_page(session: AsyncSession, url: str) -> CrawledPage:
+    """
+    State stored by the previous crawls of ``url``.
+
+    Args:
+        session: Read session
+        url: Page URL
+
+    Returns:
+        The stored state, or a default one if the page was never crawled
+    """
+    row = (await session.execute(text(GET_CRAWLED_PAGE_SQL), {"url": url})).first()
+    if row is None:
+        return CrawledPage()
+    return CrawledPage(
+        validators=PageValidators(etag=row.etag, last_modified=row.last_modified),
+        strategy=RenderStrategy(row.render_mode, row.crawls_since_probe),
+        content_hash=row.content_hash,
+        content_items=row.content_items,
+    )
+
+
+async def save_crawled_page(session: AsyncSession, url: str, page: CrawledPage) -> None:
+    """
+    Store the state of ``url`` after a crawl.
+
+    Args:
+        session: Write session; the caller controls the transaction
+        url: Page URL
+        page: State for the next crawl
+    """
+    await session.execute(text(SAVE_CRAWLED_PAGE_SQL), {
+        "url": url,
+        "etag": page.validators.etag,
+        "last_modified": page.validators.last_modified,
+        "render_mode": page.strategy.mode,
+        "crawls_since_probe": page.strategy.crawls_since_probe,
+        "content_hash": page.content_hash,
+        "content_items": page.content_items,
+    })
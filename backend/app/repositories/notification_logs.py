@@ -0,0 +1,150 @@
+"""
+Queries for the notification_logs table.
+
+Old logs are moved to monthly archive databases (see ``app.db.archive``)
+with the same table definition, so the read queries here take the schema
+name of the database to read from.
+"""
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.ids import new_uuid
+
+STATUS_PENDING = "pending"
+STATUS_SENT = "sent"
+STATUS_FAILED = "failed"
+STATUS_RETRIED = "retried"
+
+INSERT_NOTIFICATION_SQL = (
+    "INSERT INTO notification_logs (uuid, video_id, schedule_id, status) "
+    "VALUES (:uuid, :video_id, :schedule_id, :status)"
+)
+
+
+async def queue_notifications(
+    session: AsyncSession,
+    schedule_id: int,
+    video_ids: list[int],
+) -> int:
+    """
+    Insert a pending notification for each video with one executemany.
+
+    Args:
+        session: Write session; the caller controls the transaction
+        schedule_id: Schedule that detected the videos
+        video_ids: Ids of newly stored videos
+
+    Returns:
+        Number of notifications queued
+    """
+    if not video_ids:
+        return 0
+    await session.execute(text(INSERT_NOTIFICATION_SQL), [
+        {
+            "uuid": new_uuid(),
+            "video_id": video_id,
+            "schedule_id": schedule_id,
+            "status": STATUS_PENDING,
+        }
+        for video_id in video_ids
+    ])
+    return len(video_ids)
+
+
+UPDATE_NOTIFICATION_STATUS_SQL = (
+    "UPDATE notification_logs SET status = :status, error_details = :error_details, "
+    "sent_at = CURRENT_TIMESTAMP WHERE id = :id"
+)
+
+
+async def update_notification_status(
+    session: AsyncSession,
+    log_id: int,
+    status: str,
+    error_details: str | None = None,
+) -> bool:
+    """
+    Record the outcome of a notification attempt.
+
+    Args:
+        session: Write session; the caller controls the transaction
+        log_id: Notification log id
+        status: New status, e.g. ``STATUS_SENT`` or ``STATUS_FAILED``
+        error_details: Error message for failed attempts
+
+    Returns:
+        True if the log exists
+    """
+    result = await session.execute(text(UPDATE_NOTIFICATION_STATUS_SQL), {
+        "id": log_id, "status": status, "error_details": error_details,
+    })
+    return result.rowcount == 1
+
+
+# Newest first with a keyset on (sent_at DESC, id), served by
+# idx_notification_logs_sent_at in the main database and in every archive.
+# The first page starts after a sentinel newer than any real row.
+FIRST_PAGE_KEY = ("9999-12-31 23:59:59", 0)
+
+
+def list_notification_logs_sql(schema: str, schedule_id: bool, status: bool) -> str:
+    """
+    Page query over ``<schema>.notification_logs`` with optional filters.
+
+    Args:
+        schema: ``main`` or the name an archive file is attached as
+        schedule_id: Filter on ``:schedule_id``
+        status: Filter on ``:status``
+
+    Public ids of the video and schedule are looked up in the main database;
+    they are null for archived logs whose video or schedule has been deleted.
+    """
+    filters = ""
+    if schedule_id:
+        filters += " AND n.schedule_id = :schedule_id"
+    if status:
+        filters += " AND n.status = :status"
+    return f"""
+        SELECT n.id, n.uuid, v.uuid AS video_uuid, s.uuid AS schedule_uuid,
+               n.status, n.error_details, n.sent_at
+        FROM {schema}.notification_logs AS n INDEXED BY idx_notification_logs_sent_at
+        LEFT JOIN main.video_records AS v ON v.id = n.video_id
+        LEFT JOIN main.crawl_schedules AS s ON s.id = n.schedule_id
+        WHERE n.sent_at <= :sent_at AND (n.sent_at < :sent_at OR n.id > :id){filters}
+        ORDER BY n.sent_at DESC, n.id
+        LIMIT :limit
+    """
+
+
+async def list_notification_logs(
+    session: AsyncSession,
+    limit: int,
+    after: tuple[str, int] | None = None,
+    schedule_id: int | None = None,
+    status: str | None = None,
+    schema: str = "main",
+):
+    """
+    One page of notification logs from one database, newest first.
+
+    Args:
+        session: Read session
+        limit: Maximum number of rows
+        after: (sent_at, id) of the last row of the previous page
+        schedule_id: Only return logs for this schedule
+        status: Only return logs with this status
+        schema: Database to read, ``main`` or an attached archive
+
+    Returns:
+        Rows with id, uuid, video_uuid, schedule_uuid, status, error_details
+        and sent_at
+    """
+    sent_at, log_id = after or FIRST_PAGE_KEY
+    params = {"sent_at": sent_at, "id": log_id, "limit": limit}
+    if schedule_id is not None:
+        params["schedule_id"] = schedule_id
+    if status is not None:
+        params["status"] = status
+    sql = list_notification_logs_sql(schema, schedule_id is not None, status is not None)
+    result = await session.execute(text(sql), params)
+    return result.all()
@@ -0,0 +1,308 @@
+"""
+Queries for the video_records table.
+"""
+import html
+from dataclasses import dataclass
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.ids import new_uuid
+from app.core.urls import url_hash
+
+# Rows per INSERT statement; 7 bound parameters per row stays far below
+# SQLite's 32766 variable limit
+INSERT_CHUNK_SIZE = 1000
+
+INSERT_COLUMNS = ("uuid", "title", "url", "url_hash", "thumbnail", "description", "schedule_id")
+
+# Keyset pagination on (detected_at DESC, id): the detected_at index stores
+# the rowid (id) as its implicit last column, so it yields rows in exactly this order
+# and each page is an index seek from the previous page's last row. A
+# schedule's videos are read from (schedule_id, detected_at DESC) the same
+# way, so a schedule with few videos costs a page, not a walk of every
+# video; INDEXED BY pins both plans.
+FIRST_PAGE_KEY = ("9999-12-31 23:59:59", 0)
+
+LIST_VIDEOS_SQL = """
+    SELECT v.id, v.uuid, v.title, v.url, v.thumbnail, v.description, v.detected_at,
+           s.uuid AS schedule_uuid
+    FROM video_records AS v INDEXED BY idx_video_records_detected_at
+    JOIN crawl_schedules AS s ON s.id = v.schedule_id
+    WHERE v.detected_at <= :detected_at
+      AND (v.detected_at < :detected_at OR v.id > :id)
+    ORDER BY v.detected_at DESC, v.id
+    LIMIT :limit
+"""
+
+LIST_VIDEOS_BY_SCHEDULE_SQL = """
+    SELECT v.id, v.uuid, v.title, v.url, v.thumbnail, v.description, v.detected_at,
+           s.uuid AS schedule_uuid
+    FROM video_records AS v INDEXED BY idx_video_records_schedule_detected_at
+    JOIN crawl_schedules AS s ON s.id = v.schedule_id
+    WHERE v.schedule_id = :schedule_id
+      AND v.detected_at <= :detected_at
+      AND (v.detected_at < :detected_at OR v.id > :id)
+    ORDER BY v.detected_at DESC, v.id
+    LIMIT :limit
+"""
+
+
+@dataclass(frozen=True)
+class ExtractedVideo:
+    """
+    A video as extracted from the monitored page.
+
+    Attributes:
+        title: Video title
+        url: Link to the video
+        thumbnail: Thumbnail URL, if any
+        description: Short description, if any
+    """
+    title: str
+    url: str
+    thumbnail: str | None = None
+    description: str | None = None
+
+
+@dataclass(frozen=True)
+class InsertedVideo:
+    """
+    A video that was new and has been stored.
+
+    Attributes:
+        id: Record id (rowid)
+        uuid: Generated public id
+        url_hash: Hash of the canonical URL
+        video: The extracted data that was stored
+    """
+    id: int
+    uuid: bytes
+    url_hash: int
+    video: ExtractedVideo
+
+
+def insert_new_videos_sql(row_count: int) -> str:
+    """
+    Multi-row upsert that skips already-known URLs and returns the new rows.
+
+    Args:
+        row_count: Number of rows in the VALUES list
+    """
+    values = ", ".join(
+        "(" + ", ".join(f":{column}_{i}" for column in INSERT_COLUMNS) + ")"
+        for i in range(row_count)
+    )
+    return (
+        f"INSERT INTO video_records ({', '.join(INSERT_COLUMNS)}) VALUES {values} "
+        "ON CONFLICT(url_hash) DO NOTHING "
+        "RETURNING id, uuid"
+    )
+
+
+async def insert_new_videos(
+    session: AsyncSession,
+    schedule_id: int,
+    videos: list[ExtractedVideo],
+) -> list[InsertedVideo]:
+    """
+    Store the videos whose canonical URL is not known yet.
+
+    Deduplication is done by the unique ``url_hash`` index: each chunk of
+    candidates is a single ``INSERT ... ON CONFLICT DO NOTHING RETURNING``
+    statement, so no per-video lookups are needed. Duplicates within the
+    batch are also skipped.
+
+    Args:
+        session: Write session; the caller controls the transaction
+        schedule_id: Schedule that detected the videos
+        videos: Candidate videos in page order
+
+    Returns:
+        The videos that were inserted, in input order
+    """
+    inserted: list[InsertedVideo] = []
+    for start in range(0, len(videos), INSERT_CHUNK_SIZE):
+        chunk = videos[start:start + INSERT_CHUNK_SIZE]
+        params = {}
+        candidates = {}
+        for i, video in enumerate(chunk):
+            public_id = new_uuid()
+            hashed = url_hash(video.url)
+            candidates.setdefault(hashed, (public_id, video))
+            params.update({
+                f"uuid_{i}": public_id,
+                f"title_{i}": video.title,
+                f"url_{i}": video.url,
+                f"url_hash_{i}": hashed,
+                f"thumbnail_{i}": video.thumbnail,
+                f"description_{i}": video.description,
+                f"schedule_id_{i}": schedule_id,
+            })
+
+        result = await session.execute(text(insert_new_videos_sql(len(chunk))), params)
+        new_ids = {row.uuid: row.id for row in result}
+        inserted.extend(
+            InsertedVideo(id=new_ids[public_id], uuid=public_id, url_hash=hashed, video=video)
+            for hashed, (public_id, video) in candidates.items()
+            if public_id in new_ids
+        )
+    return inserted
+
+
+def known_url_hashes_sql(count: int) -> str:
+    """Lookup of ``count`` URL hashes bound as :h0, :h1, ... in the url_hash index."""
+    placeholders = ", ".join(f":h{i}" for i in range(count))
+    return f"SELECT url_hash FROM video_records WHERE url_hash IN ({placeholders})"
+
+
+async def known_videos(session: AsyncSession, videos: list[ExtractedVideo]) -> set[str]:
+    """
+    URLs among ``videos`` that are already stored, compared by canonical URL.
+
+    Args:
+        session: Read session
+        videos: Candidate videos
+
+    Returns:
+        The ``url`` of each candidate that is known
+    """
+    hashes = {url_hash(video.url): video.url for video in videos}
+    if not hashes:
+        return set()
+    result = await session.execute(
+        text(known_url_hashes_sql(len(hashes))),
+        {f"h{i}": hashed for i, hashed in enumerate(hashes)},
+    )
+    return {hashes[hashed] for hashed in result.scalars()}
+
+
+# Full-text search ranked by bm25 with titles weighted over descriptions.
+# Ranking has to score every match, but highlights and snippets are only
+# computed for the rows of the requested page. CROSS JOIN keeps the page as
+# the outer loop, so the index is probed by rowid per page row instead of
+# the whole MATCH being evaluated a second time, and the page's order is kept.
+SEARCH_LAST_KEY = (float("-inf"), 0)
+
+# highlight() and snippet() only insert markers around matches; the text is
+# crawled and must be escaped before the markers become <mark> tags, so
+# private-use characters stand in for the tags until then
+MATCH_START = "\ue000"
+MATCH_END = "\ue001"
+
+SEARCH_VIDEOS_SQL = f"""
+    WITH hits AS (
+        SELECT rowid, bm25(video_records_fts, 10.0, 1.0) AS score
+        FROM video_records_fts
+        WHERE video_records_fts MATCH :query
+    ), page AS (
+        SELECT rowid, score FROM hits
+        WHERE score > :score OR (score = :score AND rowid > :rowid)
+        ORDER BY score, rowid
+        LIMIT :limit
+    )
+    SELECT v.id, v.uuid, v.title, v.url, v.thumbnail, v.description,
+           v.detected_at, s.uuid AS schedule_uuid, page.score,
+           highlight(video_records_fts, 0, '{MATCH_START}', '{MATCH_END}') AS title_highlight,
+           snippet(video_records_fts, 1, '{MATCH_START}', '{MATCH_END}', '…', 16)
+               AS description_snippet
+    FROM page
+    CROSS JOIN video_records_fts
+      ON video_records_fts.rowid = page.rowid AND video_records_fts MATCH :query
+    JOIN video_records AS v ON v.id = page.rowid
+    JOIN crawl_schedules AS s ON s.id = v.schedule_id
+    ORDER BY page.score, page.rowid
+"""
+
+
+def mark_matches(marked: str | None) -> str | None:
+    """
+    HTML for a highlight or snippet of ``SEARCH_VIDEOS_SQL``.
+
+    The text is escaped and the match markers become ``<mark>`` tags, so the
+    result is safe to render as HTML.
+    """
+    if marked is None:
+        return None
+    return (
+        html.escape(marked)
+        .replace(MATCH_START, "<mark>")
+        .replace(MATCH_END, "</mark>")
+    )
+
+
+def fts_query(search: str) -> str | None:
+    """
+    Turn free text into an FTS5 query matching every word as a prefix.
+
+    Each word is quoted so FTS5 operators in user input are matched literally.
+
+    Args:
+        search: Text typed by the user
+
+    Returns:
+        FTS5 MATCH expression, or None if there is nothing to search for
+    """
+    terms = [term.replace('"', '""') for term in search.split()]
+    if not terms:
+        return None
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+async def search_videos(
+    session: AsyncSession,
+    search: str,
+    limit: int,
+    after: tuple[float, int] | None = None,
+):
+    """
+    One page of videos matching a full-text search, best match first.
+
+    Args:
+        session: Read session
+        search: Text typed by the user
+        limit: Maximum number of rows
+        after: (score, id) of the last row of the previous page
+
+    Returns:
+        Rows with the video columns, schedule_uuid, score, title_highlight
+        and description_snippet; the last two carry match markers (see
+        ``mark_matches``)
+    """
+    query = fts_query(search)
+    if query is None:
+        return []
+    score, rowid = after or SEARCH_LAST_KEY
+    result = await session.execute(text(SEARCH_VIDEOS_SQL), {
+        "query": query, "score": score, "rowid": rowid, "limit": limit,
+    })
+    return result.all()
+
+
+async def list_videos(
+    session: AsyncSession,
+    limit: int,
+    after: tuple[str, int] | None = None,
+    schedule_id: int | None = None,
+):
+    """
+    One page of videos, newest first.
+
+    Args:
+        session: Read session
+        limit: Maximum number of rows
+        after: (detected_at, id) of the last row of the previous page
+        schedule_id: Only return videos detected by this schedule
+
+    Returns:
+        Rows with id, uuid, title, url, thumbnail, description,
+        detected_at and schedule_uuid
+    """
+    detected_at, video_id = after or FIRST_PAGE_KEY
+    params = {"detected_at": detected_at, "id": video_id, "limit": limit}
+    sql = LIST_VIDEOS_SQL
+    if schedule_id is not None:
+        sql = LIST_VIDEOS_BY_SCHEDULE_SQL
+        params["schedule_id"] = schedule_id
+    result = await session.execute(text(sql), params)
+    return result.all()
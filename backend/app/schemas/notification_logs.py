@@ -0,0 +1,33 @@
+"""
+Pydantic schemas for notification log endpoints.
+"""
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+
+class NotificationLog(BaseModel):
+    """
+    One notification attempt.
+    """
+    id: str = Field(description="Notification log id")
+    video_id: str | None = Field(
+        description="Video the notification was about; null if it was deleted"
+    )
+    schedule_id: str | None = Field(
+        description="Schedule that detected the video; null if it was deleted"
+    )
+    status: str = Field(description="pending, sent, failed or retried")
+    error_details: str | None = Field(description="Error message for failed attempts")
+    sent_at: datetime = Field(description="When the attempt was logged (UTC)")
+
+
+class NotificationLogPage(BaseModel):
+    """
+    One page of notification logs.
+
+    Pass ``next_cursor`` back as ``cursor`` to fetch the following page; it is
+    null on the last page.
+    """
+    items: list[NotificationLog] = Field(description="Logs, newest first")
+    next_cursor: str | None = Field(description="Cursor for the next page, if any")
@@ -0,0 +1,84 @@
+"""
+Pydantic schemas for database statistics endpoints.
+"""
+from datetime import date
+
+from pydantic import BaseModel, Field
+
+
+class TableRowCount(BaseModel):
+    """
+    Row count of a single table.
+
+    Attributes:
+        name: Table name
+        row_count: Number of rows, maintained incrementally
+    """
+    name: str = Field(description="Table name")
+    row_count: int = Field(description="Number of rows in the table")
+
+
+class TableStatsResponse(BaseModel):
+    """
+    Response model for the table statistics endpoint.
+    """
+    tables: list[TableRowCount] = Field(
+        description="Row counts for every tracked table"
+    )
+
+
+class WriterStatsResponse(BaseModel):
+    """
+    Response model for the database writer statistics endpoint.
+    """
+    submitted: int = Field(description="Write commands accepted since startup")
+    completed: int = Field(description="Write commands committed")
+    failed: int = Field(description="Write commands that failed")
+    transactions: int = Field(description="Transactions run")
+    mean_batch_size: float = Field(description="Write commands per transaction")
+    queue_depth: int = Field(description="Write commands currently waiting")
+    max_queue_depth: int = Field(description="Highest number of waiting commands")
+    blocked_submits: int = Field(
+        description="Submits that waited because the queue was full (backpressure)"
+    )
+    mean_queue_wait_ms: float = Field(description="Average time a command waited in the queue")
+    max_queue_wait_ms: float = Field(description="Longest time a command waited in the queue")
+
+
+class BrowserPoolStatsResponse(BaseModel):
+    """
+    Response model for the browser pool statistics endpoint.
+    """
+    size: int = Field(description="Browsers the pool keeps")
+    in_use: int = Field(description="Browsers currently rendering a page")
+    idle: int = Field(description="Running browsers waiting for a crawl")
+    launched: int = Field(description="Browsers launched since startup")
+    recycled: int = Field(description="Browsers replaced after their page or memory limit")
+    crashed: int = Field(description="Browsers found crashed and relaunched")
+    launch_failures: int = Field(description="Browser launches that failed")
+    pages: int = Field(description="Pages rendered")
+    mean_launch_ms: float = Field(description="Average browser launch time")
+    max_launch_ms: float = Field(description="Slowest browser launch")
+
+
+class DailyStats(BaseModel):
+    """
+    Activity of one UTC day.
+    """
+    day: date = Field(description="UTC day")
+    videos_detected: int = Field(description="New videos stored")
+    notifications: dict[str, int] = Field(description="Notification count per status")
+    crawls: dict[str, int] = Field(description="Crawl count per status")
+    notification_success_rate: float | None = Field(
+        description="Share of sent or failed notifications that were sent; null if none"
+    )
+    crawl_failure_rate: float | None = Field(
+        description="Share of crawls that did not succeed; null if none ran"
+    )
+
+
+class DailyStatsResponse(BaseModel):
+    """
+    Response model for the daily statistics endpoint.
+    """
+    days: list[DailyStats] = Field(description="One entry per day, oldest first")
@@ -0,0 +1,52 @@
+"""
+Pydantic schemas for video record endpoints.
+"""
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+
+class VideoRecord(BaseModel):
+    """
+    A detected video.
+    """
+    id: str = Field(description="Video record id")
+    title: str = Field(description="Video title")
+    url: str = Field(description="Link to the video")
+    thumbnail: str | None = Field(description="Thumbnail URL")
+    description: str | None = Field(description="Short description")
+    detected_at: datetime = Field(description="When the video was first detected (UTC)")
+    schedule_id: str = Field(description="Schedule that detected the video")
+
+
+class VideoPage(BaseModel):
+    """
+    One page of video records.
+
+    Pass ``next_cursor`` back as ``cursor`` to fetch the following page; it is
+    null on the last page.
+    """
+    items: list[VideoRecord] = Field(description="Videos, newest first")
+    next_cursor: str | None = Field(description="Cursor for the next page, if any")
+
+
+class VideoSearchHit(VideoRecord):
+    """
+    A video matching a full-text search.
+
+    Highlights are HTML: the text is escaped and matched terms are wrapped
+    in ``<mark>`` tags, so they can be rendered as is.
+    """
+    title_highlight: str = Field(description="Title with matched terms marked")
+    description_snippet: str | None = Field(
+        description="Fragment of the description around the matched terms"
+    )
+    score: float = Field(description="bm25 relevance score, lower is better")
+
+
+class VideoSearchPage(BaseModel):
+    """
+    One page of search results, best match first.
+    """
+    items: list[VideoSearchHit] = Field(description="Matching videos, best match first")
+    next_cursor: str | None = Field(description="Cursor for the next page, if any")
@@ -0,0 +1,3 @@
+"""
+Application services combining repositories into units of work.
+"""
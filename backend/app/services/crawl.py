@@ -0,0 +1,380 @@
+"""
+One crawl of a monitored page: fetch or render, extract, ingest and log.
+"""
+import logging
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+
+import httpx
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crawler.browser import Renderer, RenderProfile
+from app.crawler.extract import ListingExtractor, ListingRules
+from app.crawler.fetch import PageValidators, create_http_client, stream_page
+from app.crawler.fingerprint import ContentFingerprint, VolatileRules
+from app.crawler.pool import BrowserPool
+from app.crawler.routing import BROWSER, STATIC
+from app.db import Database, DatabaseWriter
+from app.repositories.crawl_execution_logs import (
+    STATUS_FAILED,
+    STATUS_NOT_MODIFIED,
+    STATUS_SUCCESS,
+    STATUS_TIMEOUT,
+    STATUS_UNCHANGED,
+    insert_crawl_log,
+)
+from app.repositories.crawled_pages import CrawledPage, get_crawled_page, save_crawled_page
+from app.repositories.video_records import ExtractedVideo, known_videos
+from app.services.ingest import IngestResult, ingest_videos
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROBE_EVERY = 20
+DEFAULT_STOP_AFTER_KNOWN = 1
+
+
+@dataclass(frozen=True)
+class CrawlResult:
+    """
+    Outcome of one crawl.
+
+    Attributes:
+        status: Status recorded in crawl_execution_logs
+        ingest: What was stored; None unless the page was extracted
+        error: Error message for failed crawls, or why an unchanged one was skipped
+        render_mode: Mode that produced the extracted page, if any
+    """
+    status: str
+    ingest: IngestResult | None = None
+    error: str | None = None
+    render_mode: str | None = None
+
+
+async def _write(database: Database, writer: DatabaseWriter | None, command):
+    if writer is not None:
+        return await writer.submit(command)
+    async with database.write() as session:
+        return await command(session)
+
+
+class _ListingReader:
+    """
+    Extracts a page chunk by chunk and keeps the videos not stored yet.
+
+    Listings are newest first, so after ``stop_after_known`` consecutive
+    stored videos the rest of the page is older still and is not read.
+
+    With volatile rules the listing is fingerprinted as well. Videos are
+    then held back until as many have been read as the previous crawl read;
+    if the fingerprint through them is the previous one, the listing is
+    unchanged and reading stops before any of them is looked up.
+
+    Attributes:
+        videos: New videos in page order
+        read: Videos consumed before reading stopped
+        stopped: Reading stopped before the end of the page
+        unchanged: The listing matched the previous crawl's fingerprint
+    """
+
+    def __init__(
+        self,
+        database: Database,
+        rules: ListingRules,
+        url: str,
+        stop_after_known: int,
+        volatile: VolatileRules | None,
+        previous: CrawledPage,
+    ):
+        self._database = database
+        self._extractor = ListingExtractor(
+            rules, url, ContentFingerprint(volatile) if volatile is not None else None
+        )
+        self._stop_after_known = stop_after_known
+        self._known_in_a_row = 0
+        # Fingerprint to compare against, until it has been compared
+        self._previous_hash = previous.content_hash if volatile is not None else None
+        self._previous_items = previous.content_items
+        self._held: list[ExtractedVideo] = []
+        self.videos: list[ExtractedVideo] = []
+        self.read = 0
+        self.stopped = False
+        self.unchanged = False
+
+    @property
+    def found(self) -> int:
+        """Videos on the page so far, stored or not."""
+        return self._extractor.found
+
+    @property
+    def content_hash(self) -> str | None:
+        """Fingerprint of the listing through the last video read, if hashed."""
+        if not self.read or not self._extractor.fingerprints:
+            return None
+        return self._extractor.fingerprints[self.read - 1]
+
+    async def feed(self, chunk: str) -> bool:
+        """Read the next chunk; returns True once the rest of the page is not needed."""
+        await self._take(self._extractor.feed(chunk), end=False)
+        return self.stopped or self._extractor.done
+
+    async def close(self) -> None:
+        """Read the end of a page that was not stopped early."""
+        if not self.stopped:
+            await self._take(self._extractor.close(), end=True)
+
+    async def _take(self, batch: list[ExtractedVideo], end: bool) -> None:
+        if self._previous_hash is not None:
+            self._held.extend(batch)
+            comparable = self.found >= self._previous_items
+            if not (comparable or end or self._extractor.done):
+                return
+            fingerprints = self._extractor.fingerprints
+            if comparable and fingerprints[self._previous_items - 1] == self._previous_hash:
+                self.read = self._previous_items
+                self.stopped = self.unchanged = True
+                return
+            batch, self._held, self._previous_hash = self._held, [], None
+        await self._keep(batch)
+
+    async def _keep(self, batch: list[ExtractedVideo]) -> None:
+        if not batch or self.stopped:
+            return
+        if not self._stop_after_known:
+            # Ingestion skips known videos anyway; no need to look them up
+            self.read += len(batch)
+            self.videos.extend(batch)
+            return
+        async with self._database.read() as session:
+            known = await known_videos(session, batch)
+        for video in batch:
+            self.read += 1
+            if video.url not in known:
+                self._known_in_a_row = 0
+                self.videos.append(video)
+                continue
+            self._known_in_a_row += 1
+            if self._known_in_a_row >= self._stop_after_known:
+                self.stopped = True
+                return
+
+
+async def crawl_page(
+    database: Database,
+    client: httpx.AsyncClient,
+    schedule_id: int,
+    url: str,
+    rules: ListingRules = ListingRules(),
+    render: Renderer | None = None,
+    probe_every: int = DEFAULT_PROBE_EVERY,
+    stop_after_known: int = DEFAULT_STOP_AFTER_KNOWN,
+    volatile: VolatileRules | None = None,
+    writer: DatabaseWriter | None = None,
+) -> CrawlResult:
+    """
+    Crawl ``url`` once and record the attempt in crawl_execution_logs.
+
+    The page is fetched statically unless earlier crawls learned that only
+    the browser finds videos on it (see ``app.crawler.routing``); a static
+    fetch without videos falls back to ``render`` in the same crawl.
+
+    The static page is extracted while it downloads and the download stops
+    at the end of the listing or at the first ``stop_after_known`` videos in
+    a row that are already stored.
+
+    Static fetches are conditional on the validators stored by the previous
+    crawl. A 304 ends the crawl right there and is logged as
+    ``not_modified``. Otherwise the new videos, the page's state and the log
+    row are written in one transaction, so validators are never stored for
+    a page whose videos were not.
+
+    With ``volatile`` rules the listing is also fingerprinted, which catches
+    unchanged pages whose server sends no usable validators. A fingerprint
+    equal to the previous crawl's ends the crawl before any lookup or
+    ingestion; only the log row (``unchanged``, with the reason) and any
+    change to the page's state are written.
+
+    Args:
+        database: Application database
+        client: HTTP client (see ``app.crawler.fetch.create_http_client``)
+        schedule_id: Schedule being run
+        url: Page to crawl
+        rules: Where the listing is on the page
+        render: Browser renderer; without one every crawl is static
+        probe_every: Retry a static fetch every n-th crawl of a page that
+            needed the browser; 0 never retries
+        stop_after_known: Stop reading after this many stored videos in a
+            row; 0 reads the whole listing
+        volatile: Parts of the listing left out of its fingerprint; None
+            does not fingerprint
+        writer: Submit writes through this writer instead of opening write
+            transactions directly
+
+    Returns:
+        The crawl's outcome; errors are logged and reported, not raised
+    """
+    started_at = datetime.now(timezone.utc)
+
+    async def finish(
+        status: str,
+        error: str | None = None,
+        state: CrawledPage | None = None,
+        videos: list[ExtractedVideo] | None = None,
+        render_mode: str | None = None,
+    ) -> CrawlResult:
+        async def store(session: AsyncSession) -> IngestResult | None:
+            result = None
+            if videos is not None:
+                result = await ingest_videos(session, schedule_id, videos)
+            if state is not None:
+                await save_crawled_page(session, url, state)
+            await insert_crawl_log(
+                session, schedule_id, started_at, datetime.now(timezone.utc), status, error
+            )
+            return result
+
+        ingest = await _write(database, writer, store)
+        return CrawlResult(status=status, ingest=ingest, error=error, render_mode=render_mode)
+
+    async with database.read() as session:
+        previous = await get_crawled_page(session, url)
+    strategy = previous.strategy
+    tried_static = render is None or strategy.try_static(probe_every)
+
+    def reader() -> _ListingReader:
+        return _ListingReader(database, rules, url, stop_after_known, volatile, previous)
+
+    try:
+        listing = None
+        validators = PageValidators()
+        if tried_static:
+            listing = reader()
+            page = await stream_page(client, url, previous.validators, listing.feed)
+            if page.not_modified:
+                state = replace(
+                    previous, validators=page.validators, strategy=strategy.learn(True, STATIC)
+                )
+                return await finish(STATUS_NOT_MODIFIED, state=state, render_mode=STATIC)
+            await listing.close()
+            mode = STATIC
+            validators = page.validators
+        # Routing goes by videos found, not new ones: a listing whose first
+        # video is known is a working static page
+        if (listing is None or not listing.found) and render is not None:
+            # The static page had no videos (or was skipped): render it. Its
+            # validators are dropped so the next static probe is a full fetch.
+            listing = reader()
+            await listing.feed(await render(url))
+            await listing.close()
+            mode = BROWSER
+            validators = PageValidators()
+    except httpx.TimeoutException as exc:
+        logger.warning("Crawl of %s timed out: %r", url, exc)
+        return await finish(STATUS_TIMEOUT, f"Timed out: {exc!r}")
+    except httpx.HTTPError as exc:
+        logger.warning("Crawl of %s failed: %s", url, exc)
+        return await finish(STATUS_FAILED, str(exc))
+    except Exception as exc:
+        logger.exception("Crawl of %s failed", url)
+        return await finish(STATUS_FAILED, repr(exc))
+
+    produced_by = mode if listing.found else None
+    content_hash = listing.content_hash
+    state = CrawledPage(
+        validators,
+        strategy.learn(tried_static, produced_by),
+        content_hash=content_hash,
+        content_items=listing.read if content_hash else 0,
+    )
+    if listing.unchanged:
+        reason = (
+            f"Skipped: the first {listing.read} videos of the {mode} listing "
+            "match the previous crawl's content hash"
+        )
+        # Usually the state is the same too, and nothing but the log is written
+        return await finish(
+            STATUS_UNCHANGED, reason, state=state if state != previous else None, render_mode=mode
+        )
+    return await finish(STATUS_SUCCESS, state=state, videos=listing.videos, render_mode=mode)
+
+
+class Crawler:
+    """
+    Runs crawls with the crawl settings the app started with.
+
+    Builds ``crawl_page``'s arguments once: the HTTP client shared across
+    crawls (CRAWL_HTTP_TIMEOUT, CRAWL_USER_AGENT), the listing rules
+    (CRAWL_LISTING_SELECTOR, CRAWL_ITEM_SELECTOR), CRAWL_STOP_AFTER_KNOWN,
+    the volatile rules (CRAWL_CONTENT_HASH, CRAWL_VOLATILE_*) and, with a
+    browser pool, a renderer (CRAWL_RENDER_TIMEOUT, CRAWL_RENDER_*) retried
+    statically every CRAWL_STATIC_PROBE_INTERVAL crawls.
+    """
+
+    def __init__(
+        self,
+        database: Database,
+        client: httpx.AsyncClient,
+        rules: ListingRules = ListingRules(),
+        render: Renderer | None = None,
+        probe_every: int = DEFAULT_PROBE_EVERY,
+        stop_after_known: int = DEFAULT_STOP_AFTER_KNOWN,
+        volatile: VolatileRules | None = None,
+        writer: DatabaseWriter | None = None,
+    ):
+        self._database = database
+        self._client = client
+        self._rules = rules
+        self._render = render
+        self._probe_every = probe_every
+        self._stop_after_known = stop_after_known
+        self._volatile = volatile
+        self._writer = writer
+
+    @classmethod
+    def from_settings(
+        cls,
+        settings,
+        database: Database,
+        writer: DatabaseWriter | None = None,
+        browser_pool: BrowserPool | None = None,
+        client: httpx.AsyncClient | None = None,
+    ) -> "Crawler":
+        """
+        Create a crawler configured by the CRAWL_* settings.
+
+        Without ``browser_pool`` (CRAWL_BROWSER_POOL_SIZE=0) every crawl is static.
+
+        Raises:
+            ValueError: For an unsupported selector in the settings
+            re.error: For an invalid CRAWL_VOLATILE_PATTERNS entry
+        """
+        return cls(
+            database,
+            client or create_http_client(settings),
+            rules=ListingRules.from_settings(settings),
+            render=browser_pool.renderer(
+                settings.CRAWL_RENDER_TIMEOUT, RenderProfile.from_settings(settings)
+            ) if browser_pool is not None else None,
+            probe_every=settings.CRAWL_STATIC_PROBE_INTERVAL,
+            stop_after_known=settings.CRAWL_STOP_AFTER_KNOWN,
+            volatile=VolatileRules.from_settings(settings),
+            writer=writer,
+        )
+
+    async def crawl(self, schedule_id: int, url: str) -> CrawlResult:
+        """Crawl ``url`` once for a schedule (see ``crawl_page``)."""
+        return await crawl_page(
+            self._database,
+            self._client,
+            schedule_id,
+            url,
+            rules=self._rules,
+            render=self._render,
+            probe_every=self._probe_every,
+            stop_after_known=self._stop_after_known,
+            volatile=self._volatile,
+            writer=self._writer,
+        )
+
+    async def close(self) -> None:
+        """Close the HTTP client."""
+        await self._client.aclose()
@@ -0,0 +1,90 @@
+"""
+Per-day dashboard statistics read from the daily rollups.
+"""
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.rollups import (
+    CRAWL_ROLLUP,
+    NOTIFICATION_ROLLUP,
+    VIDEO_DETECTED,
+    VIDEO_ROLLUP,
+    fetch_daily_stats,
+)
+from app.repositories.crawl_execution_logs import (
+    STATUS_NOT_MODIFIED,
+    STATUS_SUCCESS,
+    STATUS_UNCHANGED,
+)
+from app.repositories.notification_logs import STATUS_FAILED, STATUS_SENT
+
+# Crawls that worked; an unchanged page (304 or same fingerprint) is not a failure
+CRAWL_OK = (STATUS_SUCCESS, STATUS_NOT_MODIFIED, STATUS_UNCHANGED)
+
+
+@dataclass
+class DayStats:
+    """
+    Activity of one day.
+
+    Attributes:
+        day: UTC day
+        videos_detected: New videos stored
+        notifications: Notification count per status
+        crawls: Crawl count per status
+    """
+    day: date
+    videos_detected: int = 0
+    notifications: dict[str, int] = field(default_factory=dict)
+    crawls: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def notification_success_rate(self) -> float | None:
+        """Share of finished notifications that were sent; None if none finished."""
+        sent = self.notifications.get(STATUS_SENT, 0)
+        finished = sent + self.notifications.get(STATUS_FAILED, 0)
+        return sent / finished if finished else None
+
+    @property
+    def crawl_failure_rate(self) -> float | None:
+        """Share of crawls that did not succeed; None if there were none."""
+        total = sum(self.crawls.values())
+        ok = sum(self.crawls.get(status, 0) for status in CRAWL_OK)
+        return (total - ok) / total if total else None
+
+
+async def daily_stats(
+    session: AsyncSession,
+    days: int,
+    today: date,
+    schedule_id: int | None = None,
+) -> list[DayStats]:
+    """
+    Statistics for the last ``days`` days up to ``today``, oldest first.
+
+    Every day in the range is returned, including days without activity.
+
+    Args:
+        session: Read session
+        days: Number of days
+        today: Last day of the range (UTC)
+        schedule_id: Only count this schedule
+    """
+    since = today - timedelta(days=days - 1)
+    videos = await fetch_daily_stats(session, VIDEO_ROLLUP, since, schedule_id)
+    notifications = await fetch_daily_stats(session, NOTIFICATION_ROLLUP, since, schedule_id)
+    crawls = await fetch_daily_stats(session, CRAWL_ROLLUP, since, schedule_id)
+
+    result = []
+    for offset in range(days):
+        day = since + timedelta(days=offset)
+        key = day.isoformat()
+        result.append(DayStats(
+            day=day,
+            videos_detected=videos.get(key, {}).get(VIDEO_DETECTED, 0),
+            notifications=notifications.get(key, {}),
+            crawls=crawls.get(key, {}),
+        ))
+    return result
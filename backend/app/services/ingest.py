@@ -0,0 +1,54 @@
+"""
+Bulk ingest of videos found by a crawl.
+"""
+from dataclasses import dataclass
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.repositories.notification_logs import queue_notifications
+from app.repositories.video_records import ExtractedVideo, InsertedVideo, insert_new_videos
+
+
+@dataclass(frozen=True)
+class IngestResult:
+    """
+    Outcome of ingesting one crawl's videos.
+
+    Attributes:
+        new_videos: Videos that were not known before and have been stored
+        duplicates: Number of candidates skipped as already known
+        notifications_queued: Number of pending notifications created
+    """
+    new_videos: list[InsertedVideo]
+    duplicates: int
+    notifications_queued: int
+
+
+async def ingest_videos(
+    session: AsyncSession,
+    schedule_id: int,
+    videos: list[ExtractedVideo],
+) -> IngestResult:
+    """
+    Store new videos and queue their notifications in one unit of work.
+
+    Deduplication and record inserts happen in multi-row upserts, and the
+    pending notifications in a single executemany. Run it inside one write
+    transaction (``async with database.write() as session``) so the whole
+    crawl costs a single commit instead of one per video.
+
+    Args:
+        session: Write session
+        schedule_id: Schedule that detected the videos
+        videos: Videos extracted from the monitored page
+
+    Returns:
+        IngestResult describing what was stored
+    """
+    new_videos = await insert_new_videos(session, schedule_id, videos)
+    queued = await queue_notifications(session, schedule_id, [v.id for v in new_videos])
+    return IngestResult(
+        new_videos=new_videos,
+        duplicates=len(videos) - len(new_videos),
+        notifications_queued=queued,
+    )
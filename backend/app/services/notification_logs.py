@@ -0,0 +1,62 @@
+"""
+Listing notification logs across the main database and its archives.
+"""
+from pathlib import Path
+
+from app.db import Database
+from app.db.archive import ARCHIVE_ALIAS, list_archives
+from app.repositories.notification_logs import list_notification_logs
+
+
+def _merge(rows: list, limit: int) -> list:
+    """Deduplicate rows by id and keep the first ``limit`` in page order."""
+    unique = list({row.id: row for row in reversed(rows)}.values())
+    unique.sort(key=lambda row: row.id)
+    unique.sort(key=lambda row: row.sent_at, reverse=True)
+    return unique[:limit]
+
+
+async def list_notification_logs_page(
+    db: Database,
+    archive_dir: str | Path,
+    limit: int,
+    after: tuple[str, int] | None = None,
+    schedule_id: int | None = None,
+    status: str | None = None,
+) -> list:
+    """
+    One page of notification logs, newest first, including archived logs.
+
+    The main database is queried first. Monthly archives are only attached,
+    newest first, while they can still contribute rows to the page: each
+    archive only holds logs sent during its month, so once the page is full
+    of rows newer than an archive's month, older archives are skipped.
+
+    Args:
+        db: Application database
+        archive_dir: Directory holding the monthly archive files
+        limit: Maximum number of rows
+        after: (sent_at, id) of the last row of the previous page
+        schedule_id: Only return logs for this schedule
+        status: Only return logs with this status
+
+    Returns:
+        Rows with id, video_id, schedule_id, status, error_details and sent_at
+    """
+    filters = {"schedule_id": schedule_id, "status": status}
+    async with db.read() as session:
+        rows = await list_notification_logs(session, limit, after, **filters)
+
+    for archive in list_archives(archive_dir):
+        if after is not None and archive.starts_at > after[0]:
+            # Everything in this archive is newer than the previous page
+            continue
+        if len(rows) >= limit and rows[limit - 1].sent_at >= archive.ends_at:
+            break
+        async with db.read(attach={ARCHIVE_ALIAS: archive.uri}) as session:
+            archived = await list_notification_logs(
+                session, limit, after, schema=ARCHIVE_ALIAS, **filters
+            )
+        rows = _merge([*rows, *archived], limit)
+
+    return rows
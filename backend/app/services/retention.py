@@ -0,0 +1,184 @@
+"""
+Retention for crawl_execution_logs.
+
+The scheduler adds a log row every ``SCHEDULER_INTERVAL`` seconds per
+schedule, so old rows are purged continuously instead of with one large
+``DELETE`` that would hold the write lock for seconds. The job walks each
+schedule's logs through the ``(schedule_id, started_at DESC)`` index, oldest
+candidates last, and deletes expired rows in small batches, each in its own
+short write transaction, yielding to the event loop between batches.
+"""
+import asyncio
+import logging
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from app.core.config import SettingsRegistry
+from app.core.timestamps import format_timestamp
+from app.db import Database, DatabaseWriter
+from app.repositories.crawl_execution_logs import (
+    delete_logs,
+    list_old_logs,
+    next_logged_schedule,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_BATCH_PAUSE = 0.05
+# How often run_retention checks whether a disabled job was re-enabled
+DISABLED_POLL_INTERVAL = 60
+
+# Larger than any rowid, so a keyset starting at (horizon, MAX_ROWID) only
+# returns rows started strictly before the horizon
+MAX_ROWID = 2 ** 63 - 1
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """
+    How long crawl logs are kept.
+
+    Attributes:
+        keep_days: Days to keep logs, per status
+        default_days: Days to keep logs whose status is not in ``keep_days``
+    """
+    keep_days: Mapping[str, int]
+    default_days: int
+
+    def cutoffs(self, now: datetime) -> tuple[dict[str, str], str]:
+        """
+        Timestamps before which logs expire.
+
+        Returns:
+            ({status: cutoff}, cutoff for other statuses)
+        """
+        return (
+            {
+                status: format_timestamp(now - timedelta(days=days))
+                for status, days in self.keep_days.items()
+            },
+            format_timestamp(now - timedelta(days=self.default_days)),
+        )
+
+
+@dataclass
+class RetentionProgress:
+    """
+    Running totals of a retention pass.
+
+    Attributes:
+        schedules: Schedules visited so far
+        scanned: Log rows read past the newest cutoff
+        deleted: Log rows deleted
+        batches: Batches processed
+    """
+    schedules: int = 0
+    scanned: int = 0
+    deleted: int = 0
+    batches: int = 0
+
+
+async def purge_crawl_execution_logs(
+    db: Database,
+    policy: RetentionPolicy,
+    now: datetime | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    batch_pause: float = DEFAULT_BATCH_PAUSE,
+    on_progress: Callable[[RetentionProgress], None] | None = None,
+    writer: DatabaseWriter | None = None,
+) -> RetentionProgress:
+    """
+    Delete crawl execution logs that are past their retention.
+
+    Only rows older than the shortest retention period are read; each batch
+    is classified by status and the expired rowids deleted in one short write
+    transaction.
+
+    Args:
+        db: Application database
+        policy: Retention periods per status
+        now: Reference time (UTC), defaults to the current time
+        batch_size: Rows read, and at most deleted, per batch
+        batch_pause: Seconds to sleep between batches, letting other writers in
+        on_progress: Called with the running totals after each batch
+        writer: Submit deletes through this writer instead of opening write
+            transactions directly
+
+    Returns:
+        Totals for the pass
+    """
+    now = now or datetime.now(timezone.utc)
+    cutoffs, default_cutoff = policy.cutoffs(now)
+    horizon = max([default_cutoff, *cutoffs.values()])
+    progress = RetentionProgress()
+
+    schedule_id = 0
+    while True:
+        async with db.read() as session:
+            schedule_id = await next_logged_schedule(session, schedule_id)
+        if schedule_id is None:
+            break
+        progress.schedules += 1
+
+        before = (horizon, MAX_ROWID)
+        while True:
+            async with db.read() as session:
+                rows = await list_old_logs(session, schedule_id, before, batch_size)
+            if not rows:
+                break
+            expired = [
+                row.id
+                for row in rows
+                if row.started_at < cutoffs.get(row.status, default_cutoff)
+            ]
+            if expired and writer is not None:
+                progress.deleted += await writer.submit(
+                    lambda session, rowids=expired: delete_logs(session, rowids)
+                )
+            elif expired:
+                async with db.write() as session:
+                    progress.deleted += await delete_logs(session, expired)
+            progress.scanned += len(rows)
+            progress.batches += 1
+            if on_progress is not None:
+                on_progress(progress)
+            before = (rows[-1].started_at, rows[-1].id)
+            await asyncio.sleep(batch_pause)
+
+    logger.info(
+        "Crawl log retention: deleted %d of %d old rows across %d schedules",
+        progress.deleted, progress.scanned, progress.schedules,
+    )
+    return progress
+
+
+async def run_retention(
+    db: Database, writer: DatabaseWriter, registry: SettingsRegistry
+) -> None:
+    """
+    Purge crawl logs every ``CRAWL_LOG_RETENTION_INTERVAL`` seconds until cancelled.
+
+    Policies are read from the current settings before every pass, so changes
+    in ``.env`` apply without a restart.
+    """
+    while True:
+        interval = registry.settings.CRAWL_LOG_RETENTION_INTERVAL
+        await asyncio.sleep(interval if interval > 0 else DISABLED_POLL_INTERVAL)
+        settings = registry.settings
+        if settings.CRAWL_LOG_RETENTION_INTERVAL <= 0:
+            continue
+        policy = RetentionPolicy(
+            keep_days=settings.CRAWL_LOG_RETENTION_DAYS,
+            default_days=settings.CRAWL_LOG_RETENTION_DEFAULT_DAYS,
+        )
+        try:
+            await purge_crawl_execution_logs(
+                db,
+                policy,
+                batch_size=settings.CRAWL_LOG_RETENTION_BATCH_SIZE,
+                writer=writer,
+            )
+        except Exception:
+            logger.exception("Crawl log retention pass failed")
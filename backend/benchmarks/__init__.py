@@ -0,0 +1 @@
+"""Micro-benchmarks for Video Alert backend hot paths."""
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Admin Authentication Benchmark
+
+Measures per-request latency of the get_current_admin dependency against the
+previous implementation (os.getenv + plain string comparison), for accepted
+and rejected tokens and with one or several active tokens.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_admin_auth
+"""
+import asyncio
+import os
+import time
+
+from fastapi import HTTPException
+
+from app.api.deps import get_current_admin
+from app.core.security import admin_token_verifier
+
+ITERATIONS = 100_000
+TOKEN = "a3f1c2e4b5d6978812345678deadbeefcafebabe0123456789abcdef01234567"
+
+
+async def legacy_get_current_admin(x_admin_token: str | None = None) -> bool:
+    """The dependency as it was before the cached verifier."""
+    if not x_admin_token or x_admin_token.strip() == "":
+        raise HTTPException(status_code=401)
+    expected_token = os.getenv("X_ADMIN_TOKEN", "")
+    if x_admin_token != expected_token:
+        raise HTTPException(status_code=401)
+    return True
+
+
+async def measure(dependency, token: str) -> float:
+    """Average latency of one dependency call in microseconds."""
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        try:
+            await dependency(token)
+        except HTTPException:
+            pass
+    return (time.perf_counter() - start) / ITERATIONS * 1e6
+
+
+async def main():
+    os.environ["X_ADMIN_TOKEN"] = TOKEN
+    print(f"{'case':<28} {'legacy (us)':>12} {'verifier (us)':>14}")
+    for active in (1, 10):
+        admin_token_verifier.update([TOKEN, *(f"rotated-{i}" for i in range(active - 1))])
+        for label, token in (("valid", TOKEN), ("invalid", TOKEN[:-1] + "x")):
+            legacy = await measure(legacy_get_current_admin, token)
+            current = await measure(get_current_admin, token)
+            print(f"{f'{label}, {active} active token(s)':<28} {legacy:>12.3f} {current:>14.3f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+CORS Origin Matcher Benchmark
+
+Compares the precompiled OriginMatcher with the original per-request loop
+that rebuilt a regex for every wildcard entry.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_cors_origin_matcher
+"""
+import re
+import timeit
+
+from app.core.cors import OriginMatcher
+
+SIZES = (10, 100, 1000)
+LOOKUPS = 2000
+
+
+def legacy_is_allowed_origin(allow_origins, origin: str) -> bool:
+    """The loop previously used by CustomCORSMiddleware.is_allowed_origin."""
+    for allowed_origin in allow_origins:
+        if allowed_origin == "*":
+            return True
+        if allowed_origin.startswith("https://*."):
+            domain = allowed_origin.replace("https://*.", "")
+            if re.match(rf"^https://.*\.{re.escape(domain)}$", origin):
+                return True
+        elif origin == allowed_origin:
+            return True
+    return False
+
+
+def build_origins(count: int) -> list[str]:
+    """Half exact origins, half wildcard domains."""
+    origins = []
+    for i in range(count):
+        if i % 2:
+            origins.append(f"https://*.tenant{i}.example.dev")
+        else:
+            origins.append(f"http://localhost:{3000 + i}")
+    return origins
+
+
+def build_requests(origins: list[str]) -> list[str]:
+    """A dashboard-like mix: a few hot origins plus some rejected ones."""
+    last_wildcard = next(o for o in reversed(origins) if o.startswith("https://*."))
+    return [
+        origins[0],
+        last_wildcard.replace("*", "app"),
+        "https://evil.example.com",
+        "http://localhost:1",
+    ]
+
+
+def bench(count: int) -> tuple[float, float, float]:
+    origins = build_origins(count)
+    requests = build_requests(origins)
+    matcher = OriginMatcher(origins)
+    uncached = OriginMatcher(origins, cache_size=0)
+
+    def run_legacy():
+        for origin in requests:
+            legacy_is_allowed_origin(origins, origin)
+
+    def run_matcher():
+        for origin in requests:
+            matcher.is_allowed(origin)
+
+    def run_uncached():
+        for origin in requests:
+            uncached.is_allowed(origin)
+
+    for origin in requests:
+        assert matcher.is_allowed(origin) == legacy_is_allowed_origin(origins, origin)
+
+    number = max(1, LOOKUPS // len(requests))
+    per_lookup = number * len(requests)
+    legacy = timeit.timeit(run_legacy, number=number) / per_lookup
+    cached = timeit.timeit(run_matcher, number=number) / per_lookup
+    compiled = timeit.timeit(run_uncached, number=number) / per_lookup
+    return legacy, compiled, cached
+
+
+def main():
+    print(f"{'origins':>8} {'legacy (us)':>12} {'matcher (us)':>13} {'+LRU (us)':>10} {'speedup':>8}")
+    for count in SIZES:
+        legacy, compiled, cached = bench(count)
+        print(
+            f"{count:>8} {legacy * 1e6:>12.2f} {compiled * 1e6:>13.3f} "
+            f"{cached * 1e6:>10.3f} {legacy / cached:>7.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
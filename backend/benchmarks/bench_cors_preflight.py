@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+CORS Preflight Benchmark
+
+Measures OPTIONS preflight throughput through the CORS middleware, calling
+the ASGI app directly so only middleware cost is measured. "before" is
+Starlette's CORSMiddleware with the original per-request origin loop,
+"after" is CustomCORSMiddleware with its preflight cache.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_cors_preflight
+"""
+import asyncio
+import time
+
+from fastapi.middleware.cors import CORSMiddleware
+
+from app.core.config import settings
+from app.core.cors import CustomCORSMiddleware
+from benchmarks.bench_cors_origin_matcher import legacy_is_allowed_origin
+
+REQUESTS = 20000
+CORS_OPTIONS = dict(
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+
+class LegacyCORSMiddleware(CORSMiddleware):
+    def is_allowed_origin(self, origin: str) -> bool:
+        return legacy_is_allowed_origin(self.allow_origins, origin)
+
+
+async def endpoint(scope, receive, send):
+    raise AssertionError("preflight requests must not reach the app")
+
+
+async def receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message):
+    pass
+
+
+def preflight_scope(origin: str, method: str, request_headers: str) -> dict:
+    return {
+        "type": "http",
+        "method": "OPTIONS",
+        "path": "/api/v1/admin/system-variables",
+        "headers": [
+            (b"origin", origin.encode()),
+            (b"access-control-request-method", method.encode()),
+            (b"access-control-request-headers", request_headers.encode()),
+        ],
+    }
+
+
+async def measure(middleware) -> float:
+    scopes = [
+        preflight_scope("http://localhost:3000", "GET", "x-admin-token"),
+        preflight_scope("https://dash.replit.dev", "GET", "x-admin-token"),
+        preflight_scope("http://localhost:3000", "DELETE", "x-admin-token, content-type"),
+    ]
+    start = time.perf_counter()
+    for i in range(REQUESTS):
+        await middleware(scopes[i % len(scopes)], receive, send)
+    return REQUESTS / (time.perf_counter() - start)
+
+
+async def main():
+    origins = settings.ALLOWED_ORIGINS
+    before = await measure(LegacyCORSMiddleware(endpoint, allow_origins=origins, **CORS_OPTIONS))
+    after = await measure(CustomCORSMiddleware(endpoint, allow_origins=origins, **CORS_OPTIONS))
+    print(f"{'variant':>8} {'preflight req/s':>16}")
+    print(f"{'before':>8} {before:>16,.0f}")
+    print(f"{'after':>8} {after:>16,.0f}")
+    print(f"speedup: {after / before:.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Database Benchmark Harness
+
+Generates a synthetic dataset (see benchmarks/dataset.py) and times the
+application's own queries against it: video listing and search, URL
+deduplication, notification log pages, table and daily statistics, and one
+crawl log retention pass. Results are written as a JSON report; pass the
+report of another commit as --baseline to compare.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_database [--scale small|medium|large] [--runs 50]
+        [--output report.json] [--baseline previous.json] [--db path/to/keep.db]
+"""
+import argparse
+import asyncio
+import json
+import platform
+import sqlite3
+import statistics
+import subprocess
+import tempfile
+import time
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timezone
+from pathlib import Path
+
+from app.core.config import settings
+from app.db import Database
+from app.db.stats import fetch_table_stats
+from app.repositories.video_records import ExtractedVideo, insert_new_videos, list_videos, search_videos
+from app.services.dashboard import daily_stats
+from app.services.notification_logs import list_notification_logs_page
+from app.services.retention import RetentionPolicy, purge_crawl_execution_logs
+from benchmarks.dataset import DATASET_END, add_spec_arguments, create_dataset, spec_from_args, video_url
+
+PAGE_SIZE = 20
+DEEP_PAGES = 50
+RETENTION_POLICY = RetentionPolicy(keep_days={"success": 30, "failed": 90}, default_days=30)
+
+
+def git_revision() -> str | None:
+    """Current commit, with a ``-dirty`` suffix for uncommitted changes."""
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def summarize(samples: list[float]) -> dict:
+    """Latency percentiles in milliseconds."""
+    ordered = sorted(s * 1000 for s in samples)
+    return {
+        "runs": len(ordered),
+        "p50_ms": round(statistics.median(ordered), 3),
+        "p95_ms": round(ordered[max(0, int(len(ordered) * 0.95) - 1)], 3),
+        "mean_ms": round(statistics.fmean(ordered), 3),
+        "max_ms": round(ordered[-1], 3),
+    }
+
+
+async def timed(runs: int, operation: Callable[[], Awaitable]) -> dict:
+    """Run ``operation`` ``runs`` times after one warm-up run."""
+    await operation()
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        await operation()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+async def deep_cursor(database: Database, pages: int) -> tuple[str, int]:
+    """Keyset of the last row ``pages`` pages into the video list."""
+    after = None
+    async with database.read() as session:
+        for _ in range(pages):
+            rows = await list_videos(session, PAGE_SIZE, after=after)
+            after = (rows[-1].detected_at, rows[-1].id)
+    return after
+
+
+async def run_benchmarks(database: Database, archive_dir: Path, spec, runs: int) -> dict:
+    results = {}
+
+    async def read(query):
+        async with database.read() as session:
+            return await query(session)
+
+    async def case(name, operation):
+        results[name] = await timed(runs, operation)
+        print(f"  {name:<28} p50 {results[name]['p50_ms']:>9.3f} ms   "
+              f"p95 {results[name]['p95_ms']:>9.3f} ms")
+
+    await case("videos.first_page", lambda: read(lambda s: list_videos(s, PAGE_SIZE)))
+    after = await deep_cursor(database, DEEP_PAGES)
+    await case("videos.deep_page", lambda: read(lambda s: list_videos(s, PAGE_SIZE, after=after)))
+    # Schedule 1 is the busiest, the last one among the quietest
+    await case("videos.busy_schedule", lambda: read(lambda s: list_videos(s, PAGE_SIZE, schedule_id=1)))
+    await case("videos.quiet_schedule",
+               lambda: read(lambda s: list_videos(s, PAGE_SIZE, schedule_id=spec.schedules)))
+
+    await case("search.common_word", lambda: read(lambda s: search_videos(s, "music", PAGE_SIZE)))
+    await case("search.prefix", lambda: read(lambda s: search_videos(s, "mus", PAGE_SIZE)))
+    await case("search.rare_word", lambda: read(lambda s: search_videos(s, "topic2500", PAGE_SIZE)))
+    await case("search.two_words", lambda: read(lambda s: search_videos(s, "live music", PAGE_SIZE)))
+
+    # A crawled page whose videos are all known, under other URL spellings
+    known = [ExtractedVideo(f"Video {n}", f"{video_url(n)}/?utm_source=bench")
+             for n in range(1, min(spec.videos, 30) + 1)]
+
+    async def dedupe():
+        async with database.write() as session:
+            assert not await insert_new_videos(session, 1, known)
+
+    await case("ingest.dedupe_known_page", dedupe)
+
+    await case("notifications.first_page",
+               lambda: list_notification_logs_page(database, archive_dir, 50))
+    await case("notifications.failed_page",
+               lambda: list_notification_logs_page(database, archive_dir, 50, status="failed"))
+    await case("notifications.schedule_page",
+               lambda: list_notification_logs_page(database, archive_dir, 50, schedule_id=1))
+
+    today = DATASET_END.date()
+    await case("stats.tables", lambda: read(fetch_table_stats))
+    await case("stats.daily_30d", lambda: read(lambda s: daily_stats(s, 30, today)))
+    await case("stats.daily_365d", lambda: read(lambda s: daily_stats(s, 365, today)))
+    await case("stats.daily_30d_schedule",
+               lambda: read(lambda s: daily_stats(s, 30, today, schedule_id=1)))
+
+    # Destructive, so it runs once and last
+    start = time.perf_counter()
+    progress = await purge_crawl_execution_logs(
+        database, RETENTION_POLICY, now=DATASET_END, batch_pause=0
+    )
+    results["retention.purge"] = {
+        "runs": 1,
+        "seconds": round(time.perf_counter() - start, 3),
+        "scanned": progress.scanned,
+        "deleted": progress.deleted,
+        "batches": progress.batches,
+    }
+    print(f"  {'retention.purge':<28} {results['retention.purge']['seconds']:>12.3f} s    "
+          f"deleted {progress.deleted:,} of {progress.scanned:,} scanned")
+    return results
+
+
+def compare(report: dict, baseline: dict) -> None:
+    """Print each case's latency against a previous report."""
+    print(f"\nvs. {baseline.get('revision') or 'baseline'}")
+    print(f"{'case':<30} {'before':>10} {'after':>10} {'ratio':>7}")
+    for name, result in report["results"].items():
+        old = baseline.get("results", {}).get(name)
+        if old is None:
+            continue
+        metric = "p50_ms" if "p50_ms" in result else "seconds"
+        before, after = old.get(metric), result[metric]
+        if before:
+            print(f"{name:<30} {before:>10.3f} {after:>10.3f} {after / before:>7.2f}")
+
+
+async def main(args: argparse.Namespace) -> None:
+    spec = spec_from_args(args)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.db or Path(tmp) / "bench.db"
+        if path.exists():
+            raise SystemExit(f"{path} already exists")
+        print(f"Generating {args.scale} dataset: {spec}")
+        dataset = create_dataset(path, spec)
+        print(f"✓ {dataset['size_bytes'] / 2**20:,.1f} MiB in {dataset['generate_seconds']}s")
+
+        database = Database(f"sqlite:///{path}", settings)
+        try:
+            results = await run_benchmarks(database, Path(tmp) / "archive", spec, args.runs)
+        finally:
+            await database.dispose()
+
+    report = {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "scale": args.scale,
+        "dataset": dataset,
+        "results": results,
+    }
+    args.output.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"✓ Report written to {args.output}")
+    if args.baseline:
+        compare(report, json.loads(args.baseline.read_text()))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    add_spec_arguments(parser)
+    parser.add_argument("--runs", type=int, default=50, help="timed runs per query")
+    parser.add_argument("--output", type=Path, default=Path("bench_database.json"))
+    parser.add_argument("--baseline", type=Path, help="report to compare against")
+    parser.add_argument("--db", type=Path, help="keep the generated database at this path")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Listing Extraction Benchmark
+
+Serves a large listing page (5,000 videos, newest first, followed by a heavy
+footer) in 16 KiB chunks with a simulated download delay. "before" reads the
+whole body and then parses it; "after" feeds chunks to the streaming
+extractor and stops at the first known video, which here is the 21st.
+Reports time to first item, total time, bytes read and peak traced memory.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_extract [--items 5000] [--new 20] [--runs 5]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import tracemalloc
+
+import httpx
+
+from app.crawler.extract import ListingExtractor, ListingRules, SimpleSelector, extract_listing
+from app.crawler.fetch import stream_page
+
+URL = "https://videos.example.com/latest"
+CHUNK_BYTES = 16 * 1024
+# Per-chunk delay: 16 KiB every 2 ms is roughly 64 Mbit/s
+CHUNK_DELAY = 0.002
+RULES = ListingRules(SimpleSelector.parse("ul#videos"), SimpleSelector.parse("li.video"))
+
+
+def build_page(items: int) -> bytes:
+    videos = "".join(
+        f'<li class="video"><a href="/watch/{i}" title="Video {i}">'
+        f'<img src="/thumb/{i}.jpg" alt="Video {i}"><span>Video {i}</span></a>'
+        f'<p class="meta">Uploaded {i} minutes ago by channel {i % 97}</p></li>'
+        for i in range(items)
+    )
+    footer = "".join(f'<div class="related"><a href="/more/{i}">More {i}</a></div>' for i in range(items))
+    return (
+        f'<html><head><title>Latest</title></head><body>'
+        f'<ul id="videos">{videos}</ul><footer>{footer}</footer></body></html>'
+    ).encode()
+
+
+def transport(page: bytes, served: list[int]) -> httpx.MockTransport:
+    async def body():
+        for start in range(0, len(page), CHUNK_BYTES):
+            await asyncio.sleep(CHUNK_DELAY)
+            served[0] += min(CHUNK_BYTES, len(page) - start)
+            yield page[start:start + CHUNK_BYTES]
+
+    return httpx.MockTransport(lambda request: httpx.Response(200, content=body()))
+
+
+async def read_then_parse(client: httpx.AsyncClient, known: set[str]) -> tuple[float, int]:
+    """Download the page, then extract it; returns time to first item and new videos."""
+    start = time.perf_counter()
+    response = await client.get(URL)
+    videos = extract_listing(response.text, RULES, URL)
+    first_item = time.perf_counter() - start
+    new = 0
+    for video in videos:
+        if video.url in known:
+            break
+        new += 1
+    return first_item, new
+
+
+async def stream_and_stop(client: httpx.AsyncClient, known: set[str]) -> tuple[float, int]:
+    """Extract while downloading and stop at the first known video."""
+    start = time.perf_counter()
+    extractor = ListingExtractor(RULES, URL)
+    first_item = None
+    new = 0
+
+    async def consume(chunk: str) -> bool:
+        nonlocal first_item, new
+        for video in extractor.feed(chunk):
+            if first_item is None:
+                first_item = time.perf_counter() - start
+            if video.url in known:
+                return True
+            new += 1
+        return extractor.done
+
+    await stream_page(client, URL, None, consume)
+    return first_item, new
+
+
+async def run(read, page: bytes, known: set[str], runs: int) -> dict:
+    first_items, totals, served_bytes, peaks = [], [], [], []
+    for _ in range(runs):
+        served = [0]
+        async with httpx.AsyncClient(transport=transport(page, served)) as client:
+            tracemalloc.start()
+            start = time.perf_counter()
+            first_item, new = await read(client, known)
+            totals.append(time.perf_counter() - start)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+        first_items.append(first_item)
+        served_bytes.append(served[0])
+    return {
+        "first_ms": statistics.median(first_items) * 1000,
+        "total_ms": statistics.median(totals) * 1000,
+        "kib": statistics.median(served_bytes) / 1024,
+        "peak_kib": statistics.median(peaks) / 1024,
+        "new": new,
+    }
+
+
+async def main(items: int, new: int, runs: int):
+    page = build_page(items)
+    known = {f"https://videos.example.com/watch/{i}" for i in range(new, items)}
+    print(f"{items} videos, {new} new, {len(page) / 1024:,.0f} KiB page, median of {runs} runs")
+    print(f"{'variant':<8} {'first ms':>9} {'total ms':>9} {'KiB read':>9} {'peak KiB':>9} {'new':>5}")
+    results = {}
+    for name, read in (("before", read_then_parse), ("after", stream_and_stop)):
+        r = results[name] = await run(read, page, known, runs)
+        print(f"{name:<8} {r['first_ms']:>9.1f} {r['total_ms']:>9.1f} "
+              f"{r['kib']:>9,.0f} {r['peak_kib']:>9,.0f} {r['new']:>5}")
+    before, after = results["before"], results["after"]
+    print(f"time to first item: {before['first_ms'] / after['first_ms']:.1f}x faster, "
+          f"peak memory: {1 - after['peak_kib'] / before['peak_kib']:.0%} less")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--new", type=int, default=20)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.items, args.new, args.runs))
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Bulk Ingest Benchmark
+
+Ingests 10,000 extracted videos into a fresh database twice: once with a
+lookup, insert and commit per video (the naive crawler loop), and once
+through ingest_videos in a single transaction.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_ingest [--items 10000]
+"""
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.ids import new_uuid
+from app.core.urls import url_hash
+from app.db import Database
+from app.db.migrations import migrate_database
+from app.repositories.notification_logs import INSERT_NOTIFICATION_SQL, STATUS_PENDING
+from app.repositories.video_records import ExtractedVideo
+from app.services.ingest import ingest_videos
+
+SCHEDULE_ID = 1
+
+
+async def open_database(path: Path) -> Database:
+    migrate_database(path)
+    database = Database(f"sqlite:///{path}", settings)
+    async with database.write() as session:
+        await session.execute(text(
+            "INSERT INTO crawl_schedules (id, uuid, url, interval) "
+            "VALUES (:id, :uuid, 'https://e.com', 5)"
+        ), {"id": SCHEDULE_ID, "uuid": new_uuid()})
+    return database
+
+
+async def ingest_per_row(database: Database, videos: list[ExtractedVideo]) -> None:
+    """One dedup lookup, insert and commit per video."""
+    for video in videos:
+        hashed = url_hash(video.url)
+        async with database.write() as session:
+            known = await session.execute(
+                text("SELECT 1 FROM video_records WHERE url_hash = :h"), {"h": hashed}
+            )
+            if known.first() is not None:
+                continue
+            inserted = await session.execute(text(
+                "INSERT INTO video_records (uuid, title, url, url_hash, thumbnail, description, schedule_id) "
+                "VALUES (:uuid, :title, :url, :h, :thumbnail, :description, :schedule_id) "
+                "RETURNING id"
+            ), {
+                "uuid": new_uuid(), "title": video.title, "url": video.url, "h": hashed,
+                "thumbnail": video.thumbnail, "description": video.description,
+                "schedule_id": SCHEDULE_ID,
+            })
+            await session.execute(text(INSERT_NOTIFICATION_SQL), {
+                "uuid": new_uuid(), "video_id": inserted.scalar_one(),
+                "schedule_id": SCHEDULE_ID, "status": STATUS_PENDING,
+            })
+
+
+async def ingest_bulk(database: Database, videos: list[ExtractedVideo]) -> None:
+    async with database.write() as session:
+        await ingest_videos(session, SCHEDULE_ID, videos)
+
+
+async def run(variant, videos: list[ExtractedVideo]) -> float:
+    with tempfile.TemporaryDirectory() as tmp:
+        database = await open_database(Path(tmp) / "bench.db")
+        try:
+            start = time.perf_counter()
+            await variant(database, videos)
+            return time.perf_counter() - start
+        finally:
+            await database.dispose()
+
+
+async def main(items: int):
+    videos = [
+        ExtractedVideo(
+            title=f"Video {i}",
+            url=f"https://example.com/watch/{i}",
+            thumbnail=f"https://example.com/thumbs/{i}.jpg",
+            description="Lorem ipsum dolor sit amet " * 4,
+        )
+        for i in range(items)
+    ]
+    per_row = await run(ingest_per_row, videos)
+    bulk = await run(ingest_bulk, videos)
+    print(f"{'variant':<10} {'seconds':>8} {'items/s':>10}")
+    print(f"{'per-row':<10} {per_row:>8.2f} {items / per_row:>10,.0f}")
+    print(f"{'bulk':<10} {bulk:>8.2f} {items / bulk:>10,.0f}")
+    print(f"speedup: {per_row / bulk:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=10_000)
+    asyncio.run(main(parser.parse_args().items))
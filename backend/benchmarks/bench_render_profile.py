@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Render Profile Benchmark
+
+Renders a local fixture page shaped like a video listing through the browser
+pool: the listing is built by JavaScript from an XHR, surrounded by
+thumbnails, a web font, a video stream and an ad script that keeps polling
+its beacon. "before" renders with no blocking and waits for network idle,
+"after" uses the render profile (heavy resource types and the ad domain
+aborted) and waits for the first listing item. Reports render time, bytes
+served and requests per render.
+
+Requires Playwright with Chromium (python -m playwright install chromium).
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_render_profile [--runs 5]
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.crawler.browser import DEFAULT_BLOCKED_DOMAINS, NO_BLOCKING, RenderProfile
+from app.crawler.pool import BrowserPool
+
+VIDEOS = 30
+THUMBNAIL_BYTES = 60 * 1024
+FONT_BYTES = 120 * 1024
+STREAM_BYTES = 4 * 1024 * 1024
+TIMEOUT = 30
+
+# The page is served from 127.0.0.1 and the "ad network" from localhost, so
+# the two are different hosts to the browser
+AD_HOST = "localhost"
+
+
+def listing_page(port: int) -> str:
+    ads = f"http://{AD_HOST}:{port}"
+    thumbnails = "".join(f'<img src="/promo/{i}.jpg">' for i in range(10))
+    return f"""<!doctype html>
+<html><head>
+<style>@font-face {{ font-family: Brand; src: url(/brand.woff2); }} body {{ font-family: Brand; }}</style>
+<script async src="{ads}/ads/tag.js"></script>
+</head><body>
+<header>{thumbnails}</header>
+<video autoplay muted src="/stream.mp4"></video>
+<ul id="videos"></ul>
+<script src="/app.js"></script>
+</body></html>"""
+
+
+APP_JS = """
+fetch('/api/videos').then(r => r.json()).then(videos => {
+  document.getElementById('videos').innerHTML = videos.map(v =>
+    `<li class="video"><a href="${v.url}"><img src="${v.thumbnail}">${v.title}</a></li>`
+  ).join('');
+});
+"""
+
+# Polls a beacon for a few seconds, which keeps the network from going idle
+AD_TAG_JS = """
+let beacons = 0;
+const timer = setInterval(() => {
+  fetch('/ads/beacon?n=' + beacons).catch(() => {});
+  if (++beacons >= 8) clearInterval(timer);
+}, 300);
+document.write('<img src="/ads/banner.jpg">');
+"""
+
+
+class FixtureServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), FixtureHandler)
+        self.bytes_sent = 0
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    def reset(self):
+        with self.lock:
+            self.bytes_sent = self.requests = 0
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    server: FixtureServer
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        port = self.server.server_address[1]
+        if path == "/":
+            self._send(listing_page(port).encode(), "text/html")
+        elif path == "/app.js":
+            self._send(APP_JS.encode(), "application/javascript")
+        elif path == "/api/videos":
+            time.sleep(0.05)
+            videos = [
+                {"title": f"Video {i}", "url": f"/watch/{i}", "thumbnail": f"/thumb/{i}.jpg"}
+                for i in range(VIDEOS)
+            ]
+            self._send(json.dumps(videos).encode(), "application/json")
+        elif path.endswith(".jpg"):
+            time.sleep(0.02)
+            self._send(b"\xff" * THUMBNAIL_BYTES, "image/jpeg")
+        elif path == "/brand.woff2":
+            time.sleep(0.1)
+            self._send(b"\0" * FONT_BYTES, "font/woff2")
+        elif path == "/stream.mp4":
+            self._send(b"\0" * STREAM_BYTES, "video/mp4", chunk_delay=0.01)
+        elif path == "/ads/tag.js":
+            time.sleep(0.2)
+            self._send(AD_TAG_JS.encode(), "application/javascript")
+        elif path == "/ads/beacon":
+            self._send(b"ok", "text/plain")
+        else:
+            self.send_error(404)
+
+    def _send(self, body: bytes, content_type: str, chunk_delay: float = 0.0):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        sent = 0
+        try:
+            for start in range(0, len(body), 64 * 1024):
+                self.wfile.write(body[start:start + 64 * 1024])
+                sent += min(64 * 1024, len(body) - start)
+                if chunk_delay:
+                    time.sleep(chunk_delay)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the browser aborted the download
+        with self.server.lock:
+            self.server.bytes_sent += sent
+            self.server.requests += 1
+
+
+async def run(pool: BrowserPool, server: FixtureServer, url: str, profile: RenderProfile, runs: int):
+    render = pool.renderer(TIMEOUT, profile)
+    await render(url)  # warm-up
+    await asyncio.sleep(1)
+    times, sizes, requests = [], [], []
+    for _ in range(runs):
+        server.reset()
+        start = time.perf_counter()
+        html = await render(url)
+        times.append(time.perf_counter() - start)
+        assert html.count('class="video"') == VIDEOS, "listing was not rendered"
+        # Let aborted or trailing downloads settle before reading the counters
+        await asyncio.sleep(1)
+        sizes.append(server.bytes_sent)
+        requests.append(server.requests)
+    return {
+        "render_ms": statistics.median(times) * 1000,
+        "kib": statistics.median(sizes) / 1024,
+        "requests": statistics.median(requests),
+    }
+
+
+async def main(runs: int):
+    server = FixtureServer()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+    variants = {
+        "before": NO_BLOCKING,
+        "after": RenderProfile(
+            blocked_domains=DEFAULT_BLOCKED_DOMAINS + (AD_HOST,),
+            item_selector="li.video",
+        ),
+    }
+    pool = BrowserPool(size=1)
+    await pool.start()
+    try:
+        print(f"{runs} renders of a {VIDEOS}-video fixture page per variant")
+        print(f"{'variant':<8} {'render ms':>10} {'KiB served':>11} {'requests':>9}")
+        results = {}
+        for name, profile in variants.items():
+            r = results[name] = await run(pool, server, url, profile, runs)
+            print(f"{name:<8} {r['render_ms']:>10.0f} {r['kib']:>11,.0f} {r['requests']:>9.0f}")
+    finally:
+        await pool.stop()
+        server.shutdown()
+    before, after = results["before"], results["after"]
+    print(f"render time: {before['render_ms'] / after['render_ms']:.1f}x faster, "
+          f"bytes: {1 - after['kib'] / before['kib']:.0%} less")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.runs))
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Integer Key Benchmark
+
+Builds a synthetic database with the TEXT UUID primary keys of schema
+version 5, measures its size and a few lookups and joins, then migrates it
+to INTEGER rowid keys with UUID BLOB side columns and measures again.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_uuid_keys [--videos 50000] [--crawls 100000]
+"""
+import argparse
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+from app.db.migrations import MIGRATIONS, connect, run_migrations
+
+SCHEDULES = 50
+LOOKUPS = 2000
+JOIN_PAGES = 200
+
+# The same statements run against both schemas; only the key types differ
+JOIN_SQL = """
+    SELECT n.status, v.title, s.url
+    FROM notification_logs AS n
+    JOIN video_records AS v ON v.id = n.video_id
+    JOIN crawl_schedules AS s ON s.id = n.schedule_id
+    ORDER BY n.sent_at DESC, n.id
+    LIMIT 100 OFFSET ?
+"""
+SCHEDULE_VIDEOS_SQL = "SELECT COUNT(*) FROM video_records WHERE schedule_id = ?"
+
+
+def seed_legacy(conn: sqlite3.Connection, videos: int, crawls: int) -> None:
+    """Fill a schema version 5 database with TEXT UUID keyed rows."""
+    run_migrations(conn, [m for m in MIGRATIONS if m.version <= 5])
+    schedules = [str(uuid.uuid4()) for _ in range(SCHEDULES)]
+    video_ids = [str(uuid.uuid4()) for _ in range(videos)]
+
+    conn.execute("BEGIN")
+    conn.executemany(
+        "INSERT INTO crawl_schedules (id, url, interval) VALUES (?, ?, 5)",
+        [(s, f"https://example.com/channel/{i}") for i, s in enumerate(schedules)],
+    )
+    conn.executemany(
+        "INSERT INTO video_records (id, title, url, url_hash, description, detected_at, schedule_id) "
+        "VALUES (?, ?, ?, ?, ?, datetime('2024-01-01', ? || ' minutes'), ?)",
+        [
+            (v, f"Video {i}", f"https://example.com/watch/{i}", i, "Lorem ipsum " * 8, i,
+             schedules[i % SCHEDULES])
+            for i, v in enumerate(video_ids)
+        ],
+    )
+    conn.executemany(
+        "INSERT INTO notification_logs (id, video_id, schedule_id, status, sent_at) "
+        "VALUES (?, ?, ?, 'sent', datetime('2024-01-01', ? || ' minutes'))",
+        [(str(uuid.uuid4()), v, schedules[i % SCHEDULES], i) for i, v in enumerate(video_ids)],
+    )
+    conn.executemany(
+        "INSERT INTO crawl_execution_logs (id, schedule_id, started_at, status) "
+        "VALUES (?, ?, datetime('2024-01-01', ? || ' minutes'), 'success')",
+        [(str(uuid.uuid4()), schedules[i % SCHEDULES], i) for i in range(crawls)],
+    )
+    conn.execute("COMMIT")
+
+
+def sizes(conn: sqlite3.Connection) -> dict[str, int]:
+    """Bytes used per table, including its indexes, and in total."""
+    conn.execute("VACUUM")
+    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+    result = {"total": page_size * page_count}
+    try:
+        rows = conn.execute(
+            "SELECT coalesce(m.tbl_name, d.name), SUM(d.pgsize) FROM dbstat AS d "
+            "LEFT JOIN sqlite_master AS m ON m.name = d.name GROUP BY 1"
+        ).fetchall()
+    except sqlite3.OperationalError:
+        # SQLite built without the dbstat virtual table
+        return result
+    result.update(rows)
+    return result
+
+
+def timed(conn: sqlite3.Connection, sql: str, params: list[tuple]) -> float:
+    """Median milliseconds per execution of ``sql`` over ``params``."""
+    samples = []
+    for args in params:
+        start = time.perf_counter()
+        conn.execute(sql, args).fetchall()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def latencies(conn: sqlite3.Connection, key: str) -> dict[str, float]:
+    """Lookup and join latencies; ``key`` is the column holding the public id."""
+    public_ids = [row[0] for row in conn.execute(f"SELECT {key} FROM video_records")]
+    row_keys = [row[0] for row in conn.execute("SELECT id FROM video_records")]
+    schedule_keys = [row[0] for row in conn.execute("SELECT id FROM crawl_schedules")]
+    sample = random.Random(0)
+    return {
+        "video by public id": timed(
+            conn, f"SELECT title FROM video_records WHERE {key} = ?",
+            [(sample.choice(public_ids),) for _ in range(LOOKUPS)],
+        ),
+        "video by key": timed(
+            conn, "SELECT title FROM video_records WHERE id = ?",
+            [(sample.choice(row_keys),) for _ in range(LOOKUPS)],
+        ),
+        "videos per schedule": timed(
+            conn, SCHEDULE_VIDEOS_SQL, [(sample.choice(schedule_keys),) for _ in range(LOOKUPS)],
+        ),
+        "log page join": timed(
+            conn, JOIN_SQL,
+            [(sample.randrange(0, len(row_keys) - 100),) for _ in range(JOIN_PAGES)],
+        ),
+    }
+
+
+def main(videos: int, crawls: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = connect(Path(tmp) / "bench.db")
+        try:
+            seed_legacy(conn, videos, crawls)
+            before = sizes(conn), latencies(conn, "id")
+
+            start = time.perf_counter()
+            run_migrations(conn, batch_pause=0)
+            migration_seconds = time.perf_counter() - start
+            after = sizes(conn), latencies(conn, "uuid")
+        finally:
+            conn.close()
+
+    print(f"{SCHEDULES} schedules, {videos:,} videos and notifications, {crawls:,} crawl logs")
+    print(f"migration to integer keys: {migration_seconds:.2f}s")
+    print(f"{'size (KiB)':<24} {'text ids':>10} {'int ids':>10} {'ratio':>7}")
+    for name in sorted(before[0], key=lambda n: (n == "total", n)):
+        if name.startswith("sqlite_") or name not in after[0]:
+            continue
+        old, new = before[0][name] / 1024, after[0][name] / 1024
+        print(f"{name:<24} {old:>10,.0f} {new:>10,.0f} {new / old:>7.2f}")
+    print(f"{'median latency (ms)':<24} {'text ids':>10} {'int ids':>10} {'ratio':>7}")
+    for name, old in before[1].items():
+        new = after[1][name]
+        print(f"{name:<24} {old:>10.4f} {new:>10.4f} {new / old:>7.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--videos", type=int, default=50_000)
+    parser.add_argument("--crawls", type=int, default=100_000)
+    args = parser.parse_args()
+    main(args.videos, args.crawls)
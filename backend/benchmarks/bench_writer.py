@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Database Writer Benchmark
+
+Runs a mixed write load against a fresh database: crawler tasks ingesting
+small batches of new videos, and notifier tasks marking notifications as
+sent one at a time. "direct" gives every write its own transaction on the
+writer connection; "actor" submits the same writes to DatabaseWriter, which
+groups them into shared transactions.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_writer [--crawlers 4] [--notifiers 16] [--ops 200]
+"""
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.ids import new_uuid
+from app.db import Database, DatabaseWriter
+from app.db.migrations import migrate_database
+from app.repositories.notification_logs import STATUS_SENT, update_notification_status
+from app.repositories.video_records import ExtractedVideo
+from app.services.ingest import ingest_videos
+
+SCHEDULE_ID = 1
+VIDEOS_PER_CRAWL = 5
+
+
+async def open_database(path: Path) -> Database:
+    migrate_database(path)
+    database = Database(f"sqlite:///{path}", settings)
+    async with database.write() as session:
+        await session.execute(text(
+            "INSERT INTO crawl_schedules (id, uuid, url, interval) "
+            "VALUES (:id, :uuid, 'https://e.com', 5)"
+        ), {"id": SCHEDULE_ID, "uuid": new_uuid()})
+    return database
+
+
+def crawl_commands(crawler: int, ops: int):
+    """Write commands for one crawler: each ingests a few new videos."""
+    for op in range(ops):
+        videos = [
+            ExtractedVideo(title=f"Video {crawler}-{op}-{i}",
+                           url=f"https://example.com/{crawler}/{op}/{i}")
+            for i in range(VIDEOS_PER_CRAWL)
+        ]
+        yield lambda session, videos=videos: ingest_videos(session, SCHEDULE_ID, videos)
+
+
+async def pending_notification_ids(database: Database, count: int) -> list[int]:
+    """Queue ``count`` notifications for the notifiers to mark as sent."""
+    videos = [ExtractedVideo(title=f"Seed {i}", url=f"https://example.com/seed/{i}")
+              for i in range(count)]
+    async with database.write() as session:
+        await ingest_videos(session, SCHEDULE_ID, videos)
+    async with database.read() as session:
+        result = await session.execute(text("SELECT id FROM notification_logs"))
+        return [row[0] for row in result]
+
+
+async def run(variant: str, crawlers: int, notifiers: int, ops: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        database = await open_database(Path(tmp) / "bench.db")
+        log_ids = await pending_notification_ids(database, notifiers * ops)
+        writer = DatabaseWriter.from_settings(database, settings)
+        writer.start()
+        latencies: list[float] = []
+
+        async def write(command):
+            start = time.perf_counter()
+            if variant == "actor":
+                await writer.submit(command)
+            else:
+                async with database.write() as session:
+                    await command(session)
+            latencies.append(time.perf_counter() - start)
+
+        async def crawler(index: int):
+            for command in crawl_commands(index, ops):
+                await write(command)
+
+        async def notifier(index: int):
+            for log_id in log_ids[index::notifiers]:
+                await write(lambda session, log_id=log_id:
+                            update_notification_status(session, log_id, STATUS_SENT))
+
+        try:
+            start = time.perf_counter()
+            await asyncio.gather(
+                *(crawler(i) for i in range(crawlers)),
+                *(notifier(i) for i in range(notifiers)),
+            )
+            elapsed = time.perf_counter() - start
+        finally:
+            await writer.stop()
+            await database.dispose()
+
+    latencies.sort()
+    metrics = writer.metrics
+    return {
+        "ops": len(latencies),
+        "ops_per_second": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "transactions": metrics.transactions if variant == "actor" else len(latencies),
+        "max_queue_depth": metrics.max_queue_depth,
+        "blocked_submits": metrics.blocked_submits,
+    }
+
+
+async def main(crawlers: int, notifiers: int, ops: int):
+    print(f"{crawlers} crawlers x {ops} ingests of {VIDEOS_PER_CRAWL} videos, "
+          f"{notifiers} notifiers x {ops} status updates")
+    print(f"{'variant':<8} {'ops/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'txns':>7} "
+          f"{'max queue':>10} {'blocked':>8}")
+    results = {}
+    for variant in ("direct", "actor"):
+        r = results[variant] = await run(variant, crawlers, notifiers, ops)
+        print(f"{variant:<8} {r['ops_per_second']:>9,.0f} {r['p50_ms']:>8.2f} {r['p99_ms']:>8.2f} "
+              f"{r['transactions']:>7} {r['max_queue_depth']:>10} {r['blocked_submits']:>8}")
+    print(f"throughput: {results['actor']['ops_per_second'] / results['direct']['ops_per_second']:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--crawlers", type=int, default=4)
+    parser.add_argument("--notifiers", type=int, default=16)
+    parser.add_argument("--ops", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.crawlers, args.notifiers, args.ops))
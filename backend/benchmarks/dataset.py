@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Synthetic Dataset Generator
+
+Fills a fresh database with schedules, videos, notifications and crawl
+execution logs shaped like production data, for benchmarks at scale:
+
+- a few channels produce most videos (Zipf-distributed schedule activity)
+- videos are detected mostly during the day, in chronological rowid order
+- titles and descriptions draw from a Zipf-distributed vocabulary, so
+  searches range from very common to rare words
+- most notifications are sent, a few failed or are still pending
+- active schedules are crawled as often as their interval says; most
+  crawls succeed
+
+Generation is deterministic for a given seed, so datasets built on different
+commits are identical.
+
+Usage (from the backend directory):
+    python -m benchmarks.dataset path/to/bench.db [--scale small|medium|large]
+"""
+import argparse
+import random
+import sqlite3
+import time
+from dataclasses import asdict, dataclass, replace
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from app.core.timestamps import format_timestamp
+from app.core.urls import url_hash
+from app.db.migrations import connect, run_migrations
+
+# Last instant of every generated dataset; benchmarks use it as "now"
+DATASET_END = datetime(2024, 7, 1)
+
+CHUNK_SIZE = 10_000
+
+COMMON_WORDS = (
+    "live music news review official trailer highlights interview tutorial guide "
+    "update episode full stream game match season recap behind scenes making "
+    "reaction first look best moments world cup cooking travel vlog morning "
+    "night city coffee python data science lecture podcast special edition"
+).split()
+# Rare words: "topic0001" ... drawn with a long tail
+RARE_WORDS = tuple(f"topic{i:04d}" for i in range(1, 3001))
+VOCABULARY = COMMON_WORDS + list(RARE_WORDS)
+# Hour-of-day weights for detection times (UTC): quiet nights, busy evenings
+HOUR_WEIGHTS = (1, 1, 1, 1, 1, 2, 3, 5, 6, 6, 6, 6, 7, 7, 7, 7, 8, 9, 10, 10, 9, 7, 4, 2)
+
+NOTIFICATION_STATUSES = (("sent", 95.0), ("failed", 4.0), ("pending", 1.0))
+CRAWL_STATUSES = (("success", 90.0), ("failed", 7.0), ("timeout", 3.0))
+CRAWL_INTERVALS = (5, 10, 15, 30, 60)
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    """
+    Size and shape of a generated dataset.
+
+    Attributes:
+        schedules: Crawl schedules (monitored channels)
+        videos: Detected videos, each with one notification
+        crawl_logs: Crawl execution logs, spread over the active schedules
+        days: Days of history ending at ``DATASET_END``
+        seed: Random seed
+    """
+    schedules: int
+    videos: int
+    crawl_logs: int
+    days: int = 180
+    seed: int = 42
+
+
+SCALES = {
+    "small": DatasetSpec(schedules=20, videos=10_000, crawl_logs=50_000),
+    "medium": DatasetSpec(schedules=200, videos=200_000, crawl_logs=1_000_000),
+    "large": DatasetSpec(schedules=1000, videos=2_000_000, crawl_logs=10_000_000),
+}
+
+
+def video_url(number: int) -> str:
+    """URL of the ``number``-th generated video."""
+    return f"https://videos.example.com/watch/{number}"
+
+
+def _zipf_weights(count: int, exponent: float = 1.1) -> list[float]:
+    return [1 / (rank ** exponent) for rank in range(1, count + 1)]
+
+
+def _text(rng: random.Random, weights: list[float], words: int) -> str:
+    return " ".join(rng.choices(VOCABULARY, weights, k=words))
+
+
+def _timestamps(rng: random.Random, count: int, days: int) -> list[datetime]:
+    """``count`` sorted times over the last ``days`` days, weighted by hour of day."""
+    start = DATASET_END - timedelta(days=days)
+    hours = rng.choices(range(24), HOUR_WEIGHTS, k=count)
+    return sorted(
+        start + timedelta(days=rng.randrange(days), hours=hour, seconds=rng.randrange(3600))
+        for hour in hours
+    )
+
+
+def _insert_chunks(conn: sqlite3.Connection, sql: str, rows) -> None:
+    """executemany in chunks of CHUNK_SIZE rows, one transaction each."""
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == CHUNK_SIZE:
+            conn.execute("BEGIN")
+            conn.executemany(sql, chunk)
+            conn.execute("COMMIT")
+            chunk = []
+    if chunk:
+        conn.execute("BEGIN")
+        conn.executemany(sql, chunk)
+        conn.execute("COMMIT")
+
+
+def generate_dataset(conn: sqlite3.Connection, spec: DatasetSpec) -> dict:
+    """
+    Fill a freshly migrated database.
+
+    Args:
+        conn: Connection from ``app.db.migrations.connect``
+        spec: What to generate
+
+    Returns:
+        Row counts per table
+    """
+    rng = random.Random(spec.seed)
+    word_weights = _zipf_weights(len(VOCABULARY))
+    schedule_weights = _zipf_weights(spec.schedules)
+    schedule_ids = range(1, spec.schedules + 1)
+    intervals = {s: rng.choice(CRAWL_INTERVALS) for s in schedule_ids}
+    # A fifth of the schedules are paused; their logs and videos are history
+    is_active = {s: rng.random() > 0.2 for s in schedule_ids}
+    _insert_chunks(
+        conn,
+        "INSERT INTO crawl_schedules (id, uuid, url, interval, is_active, created_at) "
+        "VALUES (?, randomblob(16), ?, ?, ?, ?)",
+        (
+            (s, f"https://videos.example.com/channel/{s}", intervals[s], int(is_active[s]),
+             format_timestamp(DATASET_END - timedelta(days=spec.days + 30 - s % 30)))
+            for s in schedule_ids
+        ),
+    )
+
+    detected = _timestamps(rng, spec.videos, spec.days)
+    video_schedules = rng.choices(schedule_ids, schedule_weights, k=spec.videos)
+
+    def videos():
+        for i, (at, schedule) in enumerate(zip(detected, video_schedules), start=1):
+            url = video_url(i)
+            yield (
+                _text(rng, word_weights, rng.randint(3, 8)),
+                url,
+                url_hash(url),
+                f"https://img.example.com/{i}.jpg",
+                _text(rng, word_weights, rng.randint(10, 40)) if rng.random() < 0.8 else None,
+                format_timestamp(at),
+                schedule,
+            )
+
+    _insert_chunks(
+        conn,
+        "INSERT INTO video_records (uuid, title, url, url_hash, thumbnail, description, "
+        "detected_at, schedule_id) VALUES (randomblob(16), ?, ?, ?, ?, ?, ?, ?)",
+        videos(),
+    )
+
+    statuses, weights = zip(*NOTIFICATION_STATUSES)
+    notification_statuses = rng.choices(statuses, weights, k=spec.videos)
+    _insert_chunks(
+        conn,
+        "INSERT INTO notification_logs (uuid, video_id, schedule_id, status, error_details, sent_at) "
+        "VALUES (randomblob(16), ?, ?, ?, ?, ?)",
+        (
+            (video_id, schedule, status, "Telegram API timeout" if status == "failed" else None,
+             format_timestamp(at + timedelta(seconds=rng.randint(1, 120))))
+            for video_id, (at, schedule, status) in enumerate(
+                zip(detected, video_schedules, notification_statuses), start=1
+            )
+        ),
+    )
+
+    # Crawl logs: active schedules only, frequent ones crawled more often
+    active = [s for s in schedule_ids if is_active[s]] or list(schedule_ids)
+    crawl_weights = [1 / intervals[s] for s in active]
+    started = _timestamps(rng, spec.crawl_logs, spec.days)
+    crawl_schedules = rng.choices(active, crawl_weights, k=spec.crawl_logs)
+    statuses, weights = zip(*CRAWL_STATUSES)
+    crawl_statuses = rng.choices(statuses, weights, k=spec.crawl_logs)
+    _insert_chunks(
+        conn,
+        "INSERT INTO crawl_execution_logs (uuid, schedule_id, started_at, finished_at, status, "
+        "error_details) VALUES (randomblob(16), ?, ?, ?, ?, ?)",
+        (
+            (schedule, format_timestamp(at),
+             format_timestamp(at + timedelta(seconds=rng.randint(2, 30))),
+             status, None if status == "success" else f"Crawl {status}")
+            for schedule, at, status in zip(crawl_schedules, started, crawl_statuses)
+        ),
+    )
+    return dict(conn.execute("SELECT table_name, row_count FROM table_stats"))
+
+
+def create_dataset(path: Path, spec: DatasetSpec) -> dict:
+    """
+    Create a database at ``path`` (which must not exist) and fill it.
+
+    Returns:
+        Description of the dataset: the spec, row counts, file size and
+        generation time
+    """
+    start = time.perf_counter()
+    conn = connect(path)
+    try:
+        run_migrations(conn)
+        counts = generate_dataset(conn, spec)
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    finally:
+        conn.close()
+    return {
+        "spec": asdict(spec),
+        "rows": counts,
+        "size_bytes": path.stat().st_size,
+        "generate_seconds": round(time.perf_counter() - start, 2),
+    }
+
+
+def spec_from_args(args: argparse.Namespace) -> DatasetSpec:
+    """The --scale preset with any explicit counts applied."""
+    overrides = {
+        name: getattr(args, name)
+        for name in ("schedules", "videos", "crawl_logs", "days", "seed")
+        if getattr(args, name) is not None
+    }
+    return replace(SCALES[args.scale], **overrides)
+
+
+def add_spec_arguments(parser: argparse.ArgumentParser) -> None:
+    """Options selecting the dataset size, shared with the benchmark harness."""
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--schedules", type=int)
+    parser.add_argument("--videos", type=int)
+    parser.add_argument("--crawl-logs", type=int)
+    parser.add_argument("--days", type=int)
+    parser.add_argument("--seed", type=int)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("path", type=Path)
+    add_spec_arguments(parser)
+    args = parser.parse_args()
+    if args.path.exists():
+        parser.error(f"{args.path} already exists")
+    info = create_dataset(args.path, spec_from_args(args))
+    print(f"✓ {args.path}: {info['size_bytes'] / 2**20:,.1f} MiB in {info['generate_seconds']}s")
+    for table, count in sorted(info["rows"].items()):
+        print(f"  {table:<24} {count:>12,}")
@@ -1,8 +1,17 @@
 """
 Pytest configuration and fixtures for testing.
 """
+import asyncio
+import uuid
+
 import pytest
+import pytest_asyncio
 from fastapi.testclient import TestClient
+from sqlalchemy import text
+from app.core.config import settings
+from app.core.security import admin_token_verifier
+from app.db import Database
+from app.db.migrations import migrate_database
 from app.main import app
 
 
@@ -20,3 +29,70 @@ def admin_headers():
     Headers with admin authentication token.
     """
     return {"X-Admin-Token": "test-admin-token"}
+
+
+@pytest.fixture
+def admin_auth(admin_headers):
+    """
+    Accept the test admin token for the duration of a test.
+    """
+    admin_token_verifier.update([admin_headers["X-Admin-Token"]])
+    yield admin_headers
+    admin_token_verifier.update([])
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """
+    Path of a migrated, empty SQLite database.
+    """
+    path = tmp_path / "test.db"
+    migrate_database(path)
+    return path
+
+
+@pytest.fixture
+def schedule_url():
+    """
+    URL of the crawl schedule seeded by the database fixture.
+    """
+    return "https://e.com"
+
+
+@pytest_asyncio.fixture
+async def database(db_path, schedule_url):
+    """
+    Database at db_path seeded with crawl schedule 1.
+
+    Override schedule_url in a test module to seed a different URL.
+    """
+    db = Database(f"sqlite:///{db_path}", settings)
+    async with db.write() as session:
+        await session.execute(
+            text(
+                "INSERT INTO crawl_schedules (id, uuid, url, interval) "
+                "VALUES (1, randomblob(16), :url, 5)"
+            ),
+            {"url": schedule_url},
+        )
+    yield db
+    await db.dispose()
+
+
+def uid(name: str) -> str:
+    """
+    Stable public id for a seeded row.
+    """
+    return str(uuid.uuid5(uuid.NAMESPACE_OID, name))
+
+
+@pytest.fixture
+def db_client(db_path):
+    """
+    Test client whose app is backed by the database at db_path.
+    """
+    database = Database(f"sqlite:///{db_path}", settings)
+    app.state.db = database
+    yield TestClient(app)
+    del app.state.db
+    asyncio.run(database.dispose())
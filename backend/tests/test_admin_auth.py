@@ -0,0 +1,110 @@
+"""
+Tests for admin token verification.
+"""
+from typing import Annotated
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.deps import get_current_admin
+from app.core.config import MIN_ADMIN_TOKEN_LENGTH, Settings, SettingsSnapshot
+from app.core.security import AdminTokenVerifier, admin_token_verifier, _on_settings_change
+
+
+@pytest.fixture
+def protected_client():
+    """Client for a tiny app with one route guarded by get_current_admin."""
+    app = FastAPI()
+
+    @app.get("/protected")
+    async def protected(admin: Annotated[bool, Depends(get_current_admin)]):
+        return {"admin": admin}
+
+    return TestClient(app)
+
+
+@pytest.fixture
+def active_tokens(admin_auth):
+    """Install two known admin tokens for the duration of a test."""
+    admin_token_verifier.update([admin_auth["X-Admin-Token"], "next-admin-token"])
+
+
+class TestAdminTokenVerifier:
+    """Tests for AdminTokenVerifier."""
+
+    def test_accepts_every_active_token(self):
+        """All configured tokens verify, so credentials can be rotated."""
+        verifier = AdminTokenVerifier(["old-token", "new-token"])
+        assert verifier.verify("old-token") is True
+        assert verifier.verify("new-token") is True
+        assert verifier.token_count == 2
+
+    def test_rejects_unknown_token(self):
+        """Tokens that are not configured are rejected."""
+        verifier = AdminTokenVerifier(["old-token"])
+        assert verifier.verify("old-tokenx") is False
+        assert verifier.verify("") is False
+
+    def test_blank_tokens_are_ignored(self):
+        """An empty configuration does not accept the empty string."""
+        verifier = AdminTokenVerifier(["", "   "])
+        assert verifier.token_count == 0
+        assert verifier.verify("") is False
+
+    def test_update_replaces_tokens(self):
+        """Updating drops tokens that are no longer configured."""
+        verifier = AdminTokenVerifier(["old-token"])
+        verifier.update(["new-token"])
+        assert verifier.verify("old-token") is False
+        assert verifier.verify("new-token") is True
+
+    def test_settings_reload_rotates_tokens(self):
+        """A settings change with different tokens updates the shared verifier."""
+        old_token, new_token = "o" * MIN_ADMIN_TOKEN_LENGTH, "n" * MIN_ADMIN_TOKEN_LENGTH
+        previous = SettingsSnapshot(1, Settings(X_ADMIN_TOKEN=old_token))
+        current = SettingsSnapshot(
+            2, Settings(X_ADMIN_TOKEN=new_token, ADMIN_TOKENS=[old_token])
+        )
+        try:
+            _on_settings_change(previous, current)
+            assert admin_token_verifier.verify(new_token) is True
+            assert admin_token_verifier.verify(old_token) is True
+        finally:
+            admin_token_verifier.update([])
+
+    @pytest.mark.parametrize("tokens", [
+        {"X_ADMIN_TOKEN": "change_me"},
+        {"ADMIN_TOKENS": ["n" * MIN_ADMIN_TOKEN_LENGTH, "short-token"]},
+    ])
+    def test_short_tokens_are_refused(self, tokens):
+        """Settings with a guessable admin token fail to load."""
+        with pytest.raises(ValueError, match="at least"):
+            Settings(_env_file=None, **tokens)
+
+    def test_empty_token_is_allowed(self):
+        """An unset token loads and disables admin access."""
+        assert Settings(_env_file=None, X_ADMIN_TOKEN="").X_ADMIN_TOKEN == ""
+
+
+class TestGetCurrentAdmin:
+    """Tests for the get_current_admin dependency."""
+
+    def test_missing_token(self, protected_client, active_tokens):
+        """Requests without a token are rejected."""
+        response = protected_client.get("/protected")
+        assert response.status_code == 401
+        assert "required" in response.json()["detail"].lower()
+
+    def test_invalid_token(self, protected_client, active_tokens):
+        """Requests with a wrong token are rejected."""
+        response = protected_client.get("/protected", headers={"X-Admin-Token": "wrong"})
+        assert response.status_code == 401
+        assert response.json()["detail"] == "Invalid admin token."
+
+    def test_valid_tokens(self, protected_client, active_tokens, admin_headers):
+        """Any active token is accepted."""
+        for headers in (admin_headers, {"X-Admin-Token": "next-admin-token"}):
+            response = protected_client.get("/protected", headers=headers)
+            assert response.status_code == 200
+            assert response.json() == {"admin": True}
@@ -176,3 +176,47 @@ class TestSystemVariablesEndpoint:
             # Values with special characters should be preserved
             assert data["monitored_video_page_url"]["value"] == "https://example.com/path?param=value&other=123"
             assert data["telegram_channel_id"]["value"] == "@channel_with_underscore"
+
+
+class TestSystemVariablesConditionalGet:
+    """Tests for ETag / If-None-Match handling on the system variables endpoint."""
+
+    def test_response_has_etag_and_cache_control(self, client):
+        """A full response carries a strong ETag and Cache-Control."""
+        response = client.get("/api/v1/admin/system-variables")
+
+        assert response.status_code == 200
+        assert response.headers["etag"].startswith('"')
+        assert response.headers["cache-control"] == "private, no-cache"
+
+    def test_matching_etag_returns_304(self, client):
+        """A poll with the current ETag is answered with an empty 304."""
+        etag = client.get("/api/v1/admin/system-variables").headers["etag"]
+
+        response = client.get(
+            "/api/v1/admin/system-variables", headers={"If-None-Match": etag}
+        )
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+    def test_weak_and_listed_etags_match(self, client):
+        """If-None-Match uses weak comparison and accepts a list of tags."""
+        etag = client.get("/api/v1/admin/system-variables").headers["etag"]
+
+        response = client.get(
+            "/api/v1/admin/system-variables",
+            headers={"If-None-Match": f'"stale", W/{etag}'},
+        )
+
+        assert response.status_code == 304
+
+    def test_stale_etag_returns_body(self, client):
+        """A non-matching ETag gets the full body again."""
+        response = client.get(
+            "/api/v1/admin/system-variables", headers={"If-None-Match": '"stale"'}
+        )
+
+        assert response.status_code == 200
+        assert "monitored_video_page_url" in response.json()
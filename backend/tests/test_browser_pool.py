@@ -0,0 +1,189 @@
+"""
+Tests for the pool of warm browsers.
+"""
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.crawler.pool import BrowserPool
+from app.main import app
+
+
+class FakeContext:
+    def __init__(self):
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self, number):
+        self.number = number
+        self.connected = True
+        self.contexts: list[FakeContext] = []
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_context(self, **options):
+        self.contexts.append(FakeContext())
+        return self.contexts[-1]
+
+    async def close(self):
+        self.connected = False
+
+
+class FakeLauncher:
+    """Launches numbered fake browsers; fails while ``failing`` is set."""
+
+    def __init__(self):
+        self.browsers: list[FakeBrowser] = []
+        self.failing = False
+
+    async def __call__(self):
+        if self.failing:
+            raise RuntimeError("Executable doesn't exist")
+        self.browsers.append(FakeBrowser(len(self.browsers) + 1))
+        return self.browsers[-1]
+
+
+async def _borrow(pool: BrowserPool, launcher: FakeLauncher) -> FakeBrowser:
+    """Use one context and return the browser it came from."""
+    async with pool.context() as context:
+        browser = next(b for b in launcher.browsers if context in b.contexts)
+    await asyncio.sleep(0)
+    return browser
+
+
+class TestBrowserPool:
+    """Tests for BrowserPool."""
+
+    @pytest.mark.asyncio
+    async def test_browsers_are_reused_with_fresh_contexts(self):
+        launcher = FakeLauncher()
+        pool = BrowserPool(size=1, launch=launcher)
+        await pool.start()
+
+        first = await _borrow(pool, launcher)
+        second = await _borrow(pool, launcher)
+
+        assert first is second
+        assert len(launcher.browsers) == 1
+        assert len(first.contexts) == 2
+        assert all(context.closed for context in first.contexts)
+        assert pool.metrics.pages == 2
+        assert (pool.metrics.in_use, pool.metrics.idle) == (0, 1)
+        await pool.stop()
+
+    @pytest.mark.asyncio
+    async def test_waits_for_a_free_browser(self):
+        pool = BrowserPool(size=1, launch=FakeLauncher())
+        await pool.start()
+        order = []
+
+        async def crawl(name):
+            async with pool.context():
+                order.append(f"{name} start")
+                await asyncio.sleep(0.01)
+                order.append(f"{name} end")
+
+        await asyncio.gather(crawl("a"), crawl("b"))
+
+        assert order == ["a start", "a end", "b start", "b end"]
+        await pool.stop()
+
+    @pytest.mark.asyncio
+    async def test_recycles_after_max_pages(self):
+        launcher = FakeLauncher()
+        pool = BrowserPool(size=1, max_pages=2, launch=launcher)
+        await pool.start()
+
+        used = [await _borrow(pool, launcher) for _ in range(3)]
+
+        assert [b.number for b in used] == [1, 1, 2]
+        assert not launcher.browsers[0].connected
+        assert pool.metrics.recycled == 1
+        assert pool.metrics.launched == 2
+        await pool.stop()
+
+    @pytest.mark.asyncio
+    async def test_recycles_past_memory_limit(self):
+        async def rss(browser):
+            return 600 * 1024 * 1024 if browser.number == 1 else 100
+
+        launcher = FakeLauncher()
+        pool = BrowserPool(size=1, max_rss_bytes=512 * 1024 * 1024, launch=launcher, rss=rss)
+        await pool.start()
+
+        used = [await _borrow(pool, launcher) for _ in range(3)]
+
+        assert [b.number for b in used] == [1, 2, 2]
+        assert pool.metrics.recycled == 1
+        await pool.stop()
+
+    @pytest.mark.asyncio
+    async def test_crashed_browser_is_relaunched(self):
+        launcher = FakeLauncher()
+        pool = BrowserPool(size=1, launch=launcher)
+        await pool.start()
+        launcher.browsers[0].connected = False
+
+        browser = await _borrow(pool, launcher)
+
+        assert browser.number == 2
+        assert pool.metrics.crashed == 1
+        await pool.stop()
+
+    @pytest.mark.asyncio
+    async def test_failed_launch_is_retried_on_use(self):
+        """The app starts without browsers; the first crawl launches one."""
+        launcher = FakeLauncher()
+        launcher.failing = True
+        pool = BrowserPool(size=1, launch=launcher)
+        await pool.start()
+
+        with pytest.raises(RuntimeError):
+            await _borrow(pool, launcher)
+        launcher.failing = False
+        browser = await _borrow(pool, launcher)
+
+        assert browser.number == 1
+        assert pool.metrics.launch_failures == 2
+        await pool.stop()
+
+    @pytest.mark.asyncio
+    async def test_stop_closes_browsers(self):
+        launcher = FakeLauncher()
+        pool = BrowserPool(size=2, launch=launcher)
+        await pool.start()
+
+        await pool.stop()
+
+        assert not any(b.connected for b in launcher.browsers)
+        with pytest.raises(RuntimeError):
+            async with pool.context():
+                pass
+
+
+class TestBrowserPoolStatsEndpoint:
+    """Tests for GET /api/v1/admin/stats/browser-pool."""
+
+    URL = "/api/v1/admin/stats/browser-pool"
+
+    def test_reports_metrics(self, admin_auth):
+        pool = BrowserPool(size=2)
+        pool.metrics.launched = 2
+        pool.metrics.launch_seconds = 3.0
+        app.state.browser_pool = pool
+        try:
+            response = TestClient(app).get(self.URL, headers=admin_auth)
+        finally:
+            del app.state.browser_pool
+
+        assert response.status_code == 200
+        assert response.json()["mean_launch_ms"] == 1500.0
+
+    def test_disabled_pool(self, admin_auth):
+        assert TestClient(app).get(self.URL, headers=admin_auth).status_code == 404
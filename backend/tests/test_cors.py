@@ -0,0 +1,120 @@
+"""
+Tests for CORS origin matching and the preflight cache.
+"""
+import pytest
+from starlette.datastructures import Headers
+
+from app.core.config import settings
+from app.core.cors import CustomCORSMiddleware, OriginMatcher
+
+
+DEFAULT_ORIGINS = [
+    "http://localhost:3000",
+    "http://127.0.0.1:3000",
+    "https://*.replit.dev",
+    "https://*.replit.app",
+]
+CORS_OPTIONS = {"allow_methods": ["*"], "allow_headers": ["*"]}
+
+
+class TestOriginMatcher:
+    """Tests for OriginMatcher."""
+
+    @pytest.mark.parametrize("origin", [
+        "http://localhost:3000",
+        "http://127.0.0.1:3000",
+        "https://abc.replit.dev",
+        "https://a.b.c.replit.app",
+    ])
+    def test_allowed_origins(self, origin):
+        """Exact and wildcard entries both allow matching origins."""
+        assert OriginMatcher(DEFAULT_ORIGINS).is_allowed(origin) is True
+
+    @pytest.mark.parametrize("origin", [
+        "http://localhost:3001",
+        "https://replit.dev",
+        "http://abc.replit.dev",
+        "https://abc.replit.dev.evil.com",
+        "https://abcreplit.dev",
+    ])
+    def test_rejected_origins(self, origin):
+        """Origins outside the configured set are rejected."""
+        assert OriginMatcher(DEFAULT_ORIGINS).is_allowed(origin) is False
+
+    def test_star_allows_everything(self):
+        """A '*' entry allows any origin."""
+        matcher = OriginMatcher(["*"])
+        assert matcher.is_allowed("https://anything.example.com") is True
+
+    def test_verdicts_are_cached(self):
+        """Repeated lookups are served from the LRU cache."""
+        matcher = OriginMatcher(DEFAULT_ORIGINS, cache_size=2)
+        matcher.is_allowed("https://abc.replit.dev")
+        matcher.is_allowed("https://abc.replit.dev")
+        info = matcher.is_allowed.cache_info()
+        assert info.hits == 1
+        assert info.maxsize == 2
+
+
+class TestCORSMiddleware:
+    """Tests for the CORS middleware wired into the app."""
+
+    def test_wildcard_origin_is_reflected(self, client):
+        """Responses mirror back an origin matched by a wildcard entry."""
+        response = client.get("/health", headers={"Origin": "https://abc.replit.dev"})
+        assert response.headers["access-control-allow-origin"] == "https://abc.replit.dev"
+
+    def test_unknown_origin_is_not_reflected(self, client):
+        """Responses do not allow an unknown origin."""
+        response = client.get("/health", headers={"Origin": "https://evil.example.com"})
+        assert "access-control-allow-origin" not in response.headers
+
+    def test_preflight_is_answered(self, client):
+        """Preflight requests from an allowed origin succeed with Max-Age set."""
+        response = client.options("/api/v1/admin/system-variables", headers={
+            "Origin": "http://localhost:3000",
+            "Access-Control-Request-Method": "GET",
+            "Access-Control-Request-Headers": "x-admin-token",
+        })
+        assert response.status_code == 200
+        assert response.headers["access-control-allow-origin"] == "http://localhost:3000"
+        assert response.headers["access-control-max-age"] == str(settings.CORS_PREFLIGHT_MAX_AGE)
+        assert response.headers["access-control-allow-headers"] == "x-admin-token"
+
+
+class TestPreflightCache:
+    """Tests for the preflight response cache in CustomCORSMiddleware."""
+
+    @staticmethod
+    def _preflight(middleware, origin, method="GET", request_headers="x-admin-token"):
+        return middleware.preflight_response(Headers({
+            "origin": origin,
+            "access-control-request-method": method,
+            "access-control-request-headers": request_headers,
+        }))
+
+    def test_identical_preflights_share_a_response(self):
+        """The same (origin, method, headers) key is built only once."""
+        middleware = CustomCORSMiddleware(None, allow_origins=DEFAULT_ORIGINS, **CORS_OPTIONS)
+        first = self._preflight(middleware, "http://localhost:3000")
+        second = self._preflight(middleware, "http://localhost:3000")
+        other = self._preflight(middleware, "http://localhost:3000", method="DELETE")
+        assert first is second
+        assert other is not first
+
+    def test_rejected_preflight_is_cached_as_rejection(self):
+        """Disallowed origins keep getting a 400."""
+        middleware = CustomCORSMiddleware(None, allow_origins=DEFAULT_ORIGINS, **CORS_OPTIONS)
+        assert self._preflight(middleware, "https://evil.example.com").status_code == 400
+        assert self._preflight(middleware, "https://evil.example.com").status_code == 400
+
+    def test_update_origins_clears_cache(self):
+        """Changing the allowed origins invalidates cached verdicts and responses."""
+        middleware = CustomCORSMiddleware(None, allow_origins=DEFAULT_ORIGINS, **CORS_OPTIONS)
+        assert self._preflight(middleware, "http://localhost:4000").status_code == 400
+
+        middleware.update_origins([*DEFAULT_ORIGINS, "http://localhost:4000"])
+
+        response = self._preflight(middleware, "http://localhost:4000")
+        assert response.status_code == 200
+        assert response.headers["access-control-allow-origin"] == "http://localhost:4000"
@@ -0,0 +1,511 @@
+"""
+Tests for crawling the monitored page.
+"""
+import httpx
+import pytest
+from sqlalchemy import text
+
+from app.core.config import Settings, settings
+from app.crawler.extract import ListingExtractor, ListingRules, SimpleSelector, extract_listing
+from app.crawler.fetch import PageValidators, fetch_page, stream_page
+from app.crawler.fingerprint import DEFAULT_VOLATILE_RULES, ContentFingerprint
+from app.crawler.routing import BROWSER, STATIC, RenderStrategy
+from app.db import Database
+from app.services.crawl import Crawler, crawl_page
+from app.services.dashboard import DayStats
+
+URL = "https://videos.example.com/latest"
+ETAG = '"v1"'
+LAST_MODIFIED = "Mon, 01 Jul 2024 12:00:00 GMT"
+
+
+class FakeSite:
+    """A page that answers conditional requests like a real server."""
+
+    def __init__(self, etag=ETAG, last_modified=LAST_MODIFIED, body=None):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.body = listing("a", "b") if body is None else body
+        self.requests: list[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        headers = {}
+        if self.etag:
+            headers["ETag"] = self.etag
+        if self.last_modified:
+            headers["Last-Modified"] = self.last_modified
+        if self.etag and request.headers.get("If-None-Match") == self.etag:
+            return httpx.Response(304, headers=headers)
+        return httpx.Response(200, headers=headers, text=self.body)
+
+    def client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.MockTransport(self))
+
+
+def listing(*names: str) -> str:
+    """A page listing a video per name, newest first, followed by a footer."""
+    items = "".join(
+        f'<li class="video"><a href="/{name}"><img src="/{name}.jpg">{name}</a></li>'
+        for name in names
+    )
+    return f'<html><body><ul id="videos">{items}</ul><footer>More</footer></body></html>'
+
+
+RULES = ListingRules(SimpleSelector.parse("ul#videos"), SimpleSelector.parse("li.video"))
+
+
+@pytest.fixture
+def schedule_url():
+    return URL
+
+
+async def _logs(database):
+    async with database.read() as session:
+        result = await session.execute(text(
+            "SELECT status, error_details FROM crawl_execution_logs ORDER BY id"
+        ))
+        return [tuple(row) for row in result]
+
+
+class TestFetchPage:
+    """Tests for fetch_page."""
+
+    @pytest.mark.asyncio
+    async def test_sends_stored_validators(self):
+        site = FakeSite(etag=None)
+        async with site.client() as client:
+            page = await fetch_page(client, URL, PageValidators('"old"', LAST_MODIFIED))
+
+        assert site.requests[0].headers["If-None-Match"] == '"old"'
+        assert site.requests[0].headers["If-Modified-Since"] == LAST_MODIFIED
+        assert not page.not_modified
+        assert page.validators == PageValidators(None, LAST_MODIFIED)
+
+    @pytest.mark.asyncio
+    async def test_first_fetch_is_unconditional(self):
+        site = FakeSite()
+        async with site.client() as client:
+            page = await fetch_page(client, URL)
+
+        assert "If-None-Match" not in site.requests[0].headers
+        assert page.text == listing("a", "b")
+        assert page.validators == PageValidators(ETAG, LAST_MODIFIED)
+
+    @pytest.mark.asyncio
+    async def test_not_modified_keeps_validators(self):
+        """A 304 without Last-Modified keeps the stored one."""
+        site = FakeSite(last_modified=None)
+        async with site.client() as client:
+            page = await fetch_page(client, URL, PageValidators(ETAG, LAST_MODIFIED))
+
+        assert page.not_modified
+        assert page.text == ""
+        assert page.validators == PageValidators(ETAG, LAST_MODIFIED)
+
+
+class TestStreamPage:
+    """Tests for stream_page."""
+
+    @pytest.mark.asyncio
+    async def test_stops_reading_when_consumer_is_done(self):
+        sent = []
+
+        async def body():
+            for i in range(10):
+                sent.append(i)
+                yield f"<p>{i}</p>".encode()
+
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, content=body()))
+        chunks = []
+
+        async def consume(chunk):
+            chunks.append(chunk)
+            return len(chunks) == 2
+
+        async with httpx.AsyncClient(transport=transport) as client:
+            page = await stream_page(client, URL, None, consume)
+
+        assert chunks == ["<p>0</p>", "<p>1</p>"]
+        assert len(sent) < 10
+        assert not page.complete
+
+
+class TestCrawlPage:
+    """Tests for crawl_page."""
+
+    @pytest.mark.asyncio
+    async def test_unchanged_page_ends_early(self, database):
+        site = FakeSite()
+        async with site.client() as client:
+            first = await crawl_page(database, client, 1, URL, RULES)
+            second = await crawl_page(database, client, 1, URL, RULES)
+
+        assert first.status == "success"
+        assert [v.video.url for v in first.ingest.new_videos] == [
+            "https://videos.example.com/a", "https://videos.example.com/b",
+        ]
+        assert second.status == "not_modified"
+        assert second.ingest is None
+        assert await _logs(database) == [("success", None), ("not_modified", None)]
+
+    @pytest.mark.asyncio
+    async def test_changed_page_is_extracted(self, database):
+        site = FakeSite()
+        async with site.client() as client:
+            await crawl_page(database, client, 1, URL, RULES)
+            site.etag, site.body = '"v2"', listing("c", "a", "b")
+            result = await crawl_page(database, client, 1, URL, RULES)
+
+        assert result.status == "success"
+        assert [v.video.title for v in result.ingest.new_videos] == ["c"]
+        assert site.requests[1].headers["If-None-Match"] == ETAG
+
+    @pytest.mark.asyncio
+    async def test_reading_stops_at_the_first_known_video(self, database):
+        """Videos after a known one are older and are neither read nor stored."""
+        site = FakeSite(etag=None, last_modified=None, body=listing("b"))
+        async with site.client() as client:
+            await crawl_page(database, client, 1, URL, RULES)
+            site.body = listing("c", "b", "a")
+            result = await crawl_page(database, client, 1, URL, RULES)
+            site.body = listing("d", "b", "a")
+            full = await crawl_page(database, client, 1, URL, RULES, stop_after_known=0)
+
+        assert [v.video.title for v in result.ingest.new_videos] == ["c"]
+        assert [v.video.title for v in full.ingest.new_videos] == ["d", "a"]
+        assert result.render_mode == STATIC
+
+    @pytest.mark.asyncio
+    async def test_interrupted_download_keeps_old_validators(self, database):
+        """Validators are only stored together with the page's videos."""
+        site = FakeSite()
+
+        def interrupted(request: httpx.Request) -> httpx.Response:
+            site.requests.append(request)
+            raise httpx.ReadError("connection reset", request=request)
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(interrupted)) as client:
+            failed = await crawl_page(database, client, 1, URL, RULES)
+        async with site.client() as client:
+            retried = await crawl_page(database, client, 1, URL, RULES)
+
+        assert failed.status == "failed"
+        assert "If-None-Match" not in site.requests[1].headers
+        assert retried.status == "success"
+
+    @pytest.mark.asyncio
+    async def test_http_error_is_logged(self, database):
+        transport = httpx.MockTransport(lambda request: httpx.Response(503))
+        async with httpx.AsyncClient(transport=transport) as client:
+            result = await crawl_page(database, client, 1, URL, RULES)
+
+        assert result.status == "failed"
+        [(status, error)] = await _logs(database)
+        assert status == "failed"
+        assert "503" in error
+
+
+class TestListingExtractor:
+    """Tests for the streaming listing extractor."""
+
+    def test_extracts_items_of_the_listing(self):
+        html = '<nav><a href="/home">Home</a></nav>' + listing("a")
+
+        [video] = extract_listing(html, RULES, URL)
+
+        assert video.title == "a"
+        assert video.url == "https://videos.example.com/a"
+        assert video.thumbnail == "https://videos.example.com/a.jpg"
+
+    def test_items_are_emitted_as_soon_as_they_close(self):
+        extractor = ListingExtractor(RULES, URL)
+        html = listing("a", "b")
+        cut = html.index("</li>") + len("</li>")
+
+        assert [v.title for v in extractor.feed(html[:cut - 2])] == []
+        assert [v.title for v in extractor.feed(html[cut - 2:cut + 10])] == ["a"]
+        assert not extractor.done
+
+    def test_done_at_the_end_of_the_container(self):
+        extractor = ListingExtractor(RULES, URL)
+        html = listing("a")
+        end = html.index("</ul>") + len("</ul>")
+
+        extractor.feed(html[:end])
+
+        assert extractor.done
+        assert extractor.feed('<ul id="videos"><li class="video"><a href="/z">z</a></li>') == []
+        assert extractor.found == 1
+
+    def test_title_falls_back_to_attributes(self):
+        html = (
+            '<ul id="videos">'
+            '<li class="video"><a href="/a" title="Titled"><img src="/a.jpg"></a></li>'
+            '<li class="video"><a href="/b"><img data-src="/b.jpg" alt="Alt text"></a></li>'
+            '<li class="video"><span>no link</span></li>'
+            '</ul>'
+        )
+
+        videos = extract_listing(html, RULES, URL)
+
+        assert [(v.title, v.thumbnail) for v in videos] == [
+            ("Titled", "https://videos.example.com/a.jpg"),
+            ("Alt text", "https://videos.example.com/b.jpg"),
+        ]
+
+    def test_without_rules_every_link_is_a_video(self):
+        videos = extract_listing('<p><a href="/a">A</a> and <a href="/b">B</a>', ListingRules(), URL)
+
+        assert [v.title for v in videos] == ["A", "B"]
+
+    def test_unsupported_selector_is_rejected(self):
+        with pytest.raises(ValueError):
+            SimpleSelector.parse("ul > li")
+
+
+class TestContentHash:
+    """Tests for the listing fingerprint and the unchanged-page short-circuit."""
+
+    @staticmethod
+    def fingerprints(html: str, chunk_size: int | None = None) -> list[str]:
+        extractor = ListingExtractor(RULES, URL, ContentFingerprint(DEFAULT_VOLATILE_RULES))
+        size = chunk_size or len(html)
+        for start in range(0, len(html), size):
+            extractor.feed(html[start:start + size])
+        extractor.close()
+        return extractor.fingerprints
+
+    def test_independent_of_chunking(self):
+        html = listing("alpha", "beta", "gamma")
+
+        assert self.fingerprints(html) == self.fingerprints(html, chunk_size=7)
+
+    def test_volatile_parts_are_ignored(self):
+        def page(stamp: str, nonce: str, ad: str) -> str:
+            return (
+                '<ul id="videos"><li class="video">'
+                f'<a href="/a" data-csrf-token="{nonce}">A</a>'
+                f'<span>{stamp} minutes ago · 1,{stamp}00 views</span>'
+                f'<time datetime="2024-07-01T12:{stamp}:00Z">{stamp}</time>'
+                f'<ins class="adsbygoogle">{ad}</ins><script nonce="{nonce}">var t={stamp}</script>'
+                '</li></ul>'
+            )
+
+        assert self.fingerprints(page("12", "n1", "x")) == self.fingerprints(page("47", "n2", "y"))
+
+    def test_content_changes_the_fingerprint(self):
+        [before] = self.fingerprints(listing("a"))
+        [after] = self.fingerprints(listing("a").replace(">a</a>", ">a (re-upload)</a>"))
+
+        assert before != after
+
+    @pytest.mark.asyncio
+    async def test_unchanged_listing_is_skipped(self, database):
+        """Without validators, a matching fingerprint stores nothing but the log."""
+        site = FakeSite(etag=None, last_modified=None, body=listing("b", "a"))
+        async with site.client() as client:
+            first = await crawl_page(database, client, 1, URL, RULES, volatile=DEFAULT_VOLATILE_RULES)
+            site.body = listing("b", "a").replace("</ul>", "<li class=ad>Sponsored</li></ul>")
+            second = await crawl_page(database, client, 1, URL, RULES, volatile=DEFAULT_VOLATILE_RULES)
+            site.body = listing("c", "b", "a")
+            third = await crawl_page(database, client, 1, URL, RULES, volatile=DEFAULT_VOLATILE_RULES)
+
+        assert len(first.ingest.new_videos) == 2
+        assert second.status == "unchanged"
+        assert second.ingest is None
+        assert [v.video.title for v in third.ingest.new_videos] == ["c"]
+        logs = await _logs(database)
+        assert [status for status, _ in logs] == ["success", "unchanged", "success"]
+        assert "content hash" in logs[1][1]
+
+    @pytest.mark.asyncio
+    async def test_fingerprint_covers_the_videos_read(self, database):
+        """After an early stop, the next crawl compares the same prefix."""
+        site = FakeSite(etag=None, last_modified=None, body=listing("a"))
+        async with site.client() as client:
+            await crawl_page(database, client, 1, URL, RULES, volatile=DEFAULT_VOLATILE_RULES)
+            site.body = listing("b", "a", "old")
+            await crawl_page(database, client, 1, URL, RULES, volatile=DEFAULT_VOLATILE_RULES)
+            site.body = listing("b", "a", "older")
+            result = await crawl_page(database, client, 1, URL, RULES, volatile=DEFAULT_VOLATILE_RULES)
+
+        assert result.status == "unchanged"
+        assert "first 2 videos" in result.error
+
+    @pytest.mark.asyncio
+    async def test_disabled_without_rules(self, database):
+        site = FakeSite(etag=None, last_modified=None)
+        async with site.client() as client:
+            await crawl_page(database, client, 1, URL, RULES)
+            result = await crawl_page(database, client, 1, URL, RULES)
+
+        assert result.status == "success"
+        assert result.ingest.new_videos == []
+
+
+class FakeBrowser:
+    """Renders every URL to ``html``."""
+
+    def __init__(self, html=None):
+        self.html = listing("x", "y") if html is None else html
+        self.renders = 0
+
+    async def __call__(self, url: str) -> str:
+        self.renders += 1
+        return self.html
+
+
+class TestRenderStrategy:
+    """Tests for RenderStrategy."""
+
+    def test_static_pages_always_start_static(self):
+        assert RenderStrategy(STATIC).try_static(probe_every=20)
+
+    def test_browser_pages_probe_static_periodically(self):
+        strategy = RenderStrategy(BROWSER)
+        tried = []
+        for _ in range(6):
+            tried.append(strategy.try_static(probe_every=3))
+            strategy = strategy.learn(tried[-1], BROWSER)
+
+        assert tried == [False, False, True, False, False, True]
+
+    def test_probing_can_be_disabled(self):
+        assert not RenderStrategy(BROWSER, 1000).try_static(probe_every=0)
+
+    def test_empty_crawl_keeps_the_learned_mode(self):
+        assert RenderStrategy(BROWSER, 1).learn(True, None) == RenderStrategy(BROWSER, 0)
+        assert RenderStrategy(STATIC).learn(True, None) == RenderStrategy(STATIC)
+
+
+class TestRenderRouting:
+    """Tests for the learned static-vs-browser routing in crawl_page."""
+
+    @pytest.mark.asyncio
+    async def test_js_page_goes_straight_to_the_browser(self, database):
+        site, browser = FakeSite(body="<div id=app></div>"), FakeBrowser()
+
+        async with site.client() as client:
+            first = await crawl_page(database, client, 1, URL, RULES, render=browser)
+            second = await crawl_page(database, client, 1, URL, RULES, render=browser)
+
+        assert first.render_mode == second.render_mode == BROWSER
+        assert len(first.ingest.new_videos) == 2
+        assert len(site.requests) == 1
+        assert browser.renders == 2
+
+    @pytest.mark.asyncio
+    async def test_static_is_reprobed_and_relearned(self, database):
+        """A page that stops needing the browser goes back to static."""
+        site, browser = FakeSite(etag=None, body=""), FakeBrowser()
+        async with site.client() as client:
+            for _ in range(3):
+                await crawl_page(database, client, 1, URL, RULES, render=browser, probe_every=3)
+            assert len(site.requests) == 1
+
+            # The static listing only shows videos the browser already found
+            site.body = listing("x", "y")
+            probe = await crawl_page(database, client, 1, URL, RULES, render=browser, probe_every=3)
+            after = await crawl_page(database, client, 1, URL, RULES, render=browser, probe_every=3)
+
+        assert probe.render_mode == after.render_mode == STATIC
+        assert browser.renders == 3
+        assert len(site.requests) == 3
+
+    @pytest.mark.asyncio
+    async def test_learned_mode_is_persisted(self, database, db_path):
+        site = FakeSite(body="")
+        async with site.client() as client:
+            await crawl_page(database, client, 1, URL, RULES, render=FakeBrowser())
+
+        reopened = Database(f"sqlite:///{db_path}", settings)
+        async with reopened.read() as session:
+            row = (await session.execute(text(
+                "SELECT render_mode, etag FROM crawled_pages WHERE url = :url"
+            ), {"url": URL})).one()
+        await reopened.dispose()
+        # The static validators are dropped: they describe a page without videos
+        assert tuple(row) == (BROWSER, None)
+
+
+class TestCrawler:
+    """Tests for Crawler.from_settings."""
+
+    SETTINGS = dict(
+        _env_file=None, CRAWL_LISTING_SELECTOR="ul#videos", CRAWL_ITEM_SELECTOR="li.video"
+    )
+
+    @pytest.mark.asyncio
+    async def test_listing_settings_are_applied(self, database):
+        site = FakeSite(etag=None, last_modified=None, body=listing("b"))
+        crawler = Crawler.from_settings(
+            Settings(**self.SETTINGS, CRAWL_STOP_AFTER_KNOWN=0), database, client=site.client()
+        )
+        try:
+            await crawler.crawl(1, URL)
+            site.body = listing("c", "b", "a")
+            full = await crawler.crawl(1, URL)
+            unchanged = await crawler.crawl(1, URL)
+        finally:
+            await crawler.close()
+
+        # CRAWL_STOP_AFTER_KNOWN=0 reads past the known video
+        assert [v.video.title for v in full.ingest.new_videos] == ["c", "a"]
+        assert unchanged.status == "unchanged"
+
+    @pytest.mark.asyncio
+    async def test_content_hash_can_be_disabled(self, database):
+        site = FakeSite(etag=None, last_modified=None)
+        crawler = Crawler.from_settings(
+            Settings(**self.SETTINGS, CRAWL_CONTENT_HASH=False), database, client=site.client()
+        )
+        try:
+            await crawler.crawl(1, URL)
+            result = await crawler.crawl(1, URL)
+        finally:
+            await crawler.close()
+
+        assert result.status == "success"
+
+    @pytest.mark.asyncio
+    async def test_render_settings_are_applied(self, database):
+        """The pool's renderer gets CRAWL_RENDER_TIMEOUT; probes follow the interval."""
+        site, browser = FakeSite(etag=None, body="<div id=app></div>"), FakeBrowser()
+        renderers = []
+
+        class FakePool:
+            def renderer(self, timeout, profile):
+                renderers.append((timeout, profile.item_selector))
+                return browser
+
+        crawler = Crawler.from_settings(
+            Settings(**self.SETTINGS, CRAWL_RENDER_TIMEOUT=5, CRAWL_STATIC_PROBE_INTERVAL=2),
+            database,
+            browser_pool=FakePool(),
+            client=site.client(),
+        )
+        try:
+            for _ in range(3):
+                await crawler.crawl(1, URL)
+        finally:
+            await crawler.close()
+
+        assert renderers == [(5, "li.video")]
+        assert browser.renders == 3
+        # Static on the first crawl, then a probe every second crawl
+        assert len(site.requests) == 2
+
+
+class TestCrawlFailureRate:
+    """Unchanged pages do not count as failed crawls."""
+
+    def test_not_modified_is_not_a_failure(self):
+        day = DayStats(day=None, crawls={"success": 1, "not_modified": 2, "timeout": 1})
+
+        assert day.crawl_failure_rate == 0.25
+
+    def test_unchanged_is_not_a_failure(self):
+        day = DayStats(day=None, crawls={"unchanged": 3, "failed": 1})
+
+        assert day.crawl_failure_rate == 0.25
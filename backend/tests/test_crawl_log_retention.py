@@ -0,0 +1,145 @@
+"""
+Tests for batched crawl_execution_logs retention.
+"""
+import asyncio
+import sqlite3
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.config import Settings, settings
+from app.db import Database
+from app.services import retention
+from app.services.retention import RetentionPolicy, purge_crawl_execution_logs, run_retention
+
+NOW = datetime(2024, 6, 1, 12, 0, 0)
+POLICY = RetentionPolicy(keep_days={"success": 7, "failed": 30}, default_days=14)
+
+
+@pytest.fixture
+def seeded(db_path):
+    """Three schedules with a success, failure and timeout log every day for 60 days."""
+    conn = sqlite3.connect(db_path)
+    schedules = [1, 2, 3]
+    conn.executemany(
+        "INSERT INTO crawl_schedules (id, uuid, url, interval) "
+        "VALUES (?, randomblob(16), 'https://e.com', 5)",
+        [(s,) for s in schedules],
+    )
+    rows = []
+    for schedule in schedules:
+        for day in range(60):
+            started_at = (NOW - timedelta(days=day, hours=1)).strftime("%Y-%m-%d %H:%M:%S")
+            for status in ("success", "failed", "timeout"):
+                rows.append((schedule, started_at, status))
+    conn.executemany(
+        "INSERT INTO crawl_execution_logs (uuid, schedule_id, started_at, status) "
+        "VALUES (randomblob(16), ?, ?, ?)",
+        rows,
+    )
+    conn.commit()
+    conn.close()
+
+
+def _purge(db_path, **kwargs):
+    database = Database(f"sqlite:///{db_path}", settings)
+
+    async def run():
+        try:
+            return await purge_crawl_execution_logs(
+                database, POLICY, now=NOW, batch_pause=0, **kwargs
+            )
+        finally:
+            await database.dispose()
+
+    return asyncio.run(run())
+
+
+def _remaining(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return dict(conn.execute(
+            "SELECT status, COUNT(*) FROM crawl_execution_logs GROUP BY status"
+        ).fetchall())
+    finally:
+        conn.close()
+
+
+class TestCrawlLogRetention:
+    """Tests for purge_crawl_execution_logs."""
+
+    def test_per_status_policies(self, db_path, seeded):
+        progress = _purge(db_path)
+
+        # Logs started 1h before each day boundary; day N is kept if N < keep_days
+        assert _remaining(db_path) == {"success": 3 * 7, "failed": 3 * 30, "timeout": 3 * 14}
+        assert progress.schedules == 3
+        assert progress.deleted == 3 * 180 - (21 + 90 + 42)
+
+    def test_only_reads_past_the_shortest_retention(self, db_path, seeded):
+        """Rows newer than every cutoff are never read."""
+        progress = _purge(db_path)
+
+        assert progress.scanned == 3 * 3 * (60 - 7)
+
+    def test_small_batches(self, db_path, seeded):
+        reports = []
+        progress = _purge(db_path, batch_size=25, on_progress=lambda p: reports.append(p.deleted))
+
+        assert progress.batches == len(reports) > 3 * 6
+        assert reports == sorted(reports)
+        assert reports[-1] == progress.deleted == 3 * 180 - (21 + 90 + 42)
+
+    def test_row_counts_follow(self, db_path, seeded):
+        _purge(db_path)
+
+        conn = sqlite3.connect(db_path)
+        count = conn.execute(
+            "SELECT row_count FROM table_stats WHERE table_name = 'crawl_execution_logs'"
+        ).fetchone()[0]
+        conn.close()
+        assert count == 21 + 90 + 42
+
+    def test_second_pass_deletes_nothing(self, db_path, seeded):
+        _purge(db_path)
+
+        assert _purge(db_path).deleted == 0
+
+    def test_empty_table(self, db_path):
+        progress = _purge(db_path)
+
+        assert (progress.schedules, progress.scanned, progress.deleted) == (0, 0, 0)
+
+
+class TestRetentionJob:
+    """Tests for run_retention."""
+
+    def test_disabled_job_resumes_when_enabled(self, db_path, seeded, monkeypatch):
+        """A job started with interval 0 idles, then purges once the interval is set."""
+        monkeypatch.setattr(retention, "DISABLED_POLL_INTERVAL", 0.01)
+        registry = SimpleNamespace(
+            settings=Settings(_env_file=None, CRAWL_LOG_RETENTION_INTERVAL=0)
+        )
+        database = Database(f"sqlite:///{db_path}", settings)
+
+        async def run():
+            job = asyncio.create_task(run_retention(database, None, registry))
+            try:
+                await asyncio.sleep(0.05)
+                assert sum(_remaining(db_path).values()) == 3 * 180
+
+                registry.settings = Settings(_env_file=None, CRAWL_LOG_RETENTION_INTERVAL=0.01)
+                for _ in range(200):
+                    await asyncio.sleep(0.01)
+                    if not _remaining(db_path):
+                        break
+            finally:
+                job.cancel()
+                await asyncio.gather(job, return_exceptions=True)
+                await database.dispose()
+
+        asyncio.run(run())
+
+        # The seeded logs are years older than every default retention period
+        assert _remaining(db_path) == {}
@@ -0,0 +1,182 @@
+"""
+Tests for the daily rollup tables and the daily statistics endpoint.
+"""
+import sqlite3
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from app.db.migrations import connect
+from app.db.rollups import rebuild_rollups
+
+STATS_URL = "/api/v1/admin/stats/daily"
+SCHEDULE_UUID = uuid.UUID("5f0c3b1a-7e2d-4a9b-8c6f-0d1e2f3a4b5c")
+
+
+def _day(offset: int) -> date:
+    return datetime.now(timezone.utc).date() - timedelta(days=offset)
+
+
+@pytest.fixture
+def seeded(db_path):
+    """Two schedules; schedule 1 has activity today and two days ago."""
+    conn = sqlite3.connect(db_path)
+    conn.executemany(
+        "INSERT INTO crawl_schedules (id, uuid, url, interval) VALUES (?, ?, 'https://e.com', 5)",
+        [(1, SCHEDULE_UUID.bytes), (2, uuid.uuid4().bytes)],
+    )
+    videos = [(1, 0), (1, 0), (1, 2), (2, 0)]
+    conn.executemany(
+        "INSERT INTO video_records (uuid, title, url, schedule_id, detected_at) "
+        "VALUES (randomblob(16), 't', 'https://e.com/' || hex(randomblob(4)), ?, ?)",
+        [(schedule, f"{_day(offset)} 12:00:00") for schedule, offset in videos],
+    )
+    notifications = [(1, "sent", 0), (1, "sent", 0), (1, "failed", 0), (1, "pending", 0),
+                      (1, "failed", 2), (2, "sent", 0)]
+    conn.executemany(
+        "INSERT INTO notification_logs (uuid, video_id, schedule_id, status, sent_at) "
+        "VALUES (randomblob(16), 1, ?, ?, ?)",
+        [(schedule, status, f"{_day(offset)} 12:00:00") for schedule, status, offset in notifications],
+    )
+    crawls = [(1, "success", 0), (1, "failed", 0), (1, "timeout", 0), (1, "success", 0),
+              (2, "success", 2)]
+    conn.executemany(
+        "INSERT INTO crawl_execution_logs (uuid, schedule_id, status, started_at) "
+        "VALUES (randomblob(16), ?, ?, ?)",
+        [(schedule, status, f"{_day(offset)} 12:00:00") for schedule, status, offset in crawls],
+    )
+    conn.commit()
+    conn.close()
+
+
+def _rollup(db_path, table):
+    conn = sqlite3.connect(db_path)
+    try:
+        return {
+            (day, schedule_id, status): count
+            for day, schedule_id, status, count in conn.execute(f"SELECT * FROM {table}")
+            if count
+        }
+    finally:
+        conn.close()
+
+
+class TestRollupTriggers:
+    """Tests for the triggers maintaining the rollups."""
+
+    def test_inserts_are_counted(self, db_path, seeded):
+        today = _day(0).isoformat()
+
+        videos = _rollup(db_path, "video_daily_stats")
+        assert videos[(today, 1, "detected")] == 2
+        assert videos[(_day(2).isoformat(), 1, "detected")] == 1
+        assert _rollup(db_path, "notification_daily_stats")[(today, 1, "sent")] == 2
+
+    def test_status_change_moves_the_count(self, db_path, seeded):
+        conn = sqlite3.connect(db_path)
+        conn.execute(
+            "UPDATE notification_logs SET status = 'sent', sent_at = ? WHERE status = 'pending'",
+            (f"{_day(0)} 13:00:00",),
+        )
+        conn.commit()
+        conn.close()
+
+        rollup = _rollup(db_path, "notification_daily_stats")
+        today = _day(0).isoformat()
+        assert (today, 1, "pending") not in rollup
+        assert rollup[(today, 1, "sent")] == 3
+
+    def test_deletes_keep_history(self, db_path, seeded):
+        """Purged or archived logs stay counted."""
+        before = _rollup(db_path, "crawl_daily_stats")
+        conn = sqlite3.connect(db_path)
+        conn.execute("DELETE FROM crawl_execution_logs")
+        conn.commit()
+        conn.close()
+
+        assert _rollup(db_path, "crawl_daily_stats") == before
+
+    def test_rolled_back_insert_is_not_counted(self, db_path, seeded):
+        before = _rollup(db_path, "video_daily_stats")
+        conn = sqlite3.connect(db_path)
+        conn.execute(
+            "INSERT INTO video_records (uuid, title, url, schedule_id) "
+            "VALUES (randomblob(16), 't', 'https://e.com/x', 1)"
+        )
+        conn.rollback()
+        conn.close()
+
+        assert _rollup(db_path, "video_daily_stats") == before
+
+
+class TestRebuildRollups:
+    """Tests for rebuild_rollups."""
+
+    TABLES = ("video_daily_stats", "notification_daily_stats", "crawl_daily_stats")
+
+    def test_rebuild_matches_triggers(self, db_path, seeded):
+        expected = {table: _rollup(db_path, table) for table in self.TABLES}
+        conn = connect(db_path)
+        for table in self.TABLES:
+            conn.execute(f"DELETE FROM {table}")
+        progress = []
+
+        assert rebuild_rollups(conn, on_progress=lambda *p: progress.append(p)) == 2
+        conn.close()
+
+        assert {table: _rollup(db_path, table) for table in self.TABLES} == expected
+        assert progress[-1] == ("crawl_daily_stats", 2)
+
+    def test_since_keeps_older_days(self, db_path, seeded):
+        """Days before ``since`` keep their counts even if the raw rows are gone."""
+        conn = connect(db_path)
+        conn.execute("DELETE FROM crawl_execution_logs WHERE started_at < ?", (str(_day(1)),))
+        conn.execute("DELETE FROM crawl_daily_stats WHERE day >= ?", (str(_day(1)),))
+
+        rebuild_rollups(conn, since=_day(1))
+        conn.close()
+
+        rollup = _rollup(db_path, "crawl_daily_stats")
+        assert rollup[(_day(2).isoformat(), 2, "success")] == 1
+        assert rollup[(_day(0).isoformat(), 1, "success")] == 2
+
+
+class TestDailyStatsEndpoint:
+    """Tests for GET /api/v1/admin/stats/daily."""
+
+    def test_requires_admin(self, db_client):
+        assert db_client.get(STATS_URL).status_code == 401
+
+    def test_days_and_rates(self, db_client, seeded, admin_auth):
+        response = db_client.get(STATS_URL, headers=admin_auth, params={"days": 3})
+
+        assert response.status_code == 200
+        days = response.json()["days"]
+        assert [d["day"] for d in days] == [str(_day(i)) for i in (2, 1, 0)]
+        assert days[1] == {
+            "day": str(_day(1)), "videos_detected": 0, "notifications": {}, "crawls": {},
+            "notification_success_rate": None, "crawl_failure_rate": None,
+        }
+        today = days[2]
+        assert today["videos_detected"] == 3
+        assert today["notifications"] == {"sent": 3, "failed": 1, "pending": 1}
+        assert today["notification_success_rate"] == 0.75
+        assert today["crawl_failure_rate"] == 0.5
+
+    def test_filter_by_schedule(self, db_client, seeded, admin_auth):
+        response = db_client.get(
+            STATS_URL, headers=admin_auth, params={"days": 3, "schedule_id": str(SCHEDULE_UUID)}
+        )
+
+        days = response.json()["days"]
+        assert days[2]["videos_detected"] == 2
+        assert days[0]["crawls"] == {}
+        assert days[2]["notification_success_rate"] == pytest.approx(2 / 3)
+
+    def test_unknown_schedule_has_no_activity(self, db_client, seeded, admin_auth):
+        response = db_client.get(
+            STATS_URL, headers=admin_auth, params={"days": 2, "schedule_id": "nope"}
+        )
+
+        assert [d["videos_detected"] for d in response.json()["days"]] == [0, 0]
@@ -0,0 +1,82 @@
+"""
+Tests for the async SQLite engines.
+"""
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import Settings
+from app.db import Database
+from app.db.engine import async_database_url
+
+
+@pytest_asyncio.fixture
+async def database(tmp_path):
+    db = Database(f"sqlite:///{tmp_path / 'test.db'}", Settings(DB_READER_POOL_SIZE=2))
+    async with db.write() as session:
+        await session.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)"))
+    yield db
+    await db.dispose()
+
+
+async def _pragma(session, name):
+    return (await session.execute(text(f"PRAGMA {name}"))).scalar_one()
+
+
+class TestAsyncDatabaseUrl:
+    """Tests for async_database_url."""
+
+    def test_converts_sqlite_url(self):
+        assert async_database_url("sqlite:///./dev.db") == "sqlite+aiosqlite:///./dev.db"
+
+    def test_rejects_other_databases(self):
+        with pytest.raises(ValueError):
+            async_database_url("postgresql://localhost/db")
+
+
+class TestDatabase:
+    """Tests for Database."""
+
+    @pytest.mark.asyncio
+    async def test_pragmas_applied(self, database):
+        """Every connection gets the tuned PRAGMAs."""
+        async with database.read() as session:
+            assert (await _pragma(session, "journal_mode")).lower() == "wal"
+            assert await _pragma(session, "synchronous") == 1  # NORMAL
+            assert await _pragma(session, "busy_timeout") == 5000
+            assert await _pragma(session, "temp_store") == 2  # MEMORY
+            assert await _pragma(session, "cache_size") == -64 * 1024
+            assert await _pragma(session, "query_only") == 1
+
+        async with database.write() as session:
+            assert await _pragma(session, "query_only") == 0
+
+    @pytest.mark.asyncio
+    async def test_writer_has_single_connection(self, database):
+        """All writes share one pooled connection."""
+        assert database.writer.pool.size() == 1
+        assert database.reader.pool.size() == 2
+
+    @pytest.mark.asyncio
+    async def test_readers_are_read_only(self, database):
+        """Reader sessions cannot modify the database."""
+        with pytest.raises(OperationalError):
+            async with database.read() as session:
+                await session.execute(text("INSERT INTO items (name) VALUES ('x')"))
+
+    @pytest.mark.asyncio
+    async def test_reads_do_not_wait_for_open_write(self, database):
+        """A reader sees the last committed state while a write is in progress."""
+        async with database.write() as session:
+            await session.execute(text("INSERT INTO items (name) VALUES ('committed')"))
+
+        async with database.write() as writer:
+            await writer.execute(text("INSERT INTO items (name) VALUES ('pending')"))
+            async with database.read() as reader:
+                names = (await reader.execute(text("SELECT name FROM items"))).scalars().all()
+            assert names == ["committed"]
+
+        async with database.read() as reader:
+            count = (await reader.execute(text("SELECT COUNT(*) FROM items"))).scalar_one()
+        assert count == 2
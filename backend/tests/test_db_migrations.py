@@ -0,0 +1,344 @@
+"""
+Tests for versioned schema migrations.
+"""
+import sqlite3
+import uuid
+
+import pytest
+
+from app.core.ids import uuid_blob
+from app.db.migrations import (
+    MIGRATIONS,
+    Backfill,
+    Migration,
+    TableRebuild,
+    connect,
+    get_schema_version,
+    run_migrations,
+)
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = connect(tmp_path / "test.db")
+    yield conn
+    conn.close()
+
+
+def _tables(conn):
+    rows = conn.execute(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'"
+    )
+    return {row[0] for row in rows}
+
+
+def _indexes(conn, table):
+    return {row[1] for row in conn.execute(f"PRAGMA index_list({table})")}
+
+
+class TestRunMigrations:
+    """Tests for run_migrations."""
+
+    def test_fresh_database(self, conn):
+        """A new database gets the full schema and the latest version."""
+        applied = run_migrations(conn)
+
+        assert applied == [m.version for m in MIGRATIONS]
+        assert get_schema_version(conn) == LATEST_VERSION
+        assert {
+            "crawl_schedules", "video_records", "notification_logs", "crawl_execution_logs"
+        } <= _tables(conn)
+        assert "idx_video_records_detected_at" in _indexes(conn, "video_records")
+
+    def test_rerun_is_noop(self, conn):
+        """Running again applies nothing."""
+        run_migrations(conn)
+        assert run_migrations(conn) == []
+        assert get_schema_version(conn) == LATEST_VERSION
+
+    def test_only_pending_steps_run(self, conn):
+        """Steps at or below the recorded version are skipped."""
+        migrations = (
+            Migration(1, "one", ("CREATE TABLE one (x)",)),
+            Migration(2, "two", ("CREATE TABLE two (x)",)),
+        )
+        run_migrations(conn, migrations[:1])
+        conn.execute("DROP TABLE one")
+
+        assert run_migrations(conn, migrations) == [2]
+        assert _tables(conn) == {"two"}
+
+    def test_failed_group_is_rolled_back(self, conn):
+        """A failing step leaves tables and version untouched."""
+        migrations = (
+            Migration(1, "ok", ("CREATE TABLE one (x)",)),
+            Migration(2, "broken", ("CREATE TABLE two (x)", "NOT VALID SQL")),
+        )
+        with pytest.raises(sqlite3.OperationalError):
+            run_migrations(conn, migrations)
+
+        assert get_schema_version(conn) == 0
+        assert _tables(conn) == set()
+
+
+class TestOnlineRebuild:
+    """Tests for batched table rebuilds."""
+
+    REBUILD = Migration(
+        version=2,
+        description="Add rank column and index",
+        rebuild=TableRebuild(
+            table="items",
+            create_sql="CREATE TABLE {table} (name TEXT NOT NULL, rank INTEGER NOT NULL)",
+            columns=("name", "rank"),
+            select=("name", "length(name)"),
+            indexes=(("idx_items_rank", "CREATE INDEX idx_items_rank ON {table}(rank)"),),
+        ),
+    )
+
+    @pytest.fixture
+    def items(self, conn):
+        run_migrations(conn, (Migration(1, "items", ("CREATE TABLE items (name TEXT NOT NULL)",)),))
+        conn.executemany(
+            "INSERT INTO items (name) VALUES (?)", [("x" * (i % 7 + 1),) for i in range(1000)]
+        )
+        return conn
+
+    def test_rebuild_copies_rows_in_batches(self, items):
+        """Rows keep their rowid and get the new column; progress is reported per batch."""
+        progress = []
+        applied = run_migrations(
+            items, (self.REBUILD,), batch_size=100, batch_pause=0,
+            on_progress=lambda table, copied, total: progress.append(copied),
+        )
+
+        assert applied == [2]
+        assert get_schema_version(items) == 2
+        assert len(progress) == 10
+        assert progress[-1] == 1000
+        assert items.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 1000
+        assert items.execute("SELECT rank FROM items WHERE rowid = 7").fetchone()[0] == 7
+        assert "idx_items_rank" in _indexes(items, "items")
+        assert _tables(items) == {"items"}
+
+    def test_concurrent_writes_are_mirrored(self, items, tmp_path):
+        """Inserts, updates and deletes made during the copy end up in the new table."""
+        other = sqlite3.connect(tmp_path / "test.db", isolation_level=None)
+
+        def write_during_copy(table, copied, total):
+            if copied == 100:
+                other.execute("INSERT INTO items (name) VALUES ('new-row')")
+                other.execute("UPDATE items SET name = 'changed' WHERE rowid = 500")
+                other.execute("UPDATE items SET name = 'early' WHERE rowid = 50")
+                other.execute("DELETE FROM items WHERE rowid IN (10, 900)")
+
+        run_migrations(items, (self.REBUILD,), batch_size=100, batch_pause=0,
+                       on_progress=write_during_copy)
+        other.close()
+
+        rows = dict(items.execute("SELECT rowid, name FROM items"))
+        assert len(rows) == 999
+        assert rows[1001] == "new-row"
+        assert rows[500] == "changed"
+        assert rows[50] == "early"
+        assert 10 not in rows and 900 not in rows
+        assert items.execute("SELECT rank FROM items WHERE rowid = 500").fetchone()[0] == 7
+
+
+    def test_old_indexes_stay_until_the_swap(self, conn, tmp_path):
+        """A unique index is rebuilt under a staging name; upserts keep working meanwhile."""
+        run_migrations(conn, (Migration(1, "items", (
+            "CREATE TABLE items (name TEXT NOT NULL)",
+            "CREATE UNIQUE INDEX idx_items_name ON items(name)",
+        )),))
+        conn.executemany("INSERT INTO items (name) VALUES (?)", [(f"n{i}",) for i in range(500)])
+        rebuild = Migration(2, "rank", rebuild=TableRebuild(
+            table="items",
+            create_sql="CREATE TABLE {table} (name TEXT NOT NULL, rank INTEGER NOT NULL)",
+            columns=("name", "rank"),
+            select=("name", "length(name)"),
+            indexes=(("idx_items_name", "CREATE UNIQUE INDEX idx_items_name ON {table}(name)"),),
+        ))
+        other = sqlite3.connect(tmp_path / "test.db", isolation_level=None)
+        live_indexes = []
+
+        def upsert_during_copy(table, copied, total):
+            live_indexes.append(_indexes(other, "items"))
+            for _ in range(2):
+                other.execute(
+                    "INSERT INTO items (name) VALUES ('n1') ON CONFLICT(name) DO NOTHING"
+                )
+            other.execute(f"INSERT INTO items (name) VALUES ('new{copied}')")
+
+        run_migrations(conn, (rebuild,), batch_size=100, batch_pause=0,
+                       on_progress=upsert_during_copy)
+
+        assert all(indexes == {"idx_items_name"} for indexes in live_indexes)
+        assert _indexes(conn, "items") == _indexes(other, "items") == {"idx_items_name"}
+        other.close()
+        assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 505
+        assert conn.execute(
+            "SELECT rank FROM items INDEXED BY idx_items_name WHERE name = 'new100'"
+        ).fetchone() == (6,)
+        assert conn.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+
+    def test_rows_left_out_are_reported(self, items, caplog):
+        """Rows violating a new unique index are logged, not dropped silently."""
+        unique = Migration(2, "unique rank", rebuild=TableRebuild(
+            table="items",
+            create_sql="CREATE TABLE {table} (name TEXT NOT NULL, rank INTEGER NOT NULL)",
+            columns=("name", "rank"),
+            select=("name", "length(name)"),
+            indexes=(("idx_items_rank", "CREATE UNIQUE INDEX idx_items_rank ON {table}(rank)"),),
+        ))
+
+        run_migrations(items, (unique,), batch_size=100, batch_pause=0)
+
+        assert items.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 7
+        assert "Rebuild of items left out 993 rows" in caplog.text
+
+
+class TestOnlineBackfill:
+    """Tests for batched column backfills."""
+
+    BACKFILL = Migration(
+        version=2,
+        description="Add rank column and unique index",
+        backfill=Backfill(
+            table="items",
+            column="rank",
+            definition="INTEGER",
+            value="rowid * 10 + length(name)",
+            finish=("CREATE UNIQUE INDEX idx_items_rank ON items(rank)",),
+        ),
+    )
+
+    @pytest.fixture
+    def items(self, conn):
+        run_migrations(conn, (Migration(1, "items", ("CREATE TABLE items (name TEXT NOT NULL)",)),))
+        conn.executemany("INSERT INTO items (name) VALUES (?)", [("x",)] * 1000)
+        return conn
+
+    def test_fills_in_batches_then_finishes(self, items, tmp_path):
+        """Rows inserted during the backfill are filled before the index is built."""
+        other = sqlite3.connect(tmp_path / "test.db", isolation_level=None)
+        indexes_seen = []
+
+        def write_during_fill(table, filled, total):
+            indexes_seen.append("idx_items_rank" in _indexes(other, "items"))
+            if filled == 100:
+                other.execute("INSERT INTO items (name) VALUES ('new')")
+
+        applied = run_migrations(items, (self.BACKFILL,), batch_size=100, batch_pause=0,
+                                 on_progress=write_during_fill)
+        other.close()
+
+        assert applied == [2]
+        assert len(indexes_seen) == 10 and not any(indexes_seen)
+        assert items.execute("SELECT COUNT(*) FROM items WHERE rank IS NULL").fetchone()[0] == 0
+        assert items.execute("SELECT rank FROM items WHERE rowid = 1001").fetchone()[0] == 10013
+        assert "idx_items_rank" in _indexes(items, "items")
+
+    def test_interrupted_backfill_resumes(self, items):
+        """A run that failed after adding the column can be retried."""
+        failing = Migration(2, "fails", backfill=Backfill(
+            table="items", column="rank", definition="INTEGER", value="rowid",
+            finish=("SELECT no_such_function()",),
+        ))
+        with pytest.raises(sqlite3.OperationalError):
+            run_migrations(items, (failing,), batch_size=100, batch_pause=0)
+        assert get_schema_version(items) == 1
+
+        assert run_migrations(items, (self.BACKFILL,), batch_pause=0) == [2]
+        assert items.execute("SELECT rank FROM items WHERE rowid = 7").fetchone()[0] == 71
+
+
+class TestIntegerKeyMigration:
+    """Tests for re-keying the v5 TEXT-id schema on integer rowids."""
+
+    SCHEDULE_UUID = "0b6f2c1e-9d8a-4c57-8e3f-1a2b3c4d5e6f"
+
+    @pytest.fixture
+    def legacy(self, conn):
+        run_migrations(conn, [m for m in MIGRATIONS if m.version <= 5])
+        conn.executemany(
+            "INSERT INTO crawl_schedules (id, url, interval) VALUES (?, 'https://e.com', 5)",
+            [(self.SCHEDULE_UUID,), ("legacy-schedule",)],
+        )
+        conn.executemany(
+            "INSERT INTO video_records (id, title, url, schedule_id) VALUES (?, ?, ?, ?)",
+            [
+                ("v1", "Python tutorial", "https://e.com/1", self.SCHEDULE_UUID),
+                ("v2", "Cooking", "https://e.com/2", "legacy-schedule"),
+                ("v3", "Orphan", "https://e.com/3", "deleted-schedule"),
+            ],
+        )
+        conn.executemany(
+            "INSERT INTO notification_logs (id, video_id, schedule_id, status) "
+            "VALUES (?, ?, ?, 'sent')",
+            [("n1", "v1", self.SCHEDULE_UUID), ("n2", "v2", "legacy-schedule"),
+             ("n3", "deleted-video", "legacy-schedule")],
+        )
+        conn.execute(
+            "INSERT INTO crawl_execution_logs (id, schedule_id, started_at, status) "
+            "VALUES ('c1', 'legacy-schedule', '2024-01-01 00:00:00', 'success')"
+        )
+        return conn
+
+    def test_foreign_keys_follow_parents(self, legacy):
+        run_migrations(legacy)
+
+        rows = legacy.execute(
+            "SELECT v.title, s.uuid, s.url FROM notification_logs AS n "
+            "JOIN video_records AS v ON v.id = n.video_id "
+            "JOIN crawl_schedules AS s ON s.id = n.schedule_id ORDER BY n.id"
+        ).fetchall()
+        assert rows == [
+            ("Python tutorial", uuid.UUID(self.SCHEDULE_UUID).bytes, "https://e.com"),
+            ("Cooking", uuid_blob("legacy-schedule"), "https://e.com"),
+        ]
+        assert legacy.execute(
+            "SELECT s.uuid FROM crawl_execution_logs AS c "
+            "JOIN crawl_schedules AS s ON s.id = c.schedule_id"
+        ).fetchall() == [(uuid_blob("legacy-schedule"),)]
+        assert legacy.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+
+    def test_orphans_are_kept_and_counts_follow(self, legacy):
+        """Rows whose parent is gone keep a parent id of 0."""
+        run_migrations(legacy)
+
+        stats = dict(legacy.execute("SELECT table_name, row_count FROM table_stats"))
+        assert stats["video_records"] == 3
+        assert stats["notification_logs"] == 3
+        assert legacy.execute(
+            "SELECT title, schedule_id FROM video_records WHERE schedule_id = 0"
+        ).fetchall() == [("Orphan", 0)]
+        assert legacy.execute(
+            "SELECT uuid, video_id FROM notification_logs WHERE video_id = 0"
+        ).fetchall() == [(uuid_blob("n3"), 0)]
+
+    def test_search_index_survives(self, legacy):
+        run_migrations(legacy)
+        legacy.execute(
+            "INSERT INTO video_records (uuid, title, url, schedule_id) "
+            "VALUES (randomblob(16), 'Python again', 'https://e.com/4', 1)"
+        )
+
+        titles = legacy.execute(
+            "SELECT v.title FROM video_records_fts JOIN video_records AS v "
+            "ON v.id = video_records_fts.rowid WHERE video_records_fts MATCH 'python' "
+            "ORDER BY v.id"
+        ).fetchall()
+        assert titles == [("Python tutorial",), ("Python again",)]
+
+    def test_notification_ids_are_never_reused(self, legacy):
+        run_migrations(legacy)
+        legacy.execute("DELETE FROM notification_logs")
+        legacy.execute(
+            "INSERT INTO notification_logs (uuid, video_id, schedule_id, status) "
+            "VALUES (randomblob(16), 1, 1, 'pending')"
+        )
+
+        assert legacy.execute("SELECT id FROM notification_logs").fetchone()[0] > 2
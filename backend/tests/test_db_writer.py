@@ -0,0 +1,187 @@
+"""
+Tests for the single-writer actor.
+"""
+import asyncio
+import sqlite3
+
+import pytest
+from sqlalchemy import text
+
+from app.db import DatabaseWriter, WriteError
+
+
+def insert_schedule(schedule_id):
+    async def command(session):
+        await session.execute(text(
+            "INSERT INTO crawl_schedules (id, uuid, url, interval) "
+            "VALUES (:id, randomblob(16), 'https://e.com', 5)"
+        ), {"id": schedule_id})
+        return schedule_id
+    return command
+
+
+async def schedule_ids(database):
+    async with database.read() as session:
+        result = await session.execute(text("SELECT id FROM crawl_schedules ORDER BY id"))
+        return [row[0] for row in result]
+
+
+class TestDatabaseWriter:
+    """Tests for DatabaseWriter."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_writes_share_transactions(self, database):
+        writer = DatabaseWriter(database, max_batch=10, max_delay=0.05)
+        writer.start()
+        try:
+            results = await asyncio.gather(*(
+                writer.submit(insert_schedule(10 + i)) for i in range(25)
+            ))
+        finally:
+            await writer.stop()
+
+        assert results == list(range(10, 35))
+        assert len(await schedule_ids(database)) == 26
+        assert writer.metrics.completed == 25
+        assert writer.metrics.transactions == 3
+        assert writer.metrics.mean_batch_size == pytest.approx(25 / 3)
+
+    @pytest.mark.asyncio
+    async def test_failing_command_does_not_affect_batch(self, database):
+        writer = DatabaseWriter(database, max_delay=0.05)
+        writer.start()
+        try:
+            results = await asyncio.gather(
+                writer.submit(insert_schedule(2)),
+                writer.submit(insert_schedule(1)),  # duplicate primary key
+                writer.submit(insert_schedule(3)),
+                return_exceptions=True,
+            )
+        finally:
+            await writer.stop()
+
+        assert results[0] == 2 and results[2] == 3
+        assert "UNIQUE constraint failed" in str(results[1])
+        assert await schedule_ids(database) == [1, 2, 3]
+        assert (writer.metrics.completed, writer.metrics.failed) == (2, 1)
+        assert writer.metrics.transactions == 1
+
+    @pytest.mark.asyncio
+    async def test_backpressure(self, database):
+        """Submits beyond the queue size wait and are counted."""
+        writer = DatabaseWriter(database, max_batch=1, max_delay=0, max_queue=2)
+        writer.start()
+        try:
+            await asyncio.gather(*(writer.submit(insert_schedule(10 + i)) for i in range(10)))
+        finally:
+            await writer.stop()
+
+        assert writer.metrics.blocked_submits > 0
+        assert writer.metrics.max_queue_depth <= 2
+        assert writer.metrics.queue_depth == 0
+
+    @pytest.mark.asyncio
+    async def test_stop_drains_queue(self, database):
+        writer = DatabaseWriter(database, max_delay=0.05)
+        writer.start()
+        pending = [asyncio.create_task(writer.submit(insert_schedule(10 + i))) for i in range(5)]
+        await asyncio.sleep(0)
+        await writer.stop()
+
+        assert [task.result() for task in pending] == list(range(10, 15))
+
+    @pytest.mark.asyncio
+    async def test_cancelled_command_fails_alone(self, database):
+        """A command raising CancelledError does not stop the actor."""
+        async def cancelled(session):
+            raise asyncio.CancelledError
+
+        writer = DatabaseWriter(database, max_delay=0.05)
+        writer.start()
+        try:
+            results = await asyncio.gather(
+                writer.submit(insert_schedule(2)),
+                writer.submit(cancelled),
+                return_exceptions=True,
+            )
+            later = await writer.submit(insert_schedule(3))
+        finally:
+            await writer.stop()
+
+        assert results[0] == 2
+        assert isinstance(results[1], WriteError)
+        assert isinstance(results[1].__cause__, asyncio.CancelledError)
+        assert later == 3
+
+    @pytest.mark.asyncio
+    async def test_dead_actor_fails_waiting_commands(self, database):
+        """If the actor task dies, its batch and the queued commands fail instead of hanging."""
+        class Fatal(BaseException):
+            pass
+
+        async def fatal(session):
+            raise Fatal
+
+        writer = DatabaseWriter(database, max_batch=1, max_delay=0)
+        writer.start()
+        results = await asyncio.wait_for(asyncio.gather(
+            writer.submit(fatal),
+            writer.submit(insert_schedule(2)),
+            return_exceptions=True,
+        ), timeout=5)
+
+        assert all(isinstance(result, WriteError) for result in results)
+        with pytest.raises(RuntimeError):
+            await writer.submit(insert_schedule(3))
+        await writer.stop()
+        assert await schedule_ids(database) == [1]
+
+    @pytest.mark.asyncio
+    async def test_commit_failure_gives_each_caller_its_error(self, database, monkeypatch):
+        writer = DatabaseWriter(database, max_delay=0.05)
+        failure = sqlite3.OperationalError("disk I/O error")
+
+        async def failing_batch(batch, isolate):
+            raise failure
+
+        monkeypatch.setattr(writer, "_run_batch", failing_batch)
+        writer.start()
+        try:
+            results = await asyncio.gather(
+                writer.submit(insert_schedule(2)),
+                writer.submit(insert_schedule(3)),
+                return_exceptions=True,
+            )
+        finally:
+            await writer.stop()
+
+        assert all(isinstance(result, WriteError) for result in results)
+        assert results[0] is not results[1]
+        assert results[0].__cause__ is results[1].__cause__ is failure
+
+    @pytest.mark.asyncio
+    async def test_submit_requires_running_writer(self, database):
+        with pytest.raises(RuntimeError):
+            await DatabaseWriter(database).submit(insert_schedule(2))
+
+
+class TestWriterStatsEndpoint:
+    """Tests for GET /api/v1/admin/stats/writer."""
+
+    def test_reports_metrics(self, db_client, admin_auth):
+        from app.main import app
+
+        writer = DatabaseWriter(app.state.db)
+        writer.metrics.submitted = writer.metrics.completed = 6
+        writer.metrics.transactions = 2
+        app.state.writer = writer
+        try:
+            response = db_client.get("/api/v1/admin/stats/writer", headers=admin_auth)
+        finally:
+            del app.state.writer
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["completed"] == 6
+        assert data["mean_batch_size"] == 3.0
+        assert data["blocked_submits"] == 0
@@ -0,0 +1,57 @@
+"""
+Tests for bulk video ingest.
+"""
+import pytest
+from sqlalchemy import text
+
+from app.repositories.video_records import ExtractedVideo
+from app.services.ingest import ingest_videos
+
+
+async def _scalar(database, sql):
+    async with database.read() as session:
+        return (await session.execute(text(sql))).scalar_one()
+
+
+class TestIngestVideos:
+    """Tests for ingest_videos."""
+
+    @pytest.mark.asyncio
+    async def test_new_videos_get_pending_notifications(self, database):
+        """Each new video is stored with one pending notification."""
+        videos = [ExtractedVideo(f"V{i}", f"https://e.com/{i}") for i in range(5)]
+        async with database.write() as session:
+            result = await ingest_videos(session, 1, videos)
+
+        assert len(result.new_videos) == 5
+        assert result.duplicates == 0
+        assert result.notifications_queued == 5
+        assert await _scalar(
+            database, "SELECT COUNT(*) FROM notification_logs WHERE status = 'pending'"
+        ) == 5
+
+    @pytest.mark.asyncio
+    async def test_known_videos_are_not_notified_again(self, database):
+        """Re-ingesting the same page only stores and notifies what is new."""
+        async with database.write() as session:
+            await ingest_videos(session, 1, [ExtractedVideo("A", "https://e.com/a")])
+        async with database.write() as session:
+            result = await ingest_videos(session, 1, [
+                ExtractedVideo("A", "https://e.com/a"),
+                ExtractedVideo("B", "https://e.com/b"),
+            ])
+
+        assert [v.video.title for v in result.new_videos] == ["B"]
+        assert result.duplicates == 1
+        assert await _scalar(database, "SELECT COUNT(*) FROM notification_logs") == 2
+
+    @pytest.mark.asyncio
+    async def test_failure_rolls_back_everything(self, database):
+        """Records and notifications are committed together or not at all."""
+        with pytest.raises(RuntimeError):
+            async with database.write() as session:
+                await ingest_videos(session, 1, [ExtractedVideo("A", "https://e.com/a")])
+                raise RuntimeError("crawl aborted")
+
+        assert await _scalar(database, "SELECT COUNT(*) FROM video_records") == 0
+        assert await _scalar(database, "SELECT COUNT(*) FROM notification_logs") == 0
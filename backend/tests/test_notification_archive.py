@@ -0,0 +1,333 @@
+"""
+Tests for notification log archival and listing across archives.
+"""
+import asyncio
+import dataclasses
+import sqlite3
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlalchemy import text
+
+from app.core.config import settings_registry
+from app.core.pagination import encode_cursor
+from app.db import Database
+from app.db.archive import (
+    archive_file,
+    archive_notification_logs,
+    list_archives,
+    migrate_archives,
+)
+from app.db.migrations import connect
+from app.services.notification_logs import list_notification_logs_page
+from tests.conftest import uid
+
+LOGS_URL = "/api/v1/admin/notification-logs"
+
+
+# Two logs per day on the 10th and 20th of Jan-Apr 2024
+SENT_AT = [
+    f"2024-{month:02d}-{day} {hour:02d}:00:00"
+    for month in (1, 2, 3, 4)
+    for day in (10, 20)
+    for hour in (8, 9)
+]
+
+
+@pytest.fixture
+def seeded(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "INSERT INTO crawl_schedules (id, uuid, url, interval) VALUES (1, ?, 'https://e.com', 5)",
+        (uuid.UUID(uid("s1")).bytes,),
+    )
+    conn.execute(
+        "INSERT INTO video_records (id, uuid, title, url, schedule_id) "
+        "VALUES (1, ?, 'Video', 'https://e.com/v', 1)",
+        (uuid.UUID(uid("v1")).bytes,),
+    )
+    # Log i has id i and public id uid("n<i>")
+    conn.executemany(
+        "INSERT INTO notification_logs (id, uuid, video_id, schedule_id, status, sent_at) "
+        "VALUES (?, ?, 1, 1, ?, ?)",
+        [(i, uuid.UUID(uid(f"n{i:02d}")).bytes, "failed" if i % 4 == 0 else "sent", sent_at)
+         for i, sent_at in enumerate(SENT_AT)],
+    )
+    conn.commit()
+    conn.close()
+
+
+@pytest.fixture
+def archive_dir(tmp_path, monkeypatch):
+    """Archive directory used by the API for the duration of a test."""
+    path = tmp_path / "archive"
+    snapshot = settings_registry.snapshot
+    patched = snapshot.settings.model_copy(update={"NOTIFICATION_ARCHIVE_DIR": str(path)})
+    monkeypatch.setattr(settings_registry, "_snapshot", dataclasses.replace(snapshot, settings=patched))
+    return path
+
+
+def _archive(db_path, archive_dir, before="2024-03-15 00:00:00", **kwargs):
+    conn = connect(db_path)
+    try:
+        return archive_notification_logs(
+            conn, archive_dir, datetime.fromisoformat(before), batch_pause=0, **kwargs
+        )
+    finally:
+        conn.close()
+
+
+def _hot_ids(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return {row[0] for row in conn.execute("SELECT id FROM notification_logs")}
+    finally:
+        conn.close()
+
+
+def _pages(client, headers, **params):
+    ids, cursor = [], None
+    while True:
+        query = dict(params, **({"cursor": cursor} if cursor else {}))
+        response = client.get(LOGS_URL, headers=headers, params=query)
+        assert response.status_code == 200
+        data = response.json()
+        ids.extend(item["id"] for item in data["items"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            return ids
+
+
+class TestArchiver:
+    """Tests for archive_notification_logs."""
+
+    def test_moves_old_rows_by_month(self, db_path, seeded, archive_dir):
+        moved = _archive(db_path, archive_dir, batch_size=3)
+
+        assert moved == {"2024-01": 4, "2024-02": 4, "2024-03": 2}
+        assert [a.month for a in list_archives(archive_dir)] == ["2024-03", "2024-02", "2024-01"]
+        assert _hot_ids(db_path) == set(range(10, 16))
+
+        conn = sqlite3.connect(archive_file(archive_dir, "2024-03").path)
+        assert conn.execute("SELECT id, uuid FROM notification_logs ORDER BY id").fetchall() == [
+            (8, uuid.UUID(uid("n08")).bytes), (9, uuid.UUID(uid("n09")).bytes)
+        ]
+        conn.close()
+
+    def test_row_counts_follow(self, db_path, seeded, archive_dir):
+        _archive(db_path, archive_dir)
+
+        conn = sqlite3.connect(db_path)
+        count = conn.execute(
+            "SELECT row_count FROM table_stats WHERE table_name = 'notification_logs'"
+        ).fetchone()[0]
+        conn.close()
+        assert count == 6
+
+    def test_rerun_is_idempotent(self, db_path, seeded, archive_dir):
+        _archive(db_path, archive_dir)
+
+        assert _archive(db_path, archive_dir) == {}
+
+    def test_interrupted_move_is_completed(self, db_path, seeded, archive_dir):
+        """Rows left in both places by a crash are not duplicated on re-run."""
+        _archive(db_path, archive_dir, before="2024-02-01 00:00:00")
+        conn = sqlite3.connect(db_path)
+        conn.execute(
+            "INSERT INTO notification_logs (id, uuid, video_id, schedule_id, status, sent_at) "
+            "VALUES (0, ?, 1, 1, 'failed', ?)",
+            (uuid.UUID(uid("n00")).bytes, SENT_AT[0]),
+        )
+        conn.commit()
+        conn.close()
+
+        assert _archive(db_path, archive_dir, before="2024-02-01 00:00:00") == {"2024-01": 1}
+        conn = sqlite3.connect(archive_file(archive_dir, "2024-01").path)
+        assert conn.execute("SELECT COUNT(*) FROM notification_logs").fetchone()[0] == 4
+        conn.close()
+
+    def test_stuck_batch_stops_the_month(self, db_path, seeded, archive_dir):
+        """A row the archive cannot take is left in place instead of retried forever."""
+        _archive(db_path, archive_dir, before="2024-01-10 08:30:00")
+        conn = sqlite3.connect(archive_file(archive_dir, "2024-01").path)
+        # Another log with n01's uuid: n01's copy is ignored
+        conn.execute(
+            "INSERT INTO notification_logs (id, uuid, video_id, schedule_id, status, sent_at) "
+            "VALUES (99, ?, 1, 1, 'sent', '2024-01-31 00:00:00')",
+            (uuid.UUID(uid("n01")).bytes,),
+        )
+        conn.commit()
+        conn.close()
+
+        moved = _archive(db_path, archive_dir, batch_size=1)
+
+        assert moved == {"2024-01": 2, "2024-02": 4, "2024-03": 2}
+        assert _hot_ids(db_path) == {1, *range(10, 16)}
+
+
+@pytest.fixture
+def legacy_archive(archive_dir):
+    """A December 2023 archive in the TEXT-keyed format, one log of a deleted video."""
+    archive_dir.mkdir()
+    conn = sqlite3.connect(archive_file(archive_dir, "2023-12").path)
+    conn.execute(
+        "CREATE TABLE notification_logs (id TEXT PRIMARY KEY, video_id TEXT NOT NULL, "
+        "schedule_id TEXT NOT NULL, status TEXT NOT NULL, error_details TEXT, "
+        "sent_at TIMESTAMP NOT NULL)"
+    )
+    conn.execute(
+        "CREATE INDEX idx_notification_logs_sent_at ON notification_logs(sent_at DESC, id)"
+    )
+    conn.executemany(
+        "INSERT INTO notification_logs VALUES (?, ?, ?, 'sent', NULL, ?)",
+        [
+            (uid("old2"), uid("gone"), uid("s1"), "2023-12-20 08:00:00"),
+            (uid("old1"), uid("v1"), uid("s1"), "2023-12-10 08:00:00"),
+        ],
+    )
+    conn.commit()
+    conn.close()
+
+
+class TestArchiveUpgrade:
+    """Tests for upgrading archive files written before integer keys."""
+
+    def test_rekeys_legacy_archive(self, db_path, seeded, archive_dir, legacy_archive):
+        assert migrate_archives(db_path, archive_dir) == {"2023-12": 2}
+
+        conn = sqlite3.connect(archive_file(archive_dir, "2023-12").path)
+        assert conn.execute(
+            "SELECT id, uuid, video_id, schedule_id FROM notification_logs ORDER BY id"
+        ).fetchall() == [
+            # New ids come after the main database's, in sent_at order
+            (16, uuid.UUID(uid("old1")).bytes, 1, 1),
+            (17, uuid.UUID(uid("old2")).bytes, 0, 1),
+        ]
+        conn.close()
+        assert migrate_archives(db_path, archive_dir) == {}
+
+        # Ids reserved for the archive are never handed out again
+        conn = sqlite3.connect(db_path)
+        conn.execute(
+            "INSERT INTO notification_logs (uuid, video_id, schedule_id, status) "
+            "VALUES (randomblob(16), 1, 1, 'sent')"
+        )
+        assert conn.execute("SELECT MAX(id) FROM notification_logs").fetchone()[0] == 18
+        conn.close()
+
+    def test_archiver_upgrades_first(
+        self, db_client, db_path, seeded, archive_dir, legacy_archive, admin_auth
+    ):
+        _archive(db_path, archive_dir)
+
+        response = db_client.get(LOGS_URL, headers=admin_auth, params={"limit": 100})
+
+        items = response.json()["items"]
+        assert [item["id"] for item in items[-2:]] == [uid("old2"), uid("old1")]
+        assert items[-2]["video_id"] is None
+        assert items[-1]["video_id"] == uid("v1")
+
+
+class TestListingAcrossArchives:
+    """Tests for GET /api/v1/admin/notification-logs."""
+
+    def test_requires_admin(self, db_client):
+        assert db_client.get(LOGS_URL).status_code == 401
+
+    def test_archive_is_transparent(self, db_client, db_path, seeded, archive_dir, admin_auth):
+        before = _pages(db_client, admin_auth, limit=3)
+        _archive(db_path, archive_dir)
+        after = _pages(db_client, admin_auth, limit=3)
+
+        assert after == before
+        assert after[:2] == [uid("n15"), uid("n14")]
+        assert len(after) == 16
+
+    @pytest.mark.parametrize("cursor", [encode_cursor([1], {}), encode_cursor(1, 1)])
+    def test_invalid_cursor(self, db_client, admin_auth, cursor):
+        response = db_client.get(LOGS_URL, headers=admin_auth, params={"cursor": cursor})
+
+        assert response.status_code == 400
+
+    def test_deleted_references_are_null(self, db_client, db_path, seeded, admin_auth):
+        conn = sqlite3.connect(db_path)
+        conn.execute("DELETE FROM video_records WHERE id = 1")
+        conn.commit()
+        conn.close()
+
+        response = db_client.get(LOGS_URL, headers=admin_auth, params={"limit": 1})
+
+        [item] = response.json()["items"]
+        assert item["video_id"] is None
+        assert item["schedule_id"] == uid("s1")
+
+    def test_filter_by_schedule(self, db_client, db_path, seeded, archive_dir, admin_auth):
+        _archive(db_path, archive_dir)
+
+        assert len(_pages(db_client, admin_auth, limit=5, schedule_id=uid("s1"))) == 16
+        assert _pages(db_client, admin_auth, schedule_id=uid("s2")) == []
+
+    def test_filters_apply_to_archives(self, db_client, db_path, seeded, archive_dir, admin_auth):
+        _archive(db_path, archive_dir)
+
+        ids = _pages(db_client, admin_auth, limit=2, status="failed")
+
+        assert ids == [uid(f"n{i:02d}") for i in (12, 8, 4, 0)]
+
+    def test_recent_page_does_not_open_archives(self, db_path, seeded, archive_dir, monkeypatch):
+        """A page served from the main database never attaches an archive."""
+        _archive(db_path, archive_dir)
+        database = Database(f"sqlite:///{db_path}", settings_registry.settings)
+        attached = []
+        read = database.read
+
+        def tracking_read(attach=None):
+            attached.append(attach)
+            return read(attach)
+
+        monkeypatch.setattr(database, "read", tracking_read)
+
+        async def run():
+            try:
+                first = await list_notification_logs_page(database, archive_dir, 3)
+                deep = await list_notification_logs_page(database, archive_dir, 8)
+            finally:
+                await database.dispose()
+            return first, deep
+
+        first, deep = asyncio.run(run())
+
+        assert [row.id for row in first] == [15, 14, 13]
+        assert [row.id for row in deep][-2:] == [9, 8]
+        assert attached[0] is None and attached[1] is None
+        assert len(attached) == 3
+
+    def test_archive_dir_with_uri_characters(self, db_path, seeded, tmp_path):
+        """Archive paths are percent-encoded in the attach URI."""
+        archive_dir = tmp_path / "logs?mode=rw#100%"
+        _archive(db_path, archive_dir)
+        database = Database(f"sqlite:///{db_path}", settings_registry.settings)
+
+        async def run():
+            try:
+                return await list_notification_logs_page(database, archive_dir, 16)
+            finally:
+                await database.dispose()
+
+        assert [row.id for row in asyncio.run(run())] == list(range(15, -1, -1))
+
+    def test_archives_are_read_only(self, db_path, seeded, archive_dir):
+        _archive(db_path, archive_dir)
+        database = Database(f"sqlite:///{db_path}", settings_registry.settings)
+        archive = list_archives(archive_dir)[0]
+
+        async def run():
+            try:
+                async with database.read(attach={"archive": archive.uri}) as session:
+                    await session.execute(text("DELETE FROM archive.notification_logs"))
+            finally:
+                await database.dispose()
+
+        with pytest.raises(Exception, match="readonly|read-only|query_only"):
+            asyncio.run(run())
@@ -0,0 +1,195 @@
+"""
+Query plan regression tests.
+
+Every repository query is run through EXPLAIN QUERY PLAN against a seeded
+database. A full table SCAN, a temporary B-tree for sorting or grouping, or
+an automatic index (a full scan building a throwaway index) fails the test,
+so a query that stops using its index shows up here instead of as a slow
+page in production. The app never runs ANALYZE, so the planner's default
+heuristics seen here are the ones production gets.
+"""
+import inspect
+import re
+import sqlite3
+
+import pytest
+
+from app.db import rollups, stats
+from app.db.archive import ARCHIVE_SCHEMA
+from app.db.migrations import connect, run_migrations
+from app.repositories import (
+    crawl_execution_logs,
+    crawl_schedules,
+    crawled_pages,
+    notification_logs,
+    video_records,
+)
+
+REPOSITORIES = (crawl_execution_logs, crawl_schedules, crawled_pages, notification_logs, video_records)
+
+# Plan steps that read more than the rows a query needs
+SLOW_STEP = re.compile(r"^SCAN |USE TEMP B-TREE|AUTOMATIC (PARTIAL )?(COVERING )?INDEX")
+# Reading the literal VALUES list of an INSERT is not a table scan
+VALUES_SCAN = re.compile(r"^SCAN \d+-ROW VALUES CLAUSE$")
+
+VIDEO_KEY = {"detected_at": "2024-06-01 00:00:00", "id": 10}
+LOG_KEY = {"sent_at": "2024-06-01 00:00:00", "id": 10}
+SEARCH_KEY = {"query": '"vid"*', "score": -1.0, "rowid": 10}
+
+
+def _plan_case(name, sql, params, allowed=()):
+    return pytest.param(sql, params, allowed, id=name)
+
+
+# (query name, SQL, parameters, allowed slow steps). Allowed steps are
+# regular expressions, each with a comment saying why the step is fine.
+CASES = [
+    _plan_case("video_records.LIST_VIDEOS_SQL", video_records.LIST_VIDEOS_SQL,
+               {**VIDEO_KEY, "limit": 20}),
+    _plan_case("video_records.LIST_VIDEOS_BY_SCHEDULE_SQL", video_records.LIST_VIDEOS_BY_SCHEDULE_SQL,
+               {**VIDEO_KEY, "schedule_id": 2, "limit": 20}),
+    _plan_case("video_records.insert_new_videos_sql", video_records.insert_new_videos_sql(2), {
+        f"{column}_{i}": None for column in video_records.INSERT_COLUMNS for i in range(2)
+    }),
+    _plan_case("video_records.known_url_hashes_sql", video_records.known_url_hashes_sql(3),
+               {"h0": 1, "h1": 2, "h2": 3}),
+    # Ranking has to score and sort every match; the FTS "scans" are index
+    # lookups (MATCH, and rowid plus MATCH per page row), and the page CTE
+    # holds at most :limit rows
+    _plan_case("video_records.SEARCH_VIDEOS_SQL", video_records.SEARCH_VIDEOS_SQL,
+               {**SEARCH_KEY, "limit": 20},
+               allowed=(r"^SCAN video_records_fts VIRTUAL TABLE INDEX 0:=?M",
+                        r"^USE TEMP B-TREE FOR ORDER BY$",
+                        r"^SCAN page$")),
+    _plan_case("notification_logs.INSERT_NOTIFICATION_SQL", notification_logs.INSERT_NOTIFICATION_SQL,
+               {"uuid": b"x", "video_id": 1, "schedule_id": 1, "status": "pending"}),
+    _plan_case("notification_logs.UPDATE_NOTIFICATION_STATUS_SQL",
+               notification_logs.UPDATE_NOTIFICATION_STATUS_SQL,
+               {"id": 1, "status": "sent", "error_details": None}),
+    *(
+        _plan_case(f"notification_logs.list_notification_logs_sql[{schema}-{by_schedule}-{by_status}]",
+                   notification_logs.list_notification_logs_sql(schema, by_schedule, by_status),
+                   {**LOG_KEY, "schedule_id": 2, "status": "failed", "limit": 20})
+        for schema in ("main", "archive")
+        for by_schedule in (False, True)
+        for by_status in (False, True)
+    ),
+    _plan_case("crawl_execution_logs.INSERT_CRAWL_LOG_SQL", crawl_execution_logs.INSERT_CRAWL_LOG_SQL,
+               {"uuid": b"x", "schedule_id": 1, "started_at": None, "finished_at": None,
+                "status": "success", "error_details": None}),
+    _plan_case("crawl_execution_logs.NEXT_LOGGED_SCHEDULE_SQL",
+               crawl_execution_logs.NEXT_LOGGED_SCHEDULE_SQL, {"after": 1}),
+    _plan_case("crawl_execution_logs.OLD_LOGS_SQL", crawl_execution_logs.OLD_LOGS_SQL,
+               {"schedule_id": 2, "started_at": "2024-06-01 00:00:00", "rowid": 10, "limit": 500}),
+    _plan_case("crawl_execution_logs.delete_logs_sql", crawl_execution_logs.delete_logs_sql(3),
+               {"r0": 1, "r1": 2, "r2": 3}),
+    _plan_case("crawl_schedules.SCHEDULE_ID_BY_UUID_SQL", crawl_schedules.SCHEDULE_ID_BY_UUID_SQL,
+               {"uuid": b"x"}),
+    _plan_case("crawled_pages.GET_CRAWLED_PAGE_SQL", crawled_pages.GET_CRAWLED_PAGE_SQL,
+               {"url": "https://e.com"}),
+    _plan_case("crawled_pages.SAVE_CRAWLED_PAGE_SQL", crawled_pages.SAVE_CRAWLED_PAGE_SQL,
+               {"url": "https://e.com", "etag": None, "last_modified": None,
+                "render_mode": "static", "crawls_since_probe": 0, "content_hash": None,
+                "content_items": 0}),
+    # table_stats has one row per counted table and is always read whole
+    _plan_case("stats.TABLE_STATS_SQL", stats.TABLE_STATS_SQL, {},
+               allowed=(r"^SCAN table_stats$",)),
+    *(
+        _plan_case(f"rollups.daily_stats_sql[{rollup.table}-{by_schedule}]",
+                   rollups.daily_stats_sql(rollup, by_schedule),
+                   {"day": "2024-06-01", "schedule_id": 2})
+        for rollup in rollups.ROLLUPS
+        for by_schedule in (False, True)
+    ),
+]
+
+
+@pytest.fixture(scope="module")
+def seeded(tmp_path_factory):
+    """A migrated database with a few thousand rows and an attached archive."""
+    path = tmp_path_factory.mktemp("plans") / "plans.db"
+    conn = connect(path)
+    run_migrations(conn)
+    conn.execute("BEGIN")
+    conn.executemany(
+        "INSERT INTO crawl_schedules (id, uuid, url, interval, is_active) "
+        "VALUES (?, randomblob(16), 'https://e.com', 5, ?)",
+        [(i, i % 2) for i in range(1, 21)],
+    )
+    conn.executemany(
+        "INSERT INTO video_records (uuid, title, description, url, url_hash, schedule_id, detected_at) "
+        "VALUES (randomblob(16), ?, 'A video', ?, ?, ?, datetime('2024-01-01', ? || ' hours'))",
+        [(f"Video {i}", f"https://e.com/{i}", i, i % 20 + 1, i) for i in range(2000)],
+    )
+    conn.executemany(
+        "INSERT INTO notification_logs (uuid, video_id, schedule_id, status, sent_at) "
+        "VALUES (randomblob(16), ?, ?, ?, datetime('2024-01-01', ? || ' hours'))",
+        [(i + 1, i % 20 + 1, "failed" if i % 7 == 0 else "sent", i) for i in range(2000)],
+    )
+    conn.executemany(
+        "INSERT INTO crawl_execution_logs (uuid, schedule_id, status, started_at) "
+        "VALUES (randomblob(16), ?, ?, datetime('2024-01-01', ? || ' hours'))",
+        [(i % 20 + 1, "failed" if i % 5 == 0 else "success", i) for i in range(4000)],
+    )
+    conn.execute("COMMIT")
+    conn.execute("ATTACH DATABASE ? AS archive", (str(path.with_name("archive.db")),))
+    for statement in ARCHIVE_SCHEMA:
+        conn.execute(statement.format(schema="archive"))
+    yield conn
+    conn.close()
+
+
+def query_plan(conn: sqlite3.Connection, sql: str, params: dict) -> list[str]:
+    """The detail column of each EXPLAIN QUERY PLAN step."""
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+
+def slow_steps(plan: list[str], allowed: tuple[str, ...] = ()) -> list[str]:
+    """Plan steps that scan or sort more than the query's own rows."""
+    return [
+        step for step in plan
+        if SLOW_STEP.search(step)
+        and not VALUES_SCAN.match(step)
+        and not any(re.search(pattern, step) for pattern in allowed)
+    ]
+
+
+class TestQueryPlans:
+    """EXPLAIN QUERY PLAN checks for every repository query."""
+
+    @pytest.mark.parametrize("sql, params, allowed", CASES)
+    def test_uses_indexes(self, seeded, sql, params, allowed):
+        plan = query_plan(seeded, sql, params)
+
+        assert slow_steps(plan, allowed) == [], "\n".join(plan)
+
+    def test_schedule_listing_seeks_by_schedule(self, seeded):
+        """A schedule's page starts at its own rows, not at the newest video overall."""
+        plan = query_plan(seeded, video_records.LIST_VIDEOS_BY_SCHEDULE_SQL,
+                          {**VIDEO_KEY, "schedule_id": 2, "limit": 20})
+
+        assert any(
+            "USING INDEX idx_video_records_schedule_detected_at (schedule_id=? AND detected_at<?)"
+            in step for step in plan
+        ), "\n".join(plan)
+
+    def test_every_repository_query_is_checked(self):
+        """New repository queries must be added to CASES."""
+        checked = {param.id.split("[")[0] for param in CASES}
+        queries = {
+            f"{module.__name__.rsplit('.', 1)[1]}.{name}"
+            for module in REPOSITORIES
+            for name, value in vars(module).items()
+            if (name.endswith("_SQL") and isinstance(value, str))
+            or (name.endswith("_sql") and inspect.isfunction(value))
+        }
+
+        assert queries - checked == set()
+
+    def test_detects_a_full_scan(self, seeded):
+        """The checker itself flags an unindexed filter and sort."""
+        plan = query_plan(
+            seeded, "SELECT id FROM video_records WHERE title = :t ORDER BY description", {"t": "x"}
+        )
+
+        assert slow_steps(plan) == ["SCAN video_records", "USE TEMP B-TREE FOR ORDER BY"]
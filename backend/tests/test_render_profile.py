@@ -0,0 +1,50 @@
+"""
+Tests for the render profile deciding which requests a browser render aborts.
+"""
+from app.core.config import Settings
+from app.crawler.browser import NO_BLOCKING, RenderProfile
+
+PAGE = "https://www.videos.example.com/latest"
+
+
+class TestRenderProfile:
+    """Tests for RenderProfile.blocks."""
+
+    def test_blocks_heavy_resource_types(self):
+        profile = RenderProfile()
+
+        assert profile.blocks("image", "https://www.videos.example.com/thumb.jpg", PAGE)
+        assert profile.blocks("media", "https://cdn.example.net/clip.m3u8", PAGE)
+        assert not profile.blocks("script", "https://www.videos.example.com/app.js", PAGE)
+        assert not profile.blocks("xhr", "https://api.videos.example.com/list", PAGE)
+
+    def test_blocks_ad_domains_and_subdomains(self):
+        profile = RenderProfile()
+
+        assert profile.blocks("script", "https://www.googletagmanager.com/gtm.js", PAGE)
+        assert profile.blocks("script", "https://securepubads.g.doubleclick.net/tag.js", PAGE)
+        assert not profile.blocks("script", "https://notdoubleclick.net/x.js", PAGE)
+
+    def test_third_party_blocking(self):
+        profile = RenderProfile(block_third_party=True)
+
+        assert not profile.blocks("script", "https://static.example.com/app.js", PAGE)
+        assert profile.blocks("script", "https://cdn.other.org/lib.js", PAGE)
+        assert not RenderProfile().blocks("script", "https://cdn.other.org/lib.js", PAGE)
+
+    def test_no_blocking(self):
+        assert not NO_BLOCKING.blocks("image", "https://doubleclick.net/ad.png", PAGE)
+
+    def test_from_settings(self):
+        settings = Settings(
+            CRAWL_RENDER_BLOCKED_RESOURCE_TYPES=["image", "stylesheet"],
+            CRAWL_RENDER_BLOCKED_DOMAINS=["ads.example.org"],
+            CRAWL_ITEM_SELECTOR="li.video",
+        )
+
+        profile = RenderProfile.from_settings(settings)
+
+        assert profile.blocks("stylesheet", "https://www.videos.example.com/site.css", PAGE)
+        assert not profile.blocks("font", "https://www.videos.example.com/a.woff2", PAGE)
+        assert profile.blocks("script", "https://ads.example.org/x.js", PAGE)
+        assert profile.item_selector == "li.video"
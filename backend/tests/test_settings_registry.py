@@ -0,0 +1,169 @@
+"""
+Tests for versioned settings snapshots and live reload.
+"""
+import logging
+import os
+
+import pytest
+from starlette.datastructures import Headers
+
+from app.core.config import RELOADABLE_SETTINGS, Settings, SettingsRegistry
+from app.core.cors import CustomCORSMiddleware
+
+
+@pytest.fixture
+def env_file(tmp_path):
+    path = tmp_path / ".env"
+    path.write_text("MONITORED_URL=https://one.example.com\n")
+    return path
+
+
+@pytest.fixture
+def registry(env_file):
+    return SettingsRegistry(
+        settings_factory=lambda: Settings(_env_file=env_file), env_file=env_file
+    )
+
+
+def _rewrite(path, text):
+    """Rewrite the env file and bump its mtime so the change is always visible."""
+    path.write_text(text)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestSettingsRegistry:
+    """Tests for SettingsRegistry."""
+
+    def test_initial_snapshot(self, registry):
+        """The first snapshot is version 1 and reads the env file."""
+        assert registry.snapshot.version == 1
+        assert registry.settings.MONITORED_URL == "https://one.example.com"
+
+    def test_snapshot_is_immutable(self, registry):
+        """Settings in a snapshot cannot be mutated in place."""
+        with pytest.raises(Exception):
+            registry.settings.MONITORED_URL = "https://other.example.com"
+
+    def test_unchanged_file_is_not_reloaded(self, registry):
+        """Polling an unchanged env file is a no-op."""
+        assert registry.reload() is False
+        assert registry.snapshot.version == 1
+
+    def test_changed_file_publishes_new_version(self, registry, env_file):
+        """Editing the env file swaps in a new snapshot and notifies subscribers once."""
+        calls = []
+        registry.subscribe(lambda previous, current: calls.append((previous, current)))
+        original = registry.snapshot
+
+        _rewrite(env_file, "MONITORED_URL=https://two.example.com\n")
+
+        assert registry.reload() is True
+        assert registry.snapshot.version == 2
+        assert registry.settings.MONITORED_URL == "https://two.example.com"
+        assert original.settings.MONITORED_URL == "https://one.example.com"
+        assert calls == [(original, registry.snapshot)]
+        assert registry.reload() is False
+
+    def test_touch_without_changes_keeps_version(self, registry, env_file):
+        """Rewriting the file with identical values does not bump the version."""
+        calls = []
+        registry.subscribe(lambda previous, current: calls.append(current))
+
+        _rewrite(env_file, env_file.read_text())
+
+        assert registry.reload() is False
+        assert registry.snapshot.version == 1
+        assert calls == []
+
+    def test_unsubscribe(self, registry, env_file):
+        """Unsubscribed callbacks are no longer called."""
+        calls = []
+        unsubscribe = registry.subscribe(lambda previous, current: calls.append(current))
+        unsubscribe()
+
+        _rewrite(env_file, "MONITORED_URL=https://two.example.com\n")
+        registry.reload()
+
+        assert calls == []
+
+    def test_failing_callback_does_not_block_others(self, registry, env_file):
+        """One broken subscriber does not stop the others from being notified."""
+        calls = []
+
+        def broken(previous, current):
+            raise RuntimeError("boom")
+
+        registry.subscribe(broken)
+        registry.subscribe(lambda previous, current: calls.append(current.version))
+
+        _rewrite(env_file, "MONITORED_URL=https://two.example.com\n")
+        registry.reload()
+
+        assert calls == [2]
+
+    def test_restart_only_changes_are_logged(self, env_file, caplog):
+        """Changes outside the reloadable settings are published with a warning."""
+        registry = SettingsRegistry(
+            settings_factory=lambda: Settings(_env_file=env_file),
+            env_file=env_file,
+            reloadable={"MONITORED_URL"},
+        )
+
+        _rewrite(env_file, "MONITORED_URL=https://two.example.com\nDB_READER_POOL_SIZE=8\n")
+        with caplog.at_level(logging.WARNING, logger="app.core.config"):
+            assert registry.reload() is True
+
+        assert registry.settings.DB_READER_POOL_SIZE == 8
+        warnings = [r.getMessage() for r in caplog.records if r.levelno == logging.WARNING]
+        assert warnings == ["Changed settings take effect after a restart: DB_READER_POOL_SIZE"]
+
+    def test_live_settings_are_reloadable(self, env_file, caplog):
+        """Settings served from the live snapshot do not warn about a restart."""
+        registry = SettingsRegistry(
+            settings_factory=lambda: Settings(_env_file=env_file),
+            env_file=env_file,
+            reloadable=RELOADABLE_SETTINGS,
+        )
+
+        _rewrite(env_file, "MONITORED_URL=https://two.example.com\nTELEGRAM_CHANNEL_ID=@two\n")
+        with caplog.at_level(logging.WARNING, logger="app.core.config"):
+            assert registry.reload() is True
+
+        assert "restart" not in caplog.text
+
+    def test_cors_middleware_follows_allowed_origins(self, registry, env_file):
+        """The CORS middleware rebuilds its matcher when ALLOWED_ORIGINS changes."""
+        middleware = CustomCORSMiddleware(
+            None,
+            allow_origins=registry.settings.ALLOWED_ORIGINS,
+            settings_registry=registry,
+        )
+        assert middleware.is_allowed_origin("https://new.example.com") is False
+
+        _rewrite(env_file, 'ALLOWED_ORIGINS=["https://new.example.com"]\n')
+        registry.reload()
+
+        assert middleware.is_allowed_origin("https://new.example.com") is True
+        assert middleware.is_allowed_origin("http://localhost:3000") is False
+
+    def test_cors_middleware_follows_preflight_settings(self, registry, env_file):
+        """CORS_PREFLIGHT_MAX_AGE and the cache sizes are applied on reload."""
+        middleware = CustomCORSMiddleware(
+            None,
+            allow_origins=registry.settings.ALLOWED_ORIGINS,
+            allow_methods=["*"],
+            max_age=registry.settings.CORS_PREFLIGHT_MAX_AGE,
+            settings_registry=registry,
+        )
+        headers = Headers({
+            "origin": "http://localhost:3000",
+            "access-control-request-method": "GET",
+        })
+        assert middleware.preflight_response(headers).headers["access-control-max-age"] == "600"
+
+        _rewrite(env_file, "CORS_PREFLIGHT_MAX_AGE=60\nCORS_PREFLIGHT_CACHE_SIZE=8\n")
+        registry.reload()
+
+        assert middleware.preflight_response(headers).headers["access-control-max-age"] == "60"
+        assert middleware._cached_preflight.cache_parameters()["maxsize"] == 8
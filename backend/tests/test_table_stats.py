@@ -0,0 +1,82 @@
+"""
+Tests for incrementally maintained table statistics.
+"""
+import sqlite3
+
+from app.db.migrations import COUNTED_TABLES, connect
+from app.db.stats import read_table_stats
+
+
+def _seed(db_path, videos=3, logs=2):
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "INSERT INTO crawl_schedules (id, uuid, url, interval) "
+        "VALUES (1, randomblob(16), 'https://e.com', 5)"
+    )
+    conn.executemany(
+        "INSERT INTO video_records (id, uuid, title, url, schedule_id) "
+        "VALUES (?, randomblob(16), 't', ?, 1)",
+        [(i, f"https://e.com/{i}") for i in range(videos)],
+    )
+    conn.executemany(
+        "INSERT INTO notification_logs (uuid, video_id, schedule_id, status) "
+        "VALUES (randomblob(16), 0, 1, 'sent')",
+        [() for _ in range(logs)],
+    )
+    conn.commit()
+    return conn
+
+
+class TestTableStats:
+    """Tests for the table_stats counters."""
+
+    def test_empty_database(self, db_path):
+        """Every tracked table starts at zero."""
+        conn = connect(db_path)
+        assert read_table_stats(conn) == {table: 0 for table in COUNTED_TABLES}
+
+    def test_counts_follow_inserts_and_deletes(self, db_path):
+        """Triggers keep counts equal to COUNT(*)."""
+        conn = _seed(db_path)
+        conn.execute("DELETE FROM video_records WHERE id = 1")
+        conn.commit()
+
+        stats = read_table_stats(conn)
+        for table in COUNTED_TABLES:
+            assert stats[table] == conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        assert stats["video_records"] == 2
+
+    def test_rolled_back_insert_is_not_counted(self, db_path):
+        """Counts are transactional with the rows they describe."""
+        conn = _seed(db_path)
+        conn.execute(
+            "INSERT INTO crawl_schedules (id, uuid, url, interval) "
+            "VALUES (2, randomblob(16), 'https://e.com', 5)"
+        )
+        conn.rollback()
+
+        assert read_table_stats(conn)["crawl_schedules"] == 1
+
+
+class TestTableStatsEndpoint:
+    """Tests for GET /api/v1/admin/stats/tables."""
+
+    def test_requires_admin(self, db_client):
+        """The endpoint is admin-only."""
+        response = db_client.get("/api/v1/admin/stats/tables")
+        assert response.status_code == 401
+
+    def test_returns_counts(self, db_client, db_path, admin_auth):
+        """Counts match the seeded rows."""
+        _seed(db_path, videos=4, logs=1).close()
+
+        response = db_client.get("/api/v1/admin/stats/tables", headers=admin_auth)
+
+        assert response.status_code == 200
+        counts = {t["name"]: t["row_count"] for t in response.json()["tables"]}
+        assert counts == {
+            "crawl_execution_logs": 0,
+            "crawl_schedules": 1,
+            "notification_logs": 1,
+            "video_records": 4,
+        }
@@ -0,0 +1,114 @@
+"""
+Tests for canonical URL hashing and deduplicated video inserts.
+"""
+import sqlite3
+
+import pytest
+from sqlalchemy import text
+
+from app.core.urls import canonical_url, url_hash
+from app.core.ids import uuid_blob
+from app.db.migrations import MIGRATIONS, connect, run_migrations
+from app.repositories.video_records import ExtractedVideo, insert_new_videos
+
+
+class TestCanonicalUrl:
+    """Tests for canonical_url and url_hash."""
+
+    @pytest.mark.parametrize("variant", [
+        "https://Example.com/watch/1",
+        "https://example.com:443/watch/1/",
+        "https://example.com/watch/1#comments",
+        "https://example.com/watch/1?utm_source=tg&fbclid=abc",
+    ])
+    def test_equivalent_urls_share_a_hash(self, variant):
+        """Spelling differences that do not change the target are ignored."""
+        assert canonical_url(variant) == "https://example.com/watch/1"
+        assert url_hash(variant) == url_hash("https://example.com/watch/1")
+
+    def test_query_order_is_ignored(self):
+        """Query parameters are sorted."""
+        assert url_hash("https://e.com/v?b=2&a=1") == url_hash("https://e.com/v?a=1&b=2")
+
+    def test_different_videos_differ(self):
+        """Meaningful path and query differences produce different hashes."""
+        assert url_hash("https://e.com/v?id=1") != url_hash("https://e.com/v?id=2")
+        assert url_hash("https://e.com/v/1") != url_hash("https://e.com/v/2")
+
+    def test_hash_fits_sqlite_integer(self):
+        """Hashes are signed 64-bit integers."""
+        assert -2**63 <= url_hash("https://e.com/v/1") < 2**63
+
+
+class TestInsertNewVideos:
+    """Tests for insert_new_videos."""
+
+    @pytest.mark.asyncio
+    async def test_only_new_videos_are_inserted(self, database):
+        """Known URLs, including other spellings, are skipped."""
+        first = [ExtractedVideo("A", "https://e.com/a"), ExtractedVideo("B", "https://e.com/b")]
+        async with database.write() as session:
+            inserted = await insert_new_videos(session, 1, first)
+        assert [v.video.title for v in inserted] == ["A", "B"]
+
+        second = [
+            ExtractedVideo("B again", "https://E.com/b/?utm_medium=x"),
+            ExtractedVideo("C", "https://e.com/c"),
+        ]
+        async with database.write() as session:
+            inserted = await insert_new_videos(session, 1, second)
+        assert [v.video.title for v in inserted] == ["C"]
+
+        async with database.read() as session:
+            count = (await session.execute(text("SELECT COUNT(*) FROM video_records"))).scalar_one()
+        assert count == 3
+
+    @pytest.mark.asyncio
+    async def test_duplicates_within_batch(self, database):
+        """Only the first occurrence of a URL in a batch is stored."""
+        videos = [ExtractedVideo("A", "https://e.com/a"), ExtractedVideo("A2", "https://e.com/a#x")]
+        async with database.write() as session:
+            inserted = await insert_new_videos(session, 1, videos)
+        assert [v.video.title for v in inserted] == ["A"]
+
+    @pytest.mark.asyncio
+    async def test_large_batches_are_chunked(self, database):
+        """Batches larger than one statement's worth of rows are all stored."""
+        videos = [ExtractedVideo(f"V{i}", f"https://e.com/{i}") for i in range(2500)]
+        async with database.write() as session:
+            inserted = await insert_new_videos(session, 1, videos)
+        assert len(inserted) == 2500
+
+
+class TestUrlHashMigration:
+    """Tests for the url_hash backfill migration."""
+
+    def test_existing_rows_are_backfilled(self, tmp_path):
+        """Existing rows get hashes; later duplicates keep NULL."""
+        conn = connect(tmp_path / "legacy.db")
+        run_migrations(conn, MIGRATIONS[:2])
+        conn.execute(
+            "INSERT INTO crawl_schedules (id, url, interval) VALUES ('s1', 'https://e.com', 5)"
+        )
+        conn.executemany(
+            "INSERT INTO video_records (id, title, url, schedule_id, detected_at) "
+            "VALUES (?, 't', ?, 's1', ?)",
+            [
+                ("v1", "https://e.com/a", "2024-01-01 00:00:00"),
+                ("v2", "https://e.com/a/", "2024-01-02 00:00:00"),
+                ("v3", "https://e.com/b", "2024-01-03 00:00:00"),
+            ],
+        )
+
+        run_migrations(conn)
+
+        hashes = dict(conn.execute("SELECT uuid, url_hash FROM video_records"))
+        assert hashes[uuid_blob("v1")] == url_hash("https://e.com/a")
+        assert hashes[uuid_blob("v2")] is None
+        assert hashes[uuid_blob("v3")] == url_hash("https://e.com/b")
+        with pytest.raises(sqlite3.IntegrityError):
+            conn.execute(
+                "INSERT INTO video_records (uuid, title, url, url_hash, schedule_id) "
+                "VALUES (randomblob(16), 't', 'https://e.com/b', ?, 1)",
+                (url_hash("https://e.com/b"),),
+            )
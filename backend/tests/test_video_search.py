@@ -0,0 +1,135 @@
+"""
+Tests for full-text video search.
+"""
+import sqlite3
+import uuid
+
+import pytest
+
+from app.core.pagination import encode_cursor
+from app.repositories.video_records import fts_query
+from tests.conftest import uid
+
+SEARCH_URL = "/api/v1/admin/videos/search"
+
+
+@pytest.fixture
+def seeded(db_path):
+    """A handful of videos with overlapping words in titles and descriptions."""
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "INSERT INTO crawl_schedules (id, uuid, url, interval) VALUES (1, ?, 'https://e.com', 5)",
+        (uuid.UUID(uid("s1")).bytes,),
+    )
+    conn.executemany(
+        "INSERT INTO video_records (id, uuid, title, description, url, schedule_id) "
+        "VALUES (?, ?, ?, ?, ?, 1)",
+        [
+            (i, uuid.UUID(uid(f"v{i}")).bytes, title, description, f"https://e.com/{i}")
+            for i, title, description in [
+                (1, "Python tutorial", "Learn the basics"),
+                (2, "Cooking pasta", "A python appears in the kitchen"),
+                (3, "Café vlog", "Morning coffee"),
+                (4, "Pythonic idioms", None),
+                (5, "Gardening", "Nothing to see"),
+                (6, "<script>alert(1)</script> Haddock", "Fish & <b>chips</b>"),
+            ]
+        ],
+    )
+    conn.commit()
+    conn.close()
+
+
+def _search(client, headers, **params):
+    response = client.get(SEARCH_URL, headers=headers, params=params)
+    assert response.status_code == 200
+    return response.json()
+
+
+class TestFtsQuery:
+    """Tests for turning user input into an FTS5 query."""
+
+    def test_prefix_terms(self):
+        assert fts_query("py tut") == '"py"* "tut"*'
+
+    def test_operators_are_quoted(self):
+        """FTS5 syntax in the input cannot break the query."""
+        assert fts_query('a OR "b') == '"a"* "OR"* """b"*'
+
+    def test_blank(self):
+        assert fts_query("   ") is None
+
+
+class TestVideoSearch:
+    """Tests for GET /api/v1/admin/videos/search."""
+
+    def test_requires_admin(self, db_client):
+        assert db_client.get(SEARCH_URL, params={"q": "x"}).status_code == 401
+
+    def test_title_matches_rank_first(self, db_client, seeded, admin_auth):
+        """Prefix search finds all forms; title hits outrank description hits."""
+        data = _search(db_client, admin_auth, q="pyth")
+
+        ids = [item["id"] for item in data["items"]]
+        assert set(ids) == {uid("v1"), uid("v2"), uid("v4")}
+        assert ids[-1] == uid("v2")
+
+    def test_highlights(self, db_client, seeded, admin_auth):
+        data = _search(db_client, admin_auth, q="kitchen")
+
+        [item] = data["items"]
+        assert item["title_highlight"] == "Cooking pasta"
+        assert "<mark>kitchen</mark>" in item["description_snippet"]
+
+    def test_diacritics_ignored(self, db_client, seeded, admin_auth):
+        data = _search(db_client, admin_auth, q="cafe")
+
+        assert [item["title_highlight"] for item in data["items"]] == ["<mark>Café</mark> vlog"]
+
+    def test_highlights_are_escaped(self, db_client, seeded, admin_auth):
+        """Crawled markup is escaped; only the match marks are tags."""
+        [item] = _search(db_client, admin_auth, q="haddock chips")["items"]
+
+        assert item["title_highlight"] == (
+            "&lt;script&gt;alert(1)&lt;/script&gt; <mark>Haddock</mark>"
+        )
+        assert item["description_snippet"] == "Fish &amp; &lt;b&gt;<mark>chips</mark>&lt;/b&gt;"
+        assert item["title"] == "<script>alert(1)</script> Haddock"
+
+    def test_pagination(self, db_client, seeded, admin_auth):
+        """Walking pages returns the same order as a single page."""
+        expected = [item["id"] for item in _search(db_client, admin_auth, q="pyth")["items"]]
+
+        ids, cursor = [], None
+        while True:
+            params = {"q": "pyth", "limit": 1, **({"cursor": cursor} if cursor else {})}
+            data = _search(db_client, admin_auth, **params)
+            ids.extend(item["id"] for item in data["items"])
+            cursor = data["next_cursor"]
+            if cursor is None:
+                break
+
+        assert ids == expected
+
+    def test_index_follows_updates_and_deletes(self, db_client, seeded, db_path, admin_auth):
+        conn = sqlite3.connect(db_path)
+        conn.execute("UPDATE video_records SET title = 'Rust tutorial' WHERE id = 1")
+        conn.execute("DELETE FROM video_records WHERE id = 4")
+        conn.commit()
+        conn.close()
+
+        assert [i["id"] for i in _search(db_client, admin_auth, q="pyth")["items"]] == [uid("v2")]
+        assert [i["id"] for i in _search(db_client, admin_auth, q="rust")["items"]] == [uid("v1")]
+
+    @pytest.mark.parametrize("cursor", [
+        "not-a-cursor", encode_cursor([1], {}), encode_cursor("1.5", 2), encode_cursor(-1.5, 2.5),
+    ])
+    def test_invalid_cursor(self, db_client, seeded, admin_auth, cursor):
+        """Malformed cursors and cursors with mistyped values are rejected with 400."""
+        response = db_client.get(
+            SEARCH_URL, headers=admin_auth, params={"q": "pyth", "cursor": cursor}
+        )
+        assert response.status_code == 400
+
+    def test_no_match(self, db_client, seeded, admin_auth):
+        assert _search(db_client, admin_auth, q="zzz") == {"items": [], "next_cursor": None}
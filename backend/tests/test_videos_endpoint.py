@@ -0,0 +1,112 @@
+"""
+Tests for the keyset-paginated video listing endpoint.
+"""
+import sqlite3
+import uuid
+
+import pytest
+
+from app.core.pagination import encode_cursor
+from tests.conftest import uid
+
+
+@pytest.fixture
+def seeded(db_path):
+    """25 videos for schedule s1 and 5 for s2, with some identical timestamps."""
+    conn = sqlite3.connect(db_path)
+    conn.executemany(
+        "INSERT INTO crawl_schedules (id, uuid, url, interval) VALUES (?, ?, 'https://e.com', 5)",
+        [(1, uuid.UUID(uid("s1")).bytes), (2, uuid.UUID(uid("s2")).bytes)],
+    )
+    rows = []
+    for i in range(30):
+        schedule = 2 if i % 6 == 5 else 1
+        # Two videos share every timestamp to exercise the tie-breaker
+        detected_at = f"2024-01-01 00:{i // 2:02d}:00"
+        rows.append((
+            i + 1, uuid.UUID(uid(f"v{i:02d}")).bytes, f"Video {i}", f"https://e.com/{i}",
+            detected_at, schedule,
+        ))
+    conn.executemany(
+        "INSERT INTO video_records (id, uuid, title, url, detected_at, schedule_id) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        rows,
+    )
+    conn.commit()
+    conn.close()
+
+
+def _all_pages(client, headers, **params):
+    ids, cursor, pages = [], None, 0
+    while True:
+        query = dict(params, **({"cursor": cursor} if cursor else {}))
+        response = client.get("/api/v1/admin/videos", headers=headers, params=query)
+        assert response.status_code == 200
+        data = response.json()
+        ids.extend(item["id"] for item in data["items"])
+        pages += 1
+        cursor = data["next_cursor"]
+        if cursor is None:
+            return ids, pages
+
+
+class TestVideosEndpoint:
+    """Tests for GET /api/v1/admin/videos."""
+
+    def test_requires_admin(self, db_client):
+        """The endpoint is admin-only."""
+        assert db_client.get("/api/v1/admin/videos").status_code == 401
+
+    def test_first_page(self, db_client, seeded, admin_auth):
+        """The first page holds the newest videos."""
+        response = db_client.get("/api/v1/admin/videos", headers=admin_auth, params={"limit": 3})
+
+        data = response.json()
+        assert [item["id"] for item in data["items"]] == [uid("v28"), uid("v29"), uid("v26")]
+        assert data["next_cursor"] is not None
+
+    def test_pages_cover_everything_once(self, db_client, seeded, admin_auth):
+        """Walking all pages returns every video exactly once, newest first."""
+        ids, pages = _all_pages(db_client, admin_auth, limit=7)
+
+        assert pages == 5
+        assert len(ids) == 30
+        assert len(set(ids)) == 30
+        assert ids[:2] == [uid("v28"), uid("v29")]
+        assert ids[-2:] == [uid("v00"), uid("v01")]
+
+    def test_filter_by_schedule(self, db_client, seeded, admin_auth):
+        """Only the requested schedule's videos are returned."""
+        ids, _ = _all_pages(db_client, admin_auth, limit=2, schedule_id=uid("s2"))
+
+        assert ids == [uid(f"v{i:02d}") for i in (29, 23, 17, 11, 5)]
+
+    @pytest.mark.parametrize("schedule_id", ["not-a-uuid", str(uuid.UUID(int=0))])
+    def test_filter_by_unknown_schedule(self, db_client, seeded, admin_auth, schedule_id):
+        """An unknown schedule id matches nothing."""
+        response = db_client.get(
+            "/api/v1/admin/videos", headers=admin_auth, params={"schedule_id": schedule_id}
+        )
+
+        assert response.json() == {"items": [], "next_cursor": None}
+
+    def test_empty_table(self, db_client, admin_auth):
+        """An empty table returns an empty last page."""
+        response = db_client.get("/api/v1/admin/videos", headers=admin_auth)
+
+        assert response.json() == {"items": [], "next_cursor": None}
+
+    @pytest.mark.parametrize("cursor", [
+        "not-a-cursor",
+        "WzFd",
+        encode_cursor([1], {}),
+        encode_cursor("2024-01-01 00:00:00", "1"),
+        encode_cursor("2024-01-01 00:00:00", True),
+        encode_cursor(None, 1),
+    ])
+    def test_invalid_cursor(self, db_client, admin_auth, cursor):
+        """Malformed cursors and cursors with mistyped values are rejected with 400."""
+        response = db_client.get(
+            "/api/v1/admin/videos", headers=admin_auth, params={"cursor": cursor}
+        )
+        assert response.status_code == 400
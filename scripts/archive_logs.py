@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Notification Log Archival Script
+
+Moves notification logs older than NOTIFICATION_ARCHIVE_AFTER_DAYS out of the
+main database into one SQLite file per month in NOTIFICATION_ARCHIVE_DIR
+(see backend/app/db/archive.py). Archived logs are still returned by
+GET /api/v1/admin/notification-logs. Safe to run against a live database and
+to re-run after an interruption; schedule it daily, e.g. from cron.
+
+Usage:
+    python scripts/archive_logs.py [--days N] [--batch-size N] [--vacuum]
+
+Settings are read from the backend/.env file, or their defaults.
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add backend directory to Python path
+SCRIPT_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPT_DIR.parent
+BACKEND_DIR = REPO_ROOT / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+# Load environment variables from backend/.env if it exists
+ENV_FILE = BACKEND_DIR / ".env"
+if ENV_FILE.exists():
+    from dotenv import load_dotenv
+    load_dotenv(ENV_FILE)
+
+from app.db.archive import DEFAULT_BATCH_SIZE, archive_notification_logs
+
+
+def backend_path(value: str) -> Path:
+    """Resolve ./relative paths against the backend dir, like the app does."""
+    if value.startswith("./"):
+        return BACKEND_DIR / value[2:]
+    return Path(value)
+
+
+def get_database_path() -> Path:
+    """Extract database path from DATABASE_URL environment variable."""
+    database_url = os.getenv("DATABASE_URL", "sqlite:///./dev.db")
+    if not database_url.startswith("sqlite:///"):
+        print(f"✗ ERROR: Only SQLite databases are supported")
+        print(f"  Got: {database_url}")
+        sys.exit(1)
+    return backend_path(database_url.replace("sqlite:///", ""))
+
+
+def database_size(conn) -> int:
+    """Size in bytes of the pages in use, excluding free pages."""
+    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+    free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    return page_size * (page_count - free_pages)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument(
+        "--days", type=int,
+        default=int(os.getenv("NOTIFICATION_ARCHIVE_AFTER_DAYS", "30")),
+        help="archive logs older than this many days",
+    )
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument(
+        "--vacuum", action="store_true",
+        help="VACUUM the main database afterwards to return freed space to the OS",
+    )
+    args = parser.parse_args()
+
+    db_path = get_database_path()
+    archive_dir = backend_path(os.getenv("NOTIFICATION_ARCHIVE_DIR", "./archive"))
+    cutoff = datetime.now(timezone.utc) - timedelta(days=args.days)
+    print(f"Database path: {db_path}")
+    print(f"Archive dir:   {archive_dir}")
+    print(f"Archiving notification logs sent before {cutoff:%Y-%m-%d %H:%M:%S} UTC")
+
+    if not db_path.exists():
+        print(f"✗ Database not found: {db_path}")
+        sys.exit(1)
+
+    from app.db.migrations import connect
+    conn = connect(db_path)
+    try:
+        def report_progress(month, moved):
+            print(f"  • {month}: {moved} rows moved", end="\r")
+
+        moved = archive_notification_logs(
+            conn, archive_dir, cutoff,
+            batch_size=args.batch_size, on_progress=report_progress,
+        )
+        for month, count in moved.items():
+            print(f"\r  ✓ {month}: {count} rows archived")
+        if not moved:
+            print("✓ Nothing to archive")
+
+        if args.vacuum:
+            print("• Vacuuming main database...")
+            conn.execute("VACUUM")
+
+        cache_kb = int(os.getenv("DB_CACHE_SIZE_KB", "65536"))
+        size_kb = database_size(conn) // 1024
+        fits = "fits in" if size_kb <= cache_kb else "exceeds"
+        print(f"✓ Main database: {size_kb} KiB in use, {fits} the {cache_kb} KiB page cache")
+    except sqlite3.Error as e:
+        print(f"\n✗ Database error: {e}")
+        sys.exit(1)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
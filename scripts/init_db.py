@@ -2,8 +2,10 @@
 """
 Database Initialization Script
 
-This script initializes the SQLite database and creates required tables.
-It is safe to run multiple times (idempotent) - it will not drop existing data.
+This script initializes the SQLite database and applies pending schema
+migrations (see backend/app/db/migrations.py). It is safe to run multiple
+times (idempotent) - it will not drop existing data, and it can run against
+a live database because large table rebuilds are copied in small batches.
 
 Usage:
     python scripts/init_db.py
@@ -57,98 +59,36 @@ def get_database_path():
 
 
 def create_tables(conn):
-    """Create database tables if they don't exist."""
-    cursor = conn.cursor()
-    
-    # Table: crawl_schedules
-    # Stores crawl schedule configuration
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS crawl_schedules (
-            id TEXT PRIMARY KEY,
-            url TEXT NOT NULL,
-            interval INTEGER NOT NULL,
-            is_active BOOLEAN NOT NULL DEFAULT 0,
-            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-    
-    # Table: video_records
-    # Stores detected video metadata
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS video_records (
-            id TEXT PRIMARY KEY,
-            title TEXT NOT NULL,
-            url TEXT NOT NULL,
-            thumbnail TEXT,
-            description TEXT,
-            detected_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-            schedule_id TEXT NOT NULL,
-            FOREIGN KEY (schedule_id) REFERENCES crawl_schedules (id)
-        )
-    """)
-    
-    # Table: notification_logs
-    # Tracks notification attempts for each video
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS notification_logs (
-            id TEXT PRIMARY KEY,
-            video_id TEXT NOT NULL,
-            schedule_id TEXT NOT NULL,
-            status TEXT NOT NULL,
-            error_details TEXT,
-            sent_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (video_id) REFERENCES video_records (id),
-            FOREIGN KEY (schedule_id) REFERENCES crawl_schedules (id)
-        )
-    """)
-    
-    # Table: crawl_execution_logs
-    # Records each crawl attempt and its outcome
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS crawl_execution_logs (
-            id TEXT PRIMARY KEY,
-            schedule_id TEXT NOT NULL,
-            started_at TIMESTAMP NOT NULL,
-            finished_at TIMESTAMP,
-            status TEXT NOT NULL,
-            error_details TEXT,
-            FOREIGN KEY (schedule_id) REFERENCES crawl_schedules (id)
-        )
-    """)
-    
-    # Create indexes for better query performance
-    cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_crawl_schedules_is_active 
-        ON crawl_schedules(is_active)
-    """)
-    
-    cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_video_records_schedule_id 
-        ON video_records(schedule_id)
-    """)
-    
-    cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_video_records_detected_at 
-        ON video_records(detected_at DESC)
-    """)
-    
-    cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_notification_logs_video_id 
-        ON notification_logs(video_id)
-    """)
-    
-    cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_notification_logs_schedule_id 
-        ON notification_logs(schedule_id)
-    """)
-    
-    cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_crawl_execution_logs_schedule_id 
-        ON crawl_execution_logs(schedule_id, started_at DESC)
-    """)
-    
-    conn.commit()
-    print("✓ Database tables created/verified successfully")
+    """Apply pending schema migrations (creates the tables on a new database)."""
+    from app.db.migrations import get_schema_version, pending_migrations, run_migrations
+
+    pending = pending_migrations(conn)
+    if not pending:
+        print(f"✓ Schema is up to date (version {get_schema_version(conn)})")
+        return
+
+    for migration in pending:
+        print(f"  • Pending migration {migration.version}: {migration.description}")
+
+    # Each table's progress line is redrawn in place with \r and finished
+    # with a newline when the next table starts or the migrations end, since
+    # the last count may stop short of the total (rows left out of a rebuild)
+    progress_table = None
+
+    def report_progress(table, copied, total):
+        nonlocal progress_table
+        if progress_table not in (None, table):
+            print()
+        progress_table = table
+        print(f"    {table}: {copied}/{total} rows copied", end="\r", flush=True)
+
+    try:
+        applied = run_migrations(conn, on_progress=report_progress)
+    finally:
+        if progress_table is not None:
+            print()
+    print(f"✓ Applied migrations: {', '.join(map(str, applied))} "
+          f"(schema version {get_schema_version(conn)})")
 
 
 def verify_tables(conn):
@@ -170,11 +110,10 @@ def verify_tables(conn):
         status = "✓" if table in expected_tables else "•"
         print(f"  {status} {table}")
     
-    # Count rows in each table
+    # Row counts come from table_stats, so large tables are not scanned
+    from app.db.stats import read_table_stats
     print("\n✓ Table row counts:")
-    for table in existing_tables:
-        cursor.execute(f"SELECT COUNT(*) FROM {table}")
-        count = cursor.fetchone()[0]
+    for table, count in read_table_stats(conn).items():
         print(f"  • {table}: {count} rows")
     
     missing_tables = set(expected_tables) - set(existing_tables)
@@ -209,10 +148,11 @@ def main():
     
     try:
         # Connect to database
-        conn = sqlite3.connect(db_path)
+        from app.db.migrations import connect
+        conn = connect(db_path)
         print(f"✓ Connected to database")
         
-        # Create tables
+        # Create or migrate tables
         create_tables(conn)
         
         # Verify tables
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Daily Rollup Rebuild Script
+
+Recomputes the daily rollup tables behind GET /api/v1/admin/stats/daily
+from video_records, notification_logs and crawl_execution_logs (see
+backend/app/db/rollups.py). The triggers keep the rollups current, so this
+is only needed for backfills, e.g. after importing data with the triggers
+disabled. Safe to run against a live database.
+
+Logs older than the crawl log retention or the notification archive age are
+no longer in the main database: rebuild only the days after that with
+--since, or their counts are lost.
+
+Usage:
+    python scripts/rebuild_rollups.py [--since YYYY-MM-DD]
+
+Settings are read from the backend/.env file, or their defaults.
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+from datetime import date
+from pathlib import Path
+
+# Add backend directory to Python path
+SCRIPT_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPT_DIR.parent
+BACKEND_DIR = REPO_ROOT / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+# Load environment variables from backend/.env if it exists
+ENV_FILE = BACKEND_DIR / ".env"
+if ENV_FILE.exists():
+    from dotenv import load_dotenv
+    load_dotenv(ENV_FILE)
+
+from app.db.rollups import rebuild_rollups
+
+
+def get_database_path() -> Path:
+    """Extract database path from DATABASE_URL environment variable."""
+    database_url = os.getenv("DATABASE_URL", "sqlite:///./dev.db")
+    if not database_url.startswith("sqlite:///"):
+        print(f"✗ ERROR: Only SQLite databases are supported")
+        print(f"  Got: {database_url}")
+        sys.exit(1)
+    path = database_url.replace("sqlite:///", "")
+    if path.startswith("./"):
+        return BACKEND_DIR / path[2:]
+    return Path(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument(
+        "--since", type=date.fromisoformat, default=None,
+        help="first UTC day to rebuild (default: every day)",
+    )
+    args = parser.parse_args()
+
+    db_path = get_database_path()
+    print(f"Database path: {db_path}")
+    print(f"Rebuilding daily rollups since {args.since or 'the first day'}")
+
+    if not db_path.exists():
+        print(f"✗ Database not found: {db_path}")
+        sys.exit(1)
+
+    from app.db.migrations import connect
+    conn = connect(db_path)
+    try:
+        def report_progress(table, schedules):
+            print(f"  • {table}: {schedules} schedules", end="\r")
+
+        schedules = rebuild_rollups(conn, since=args.since, on_progress=report_progress)
+        print(f"\r✓ Rebuilt rollups for {schedules} schedules")
+    except sqlite3.Error as e:
+        print(f"\n✗ Database error: {e}")
+        sys.exit(1)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()